@@ -0,0 +1,116 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# index names of the MESSAGEix parameters and sets used by d2ix
+PARAMETER_INDEX: Dict[str, List[str]] = {
+    'bound_emission': ['node', 'type_emission', 'type_tec', 'type_year'],
+    'capacity_factor': ['node_loc', 'technology', 'year_vtg', 'year_act', 'time'],
+    'construction_time': ['node_loc', 'technology', 'year_vtg'],
+    'demand': ['node', 'commodity', 'level', 'year', 'time'],
+    'emission_factor': ['node_loc', 'technology', 'year_vtg', 'year_act', 'mode', 'emission'],
+    'fix_cost': ['node_loc', 'technology', 'year_vtg', 'year_act'],
+    'flexibility_factor': ['node_loc', 'technology', 'year_vtg', 'year_act', 'mode', 'commodity', 'level', 'time',
+                           'rating'],
+    'growth_activity_lo': ['node_loc', 'technology', 'year_act', 'time'],
+    'growth_activity_up': ['node_loc', 'technology', 'year_act', 'time'],
+    'growth_new_capacity_lo': ['node_loc', 'technology', 'year_vtg'],
+    'growth_new_capacity_up': ['node_loc', 'technology', 'year_vtg'],
+    'historical_activity': ['node_loc', 'technology', 'year_act', 'mode', 'time'],
+    'historical_emission': ['node', 'type_emission', 'type_tec', 'type_year'],
+    'historical_new_capacity': ['node_loc', 'technology', 'year_vtg'],
+    'initial_activity_lo': ['node_loc', 'technology', 'year_act', 'time'],
+    'initial_activity_up': ['node_loc', 'technology', 'year_act', 'time'],
+    'initial_new_capacity_lo': ['node_loc', 'technology', 'year_vtg'],
+    'initial_new_capacity_up': ['node_loc', 'technology', 'year_vtg'],
+    'input': ['node_loc', 'technology', 'year_vtg', 'year_act', 'mode', 'node_origin', 'commodity', 'level', 'time',
+              'time_origin'],
+    'interestrate': ['year'],
+    'inv_cost': ['node_loc', 'technology', 'year_vtg'],
+    'min_utilization_factor': ['node_loc', 'technology', 'year_vtg', 'year_act'],
+    'operation_factor': ['node_loc', 'technology', 'year_vtg', 'year_act'],
+    'output': ['node_loc', 'technology', 'year_vtg', 'year_act', 'mode', 'node_dest', 'commodity', 'level', 'time',
+               'time_dest'],
+    'peak_load_factor': ['node', 'commodity', 'level', 'year', 'time'],
+    'rating_bin': ['node', 'technology', 'year_act', 'commodity', 'level', 'time', 'rating'],
+    'reliability_factor': ['node', 'technology', 'year_act', 'commodity', 'level', 'time', 'rating'],
+    'renewable_capacity_factor': ['node', 'commodity', 'grade', 'level', 'year'],
+    'renewable_potential': ['node', 'commodity', 'grade', 'level', 'year'],
+    'resource_remaining': ['node', 'commodity', 'grade', 'year'],
+    'resource_volume': ['node', 'commodity', 'grade'],
+    'tax_emission': ['node', 'type_emission', 'type_tec', 'type_year'],
+    'technical_lifetime': ['node_loc', 'technology', 'year_vtg'],
+    'var_cost': ['node_loc', 'technology', 'year_vtg', 'year_act', 'mode', 'time'],
+}
+
+SET_INDEX: Dict[str, List[str]] = {
+    'year': [], 'node': [], 'technology': [], 'relation': [], 'emission': [], 'time': [], 'mode': [], 'grade': [],
+    'level': [], 'commodity': [], 'rating': [], 'lvl_spatial': [], 'lvl_temporal': [], 'type_node': [],
+    'type_tec': [], 'type_year': [], 'type_emission': [], 'type_relation': [], 'level_resource': ['level'],
+    'level_renewable': ['level'], 'level_stocks': ['level'], 'cat_node': ['type_node', 'node'],
+    'cat_tec': ['type_tec', 'technology'], 'cat_year': ['type_year', 'year'],
+    'cat_emission': ['type_emission', 'emission'], 'cat_relation': ['type_relation', 'relation'],
+    'map_spatial_hierarchy': ['lvl_spatial', 'node', 'node_parent'],
+}
+
+VARIABLE_INDEX: Dict[str, List[str]] = {
+    'ACT': ['node_loc', 'technology', 'year_vtg', 'year_act', 'mode', 'time'],
+    'CAP': ['node_loc', 'technology', 'year_vtg', 'year_act'],
+    'CAP_NEW': ['node_loc', 'technology', 'year_vtg'],
+    'EMISS': ['node', 'emission', 'type_tec', 'year'],
+}
+
+
+class LocalScenario(object):
+    """Stand-in for a message_ix.Scenario which answers the schema queries of
+    the d2ix build and serves synthetic results for the postprocessing, no
+    platform or database is involved
+    """
+
+    def __init__(self, model_par: Optional[dict] = None, seed: int = 0) -> None:
+        self.model_par = model_par if model_par is not None else {}
+        self.added_rows: Dict[str, int] = {}
+        self._rng = np.random.RandomState(seed)
+
+    def add_par(self, name: str, df: pd.DataFrame) -> None:
+        # uploads are only counted
+        self.added_rows[name] = self.added_rows.get(name, 0) + len(df)
+
+    def par_list(self) -> List[str]:
+        return list(PARAMETER_INDEX.keys())
+
+    def set_list(self) -> List[str]:
+        return list(SET_INDEX.keys())
+
+    def idx_names(self, name: str) -> List[str]:
+        if name in PARAMETER_INDEX:
+            return PARAMETER_INDEX[name]
+        return SET_INDEX[name]
+
+    def par(self, name: str) -> pd.DataFrame:
+        df = self.model_par.get(name)
+        if isinstance(df, pd.DataFrame) and name in PARAMETER_INDEX:
+            return df.copy()
+        return pd.DataFrame(columns=PARAMETER_INDEX[name] + ['value', 'unit'])
+
+    def set(self, name: str):
+        if SET_INDEX[name]:
+            return pd.DataFrame(columns=SET_INDEX[name])
+        return pd.Series(self.model_par.get(name, []), dtype=object)
+
+    def var(self, name: str) -> pd.DataFrame:
+        output = self.model_par.get('output')
+        if output is None or output.empty:
+            return pd.DataFrame(columns=VARIABLE_INDEX[name] + ['lvl', 'mrg'])
+
+        if name == 'EMISS':
+            emission_factor = self.model_par['emission_factor']
+            df = emission_factor[['node_loc', 'emission', 'year_act']].drop_duplicates()
+            df = df.rename(columns={'node_loc': 'node', 'year_act': 'year'}).assign(type_tec='all')
+        else:
+            df = output[[c for c in VARIABLE_INDEX[name] if c in output.columns]].drop_duplicates()
+        df = df.reset_index(drop=True)
+        df['lvl'] = self._rng.uniform(0, 10, len(df))
+        df['mrg'] = 0.0
+        return df
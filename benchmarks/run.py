@@ -0,0 +1,206 @@
+"""Benchmarks of the d2ix build and postprocessing on synthetic input data
+
+    python -m benchmarks.run --nodes 5 --technologies 50 --output bench.json
+    python -m benchmarks.run --nodes 5 --technologies 50 --compare bench.json
+"""
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from benchmarks.local_scenario import LocalScenario, PARAMETER_INDEX
+from benchmarks.synthetic import SyntheticConfig, make_input
+from d2ix import _CONFIG_BASE_TECHNOLOGY
+from d2ix.build import BuildConfig, YearVectors, create_year_vectors
+from d2ix.demand import add_demand
+from d2ix.incremental import TechnologyCache
+from d2ix.manual_parameter import add_parameter_manual
+from d2ix.postprocess import create_plotdata_df, group_data
+from d2ix.preprocess import process_demand, process_base_techs, process_spec_techs, process_spatial_locations, \
+    process_units, process_lvl_spatial, process_map_spatial_hierarchy, process_level
+from d2ix.sets import add_sets, extract_sets
+from d2ix.technology import add_technology, add_reliability_flexibility_parameter, create_renewable_potential, \
+    get_slack_techs
+from d2ix.upload import upload_parameters
+from d2ix.util import model_data_yml, YAMLd2ix, check_input_data, expand_par, memory_usage
+
+logger = logging.getLogger(__name__)
+
+Timings = Dict[str, float]
+
+UPLOAD_MEMORY_BUDGET = 8 * 2 ** 20
+
+
+def _years(config: SyntheticConfig) -> YearVectors:
+    return create_year_vectors(BuildConfig('', 1, config.first_historical_year, config.model_range_year,
+                                           config.first_model_year, config.last_model_year))
+
+
+def _timed(timings: Timings, name: str, func: Callable, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    timings[name] = time.perf_counter() - start
+    return result
+
+
+def run_once(config: SyntheticConfig) -> Tuple[Timings, dict, Dict[str, int]]:
+    timings: Timings = {}
+    sheets = make_input(config)
+    raw_data = {'base_input': sheets['base_input'], 'manual_input': sheets['manual_input'],
+                'base_tech': YAMLd2ix().load(_CONFIG_BASE_TECHNOLOGY)}
+    scenario = LocalScenario()
+    years = _years(config)
+    first_model_year = config.first_model_year
+
+    # preprocessing
+    data: dict = {}
+    data['demand'] = _timed(timings, 'process_demand', process_demand, raw_data)
+    data['technology'] = _timed(timings, 'process_base_techs', process_base_techs, raw_data, years.year_vector,
+                                first_model_year, years.duration_period_sum)
+    data['units'] = _timed(timings, 'process_units', process_units, raw_data)
+    data['technology'].update(_timed(timings, 'process_spec_techs', process_spec_techs, raw_data, data,
+                                     years.year_vector, first_model_year, scenario.par_list(),
+                                     years.duration_period_sum))
+    data['locations'] = _timed(timings, 'process_spatial_locations', process_spatial_locations, raw_data)
+    data['lvl_spatial'] = _timed(timings, 'process_lvl_spatial', process_lvl_spatial, raw_data)
+    data['map_spatial_hierarchy'] = _timed(timings, 'process_map_spatial_hierarchy', process_map_spatial_hierarchy,
+                                           raw_data)
+    data.update(_timed(timings, 'process_level', process_level, raw_data))
+
+    # model parameters
+    par_list = list(data['units'].keys())
+    par_list.remove('demand')
+    data['technology_parameter'] = par_list
+    model_par = {i: scenario.par(i) for i in par_list + ['demand']}
+    model_par.update(add_parameter_manual(raw_data['manual_input']))
+
+    def _add_technology(par: dict, cache: Optional[TechnologyCache] = None):
+        for loc in data['locations'].keys():
+            par.update(add_technology(data, par, first_model_year, years.active_years, years.historical_years,
+                                      years.duration_period_sum, loc, par='technology', cache=cache))
+
+    def _add_demand():
+        model_par.update(add_demand(data, model_par))
+        for loc, slack_techs in get_slack_techs(data, par='demand').items():
+            model_par.update(add_technology(data, model_par, first_model_year, years.active_years,
+                                            years.historical_years, years.duration_period_sum, loc, par='demand',
+                                            slack=True, technology=slack_techs))
+
+    # incremental rebuild with unchanged technologies, all rows are taken from the cache
+    tech_cache = TechnologyCache()
+    _add_technology(dict(model_par), tech_cache)
+    _timed(timings, 'add_technology_cached', _add_technology, dict(model_par), tech_cache)
+    _timed(timings, 'add_technology', _add_technology, model_par)
+    _timed(timings, 'add_demand', _add_demand)
+    model_par.update(_timed(timings, 'add_reliability_flexibility_parameter', add_reliability_flexibility_parameter,
+                            data, model_par, raw_data))
+    model_par.update(_timed(timings, 'create_renewable_potential', create_renewable_potential, raw_data, data,
+                            years.active_years))
+    model_par.update(_timed(timings, 'extract_sets', extract_sets, scenario.set_list(), model_par))
+    model_par.update(add_sets(data, model_par, first_model_year))
+    _timed(timings, 'check_input_data', check_input_data, raw_data, model_par)
+
+    # parameter memory before and after the expansion of the compact (year_vtg, year_act) parameters
+    memory = {'compact': memory_usage(model_par), 'expanded': memory_usage(model_par, expanded=True)}
+
+    # same expansion and clean up as in model2db
+    def _expand():
+        return {k: ([x for x in v if str(x) != 'nan'] if isinstance(v, list) else
+                    expand_par(v).dropna().reset_index(drop=True)) for k, v in model_par.items()}
+
+    export_par = _timed(timings, 'expand', _expand)
+    upload_par = {k: v for k, v in model_par.items() if k in PARAMETER_INDEX}
+    _timed(timings, 'upload', upload_parameters, LocalScenario(), upload_par)
+    with tempfile.TemporaryDirectory() as directory:
+        _timed(timings, 'yaml_export', model_data_yml, {'input_path': directory}, export_par)
+
+    results = LocalScenario(export_par, seed=config.seed)
+    _timed(timings, 'postprocess', lambda: (create_plotdata_df(results), group_data('EMISS', results)))
+
+    # peak memory of the batched upload
+    tracemalloc.start()
+    upload_parameters(LocalScenario(), upload_par, UPLOAD_MEMORY_BUDGET)
+    memory['upload_peak'] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    rows = {k: len(v) for k, v in model_par.items()}
+    return timings, rows, memory
+
+
+def run(config: SyntheticConfig, repeat: int = 3) -> dict:
+    runs: List[Timings] = []
+    rows: dict = {}
+    memory: Dict[str, int] = {}
+    for i in range(repeat):
+        timings, rows, memory = run_once(config)
+        runs.append(timings)
+    best = pd.DataFrame(runs).min().to_dict()
+    return {'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'config': config._asdict(),
+            'repeat': repeat,
+            'timings': best,
+            'rows': rows,
+            'memory': memory}
+
+
+def compare(result: dict, baseline: dict, threshold: float = 0.2, min_seconds: float = 0.01) -> pd.DataFrame:
+    """Compare the best timings against a baseline result, a stage is flagged
+    as a regression if it is slower than `threshold` (relative) and
+    `min_seconds` (absolute)
+    """
+    df = pd.DataFrame({'baseline': pd.Series(baseline['timings']), 'current': pd.Series(result['timings'])})
+    df['ratio'] = df['current'] / df['baseline']
+    df['regression'] = (df['ratio'] > 1 + threshold) & (df['current'] - df['baseline'] > min_seconds)
+    if result['config'] != baseline['config']:
+        logger.warning('Benchmark configurations differ, the comparison may be meaningless')
+    return df
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='d2ix benchmarks on synthetic input data')
+    defaults = SyntheticConfig()
+    for field in SyntheticConfig._fields:
+        parser.add_argument(f'--{field.replace("_", "-")}', type=int, default=getattr(defaults, field))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write the results to a json file')
+    parser.add_argument('--compare', help='json file of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger('d2ix').setLevel(logging.WARNING)
+    config = SyntheticConfig(**{k: getattr(args, k) for k in SyntheticConfig._fields})
+    result = run(config, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    print(pd.Series(result['timings']).to_string(float_format='{:.4f}'.format))
+    memory = result['memory']
+    print(f'Parameter memory: {memory["compact"] / 2 ** 20:.1f} MiB compact, '
+          f'{memory["expanded"] / 2 ** 20:.1f} MiB expanded, '
+          f'{memory["upload_peak"] / 2 ** 20:.1f} MiB upload peak')
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        df = compare(result, baseline, args.threshold)
+        print(df.to_string(float_format='{:.4f}'.format))
+        if df['regression'].any():
+            logger.error(f'Regressions in: {df.index[df["regression"]].tolist()}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Union
+
+import numpy as np
+import pandas as pd
+
+UNIT_PARAMETERS = ['bound_emission', 'capacity_factor', 'construction_time', 'demand', 'emission_factor', 'fix_cost',
+                   'flexibility_factor', 'growth_activity_lo', 'growth_activity_up', 'historical_activity',
+                   'historical_new_capacity', 'input', 'inv_cost', 'output', 'rating_bin', 'reliability_factor',
+                   'renewable_capacity_factor', 'renewable_potential', 'technical_lifetime', 'var_cost']
+
+
+class SyntheticConfig(NamedTuple):
+    nodes: int = 3
+    technologies: int = 10
+    commodities: int = 3
+    emissions: int = 2
+    historical_years: int = 10
+    first_model_year: int = 2020
+    last_model_year: int = 2050
+    model_range_year: int = 5
+    seed: int = 0
+
+    @property
+    def first_historical_year(self) -> int:
+        return self.first_model_year - self.model_range_year - self.historical_years + 1
+
+
+def make_input(config: SyntheticConfig) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """Create the sheets of a `modell_data` and `manual_input_parameter`
+    workbook for a synthetic model of the given size
+    """
+    rng = np.random.RandomState(config.seed)
+    nodes = [f'node_{i}' for i in range(config.nodes)]
+    commodities = [f'com_{i}' for i in range(config.commodities)]
+    emissions = [f'EM{i}' for i in range(config.emissions)]
+    technologies = [f'tech_{i}' for i in range(config.technologies)]
+    model_years = list(range(config.first_model_year, config.last_model_year + 1, config.model_range_year))
+    historical_years = list(range(config.first_historical_year, config.first_historical_year + config.historical_years))
+
+    base_input = {'demand': _demand(rng, nodes, commodities, model_years),
+                  'unit': pd.DataFrame({'parameter': UNIT_PARAMETERS, 'unit': '???'}),
+                  'spec_techs': _spec_techs(rng, technologies, commodities, emissions, config),
+                  'locations': _locations(nodes, technologies),
+                  'map_spatial_hierarchy': pd.DataFrame({'node': nodes, 'node_parent': 'World',
+                                                         'lvl_spatial': 'country'}),
+                  'lvl_spatial': pd.DataFrame({'region': ['country'], 'sub_region': ['province']}),
+                  'level': pd.DataFrame({'level_type': ['level_renewable', 'level_resource'],
+                                         'level': ['renewable', 'resource']}),
+                  'rel_and_flex': _rel_and_flex(rng, nodes, technologies, commodities),
+                  'renewable_potential': _renewable_potential(rng, nodes, commodities)}
+
+    manual_input = {'historical_new_capacity': _historical(rng, nodes, technologies, historical_years, 'year_vtg'),
+                    'historical_activity': _historical(rng, nodes, technologies, historical_years, 'year_act')}
+    manual_input['historical_activity'] = manual_input['historical_activity'].assign(mode='standard', time='year')
+    return {'base_input': base_input, 'manual_input': manual_input}
+
+
+def write_input(sheets: Dict[str, Dict[str, pd.DataFrame]], directory: Union[str, Path]) -> Dict[str, str]:
+    p = Path(directory)
+    p.mkdir(parents=True, exist_ok=True)
+    paths = {'base_input': str(p.joinpath('modell_data.xlsx')),
+             'manual_input': str(p.joinpath('manual_input_parameter.xlsx'))}
+    for k, path in paths.items():
+        with pd.ExcelWriter(path) as writer:
+            for sheet, df in sheets[k].items():
+                df.to_excel(writer, sheet_name=sheet, index=False)
+    return paths
+
+
+def _demand(rng: np.random.RandomState, nodes: List[str], commodities: List[str],
+            model_years: List[int]) -> pd.DataFrame:
+    idx = pd.MultiIndex.from_product([nodes, commodities, model_years], names=['node', 'commodity', 'year'])
+    df = idx.to_frame(index=False)
+    df['level'] = 'useful'
+    df['value'] = rng.uniform(10, 100, len(df)).round(2)
+    df['unit'] = 'GWa'
+    df['time'] = 'year'
+    return df
+
+
+def _spec_techs(rng: np.random.RandomState, technologies: List[str], commodities: List[str], emissions: List[str],
+                config: SyntheticConfig) -> pd.DataFrame:
+    n = len(technologies)
+    df = pd.DataFrame({'technology': technologies,
+                       'first_year': config.first_historical_year,
+                       'last_year': config.last_model_year,
+                       'inv_cost': rng.uniform(100, 3000, n).round(1),
+                       'd_inv_cost_vtg': rng.choice([0, 0.01, -0.01], n),
+                       'fix_cost': rng.uniform(1, 100, n).round(1),
+                       'var_cost': rng.uniform(0, 60, n).round(2),
+                       'd_var_cost_act': rng.choice([0, 0.02], n),
+                       'technical_lifetime': rng.choice([5, 10, 20, 30, 40], n),
+                       'construction_time': 1,
+                       'commodity_in1': rng.choice(commodities, n),
+                       'level_in1': 'primary',
+                       'commodity_out1': rng.choice(commodities, n),
+                       'level_out1': 'useful',
+                       'efficiency_1': rng.uniform(0.3, 1, n).round(2),
+                       'capacity_factor': rng.uniform(0.3, 0.9, n).round(2),
+                       'growth_activity_up': 0.07,
+                       'growth_activity_lo': -0.07})
+
+    # every third technology has a second output
+    second = np.arange(n) % 3 == 0
+    df['commodity_out2'] = np.where(second, rng.choice(commodities, n), None)
+    df['level_out2'] = np.where(second, 'final', None)
+    df['efficiency_2'] = np.where(second, 0.2, np.nan)
+
+    for e in emissions:
+        df[f'emission_factor_{e}'] = rng.uniform(0, 2, n).round(2)
+    return df
+
+
+def _locations(nodes: List[str], technologies: List[str]) -> pd.DataFrame:
+    idx = pd.MultiIndex.from_product([nodes, technologies], names=['location', 'technology'])
+    df = idx.to_frame(index=False)
+    df['node_loc'] = df['location']
+    df['node_origin'] = df['location']
+    df['node_dest'] = df['location']
+    return df
+
+
+def _rel_and_flex(rng: np.random.RandomState, nodes: List[str], technologies: List[str],
+                  commodities: List[str]) -> pd.DataFrame:
+    techs = technologies[::2]
+    idx = pd.MultiIndex.from_product([nodes, techs], names=['node', 'technology'])
+    df = idx.to_frame(index=False)
+    n = len(df)
+    df['rating'] = rng.choice(['firm', 'r1', 'unrated'], n)
+    df['rating_bin'] = 1
+    df['reliability_factor'] = rng.uniform(0.5, 1, n).round(2)
+    df['flexibility_factor'] = rng.uniform(-0.2, 0.5, n).round(2)
+    df['commodity'] = rng.choice(commodities, n)
+    df['level'] = 'useful'
+    df['time'] = 'year'
+    return df
+
+
+def _renewable_potential(rng: np.random.RandomState, nodes: List[str], commodities: List[str]) -> pd.DataFrame:
+    idx = pd.MultiIndex.from_product([nodes, commodities[:1], ['a', 'b', 'c']], names=['node', 'commodity', 'grade'])
+    df = idx.to_frame(index=False)
+    df['level'] = 'renewable'
+    df['potential'] = rng.uniform(1, 50, len(df)).round(1)
+    df['capacity_factor'] = rng.uniform(0.1, 0.5, len(df)).round(2)
+    return df
+
+
+def _historical(rng: np.random.RandomState, nodes: List[str], technologies: List[str], historical_years: List[int],
+                year: str) -> pd.DataFrame:
+    idx = pd.MultiIndex.from_product([technologies[::2], nodes, historical_years[::2]],
+                                     names=['technology', 'node_loc', year])
+    df = idx.to_frame(index=False)
+    df['value'] = rng.uniform(0.1, 5, len(df)).round(2)
+    df['unit'] = '???'
+    return df
@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Dict, Union
+from typing import Dict, Mapping, Union
 
 import pandas as pd
 from mypy_extensions import TypedDict
@@ -13,9 +13,9 @@ _CONFIG_BASE_TECHNOLOGY = str(p.parent.joinpath('config/base_technology.yml'))
 
 ModelPar = Dict[str, Union[pd.DataFrame, list]]
 
-Data = TypedDict('Data', {'demand': dict, 'technology': dict, 'units': dict, 'locations': dict, 'lvl_spatial': list,
-                          'map_spatial_hierarchy': list, 'level_renewable': str, 'level_resource': str,
-                          'technology_parameter': list}, total=False)
+Data = TypedDict('Data', {'demand': Mapping, 'technology': dict, 'units': Mapping, 'locations': Mapping,
+                          'lvl_spatial': list, 'map_spatial_hierarchy': list, 'level_renewable': str,
+                          'level_resource': str, 'technology_parameter': list}, total=False)
 
 RawData = TypedDict('RawData', {'base_input': dict, 'base_tech': dict, 'manual_input': dict, 'spec_techs': dict},
                     total=False)
@@ -23,3 +23,7 @@ RawData = TypedDict('RawData', {'base_input': dict, 'base_tech': dict, 'manual_i
 from d2ix.core import Model
 from d2ix.core import PostProcess
 from d2ix.core import ModifyModel
+from d2ix.postprocess import ScenarioKey
+from d2ix.build import BuildConfig, BuildResult, build_model, build_models
+from d2ix.schema import ScenarioSchema
+from d2ix.platform import shared_platform
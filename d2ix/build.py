@@ -0,0 +1,267 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import pandas as pd
+
+from d2ix import _CONFIG_BASE_TECHNOLOGY, ModelPar, Data, RawData
+from d2ix.demand import add_demand
+from d2ix.incremental import TechnologyCache
+from d2ix.manual_parameter import add_parameter_manual
+from d2ix.preprocess import process_demand, process_base_techs, process_spec_techs, process_spatial_locations, \
+    process_units, process_lvl_spatial, process_map_spatial_hierarchy, process_level
+from d2ix.schema import ScenarioSchema
+from d2ix.sets import add_sets, extract_sets
+from d2ix.technology import add_technology, add_reliability_flexibility_parameter, create_renewable_potential, \
+    change_emission_factor, get_slack_techs
+from d2ix.util import YAMLd2ix, check_input_data, BuildProfile
+from d2ix.util.acitve_year_vector import calc_duration_period, create_hist_cap_index
+from d2ix.util.checkpoint import BuildCheckpoint, file_hash, run_stage
+from d2ix.util.workbook import SheetSpec, SheetTiming, read_workbook
+
+logger = logging.getLogger(__name__)
+
+BASE_INPUT_SHEETS = ['demand', 'spec_techs', 'unit', 'locations', 'lvl_spatial', 'map_spatial_hierarchy', 'level',
+                     'rel_and_flex', 'renewable_potential', 'emissions']
+# labels are read as text, the other columns are inferred
+BASE_INPUT_DTYPES = {
+    'demand': {'node': str, 'commodity': str, 'level': str, 'time': str, 'unit': str},
+    'spec_techs': {'base_techs': str, 'technology': str},
+    'unit': {'parameter': str, 'unit': str},
+    'locations': {'location': str, 'technology': str, 'node_loc': str, 'node_origin': str, 'node_dest': str},
+    'lvl_spatial': {'region': str, 'sub_region': str},
+    'map_spatial_hierarchy': {'node': str, 'node_parent': str, 'lvl_spatial': str},
+    'level': {'level_type': str, 'level': str},
+    'rel_and_flex': {'technology': str, 'rating': str, 'node': str, 'commodity': str, 'level': str, 'time': str},
+    'renewable_potential': {'commodity': str, 'level': str, 'node': str, 'grade': str}}
+TECHNOLOGY_CACHE = 'technology_cache'
+
+
+class BuildConfig(NamedTuple):
+    base_xls: str
+    historical_range_year: int
+    first_historical_year: int
+    model_range_year: int
+    first_model_year: int
+    last_model_year: int
+    manual_parameter_xls: Optional[str] = None
+    historical_data: bool = True
+    enable_slack_techs: bool = True
+    # processes to parse large workbooks, the result does not depend on it
+    workbook_workers: int = 1
+
+
+class YearVectors(NamedTuple):
+    active_years: List[int]
+    historical_years: List[int]
+    year_vector: List[int]
+    duration_period: Dict[int, int]
+    duration_period_sum: pd.DataFrame
+
+
+class BuildResult(NamedTuple):
+    """Result of `build_model`, picklable and without platform reference"""
+    config: BuildConfig
+    years: YearVectors
+    raw_data: RawData
+    data: Data
+    model_par: ModelPar
+    manual_input: bool
+    tech_cache: Optional[TechnologyCache] = None
+
+
+def create_year_vectors(config: BuildConfig) -> YearVectors:
+    if config.historical_data:
+        if not (config.first_historical_year < config.first_model_year < config.last_model_year):
+            raise ValueError(f'Wrong year settings: first_historical_year:{config.first_historical_year} < '
+                             f'first_model_year:{config.first_model_year} < '
+                             f'last_model_year:{config.last_model_year}')
+    elif not config.first_model_year < config.last_model_year:
+        raise ValueError(f'Wrong year settings: first_model_year:{config.first_model_year} < '
+                         f'last_model_year:{config.last_model_year}')
+
+    active_years = list(range(config.first_model_year, config.last_model_year + 1, config.model_range_year))
+    historical_years: List[int] = []
+    if config.historical_data:
+        historical_years = list(range(config.first_historical_year,
+                                      config.first_model_year - config.model_range_year + 1,
+                                      config.historical_range_year))
+    year_vector = historical_years + active_years
+    duration_period, duration_period_sum = calc_duration_period(year_vector)
+    return YearVectors(active_years, historical_years, year_vector, duration_period, duration_period_sum)
+
+
+def load_raw_input_data(config: BuildConfig, max_workers: int = 1,
+                        timings: Optional[List[SheetTiming]] = None) -> Tuple[RawData, bool]:
+    raw_data: RawData = {}
+    logger.info(f'Load model input data from: \'{config.base_xls}\'')
+    sheets = [SheetSpec(s, dtype=BASE_INPUT_DTYPES.get(s)) for s in BASE_INPUT_SHEETS]
+    _tmp = read_workbook(config.base_xls, sheets, max_workers, timings)
+    raw_data['base_input'] = {k: v for k, v in _tmp.items() if not v.empty}
+
+    # load default techs
+    raw_data['base_tech'] = YAMLd2ix().load(_CONFIG_BASE_TECHNOLOGY)
+
+    manual_input = False
+    if config.manual_parameter_xls is not None:
+        p = Path(config.manual_parameter_xls)
+        if p.exists():
+            manual_input = True
+            logger.info(f'Load model input data from: \'{config.manual_parameter_xls}\'')
+            _tmp = read_workbook(p, max_workers=max_workers, timings=timings)
+            raw_data['manual_input'] = {k: v for k, v in _tmp.items() if not v.empty}
+        else:
+            logger.error(f'Path \'{p}\'does not exist')
+    return raw_data, manual_input
+
+
+def preprocess(raw_data: RawData, config: BuildConfig, years: YearVectors, schema: ScenarioSchema) -> Data:
+    logger.debug('Create helper dict structure')
+    data: Data = {}
+    data['demand'] = process_demand(raw_data)
+    data['technology'] = process_base_techs(raw_data, years.year_vector, config.first_model_year,
+                                            years.duration_period_sum)
+    data['units'] = process_units(raw_data)
+    data['technology'].update(
+        process_spec_techs(raw_data, data, years.year_vector, config.first_model_year, schema.par_list,
+                           years.duration_period_sum))
+    data['locations'] = process_spatial_locations(raw_data)
+    data['lvl_spatial'] = process_lvl_spatial(raw_data)
+    data['map_spatial_hierarchy'] = process_map_spatial_hierarchy(raw_data)
+    data.update(process_level(raw_data))  # type: ignore
+
+    # used parameter
+    par_list = list(data['units'].keys())
+    par_list.remove('demand')
+    data['technology_parameter'] = par_list
+    return data
+
+
+def create_model(raw_data: RawData, data: Data, config: BuildConfig, years: YearVectors, schema: ScenarioSchema,
+                 manual_input: bool, tech_cache: Optional[TechnologyCache] = None) -> ModelPar:
+    model_par: ModelPar = {i: schema.par(i) for i in data['technology_parameter'] + ['demand']}
+
+    # add parameters manual to the model
+    if manual_input:
+        logger.info(f'Create parameters from: \'{config.manual_parameter_xls}\'')
+        model_par.update(add_parameter_manual(raw_data['manual_input']))
+
+    # add technologies over locations, with a `tech_cache` only changed technologies are created again
+    logger.info(f'Create parameters from: \'{config.base_xls}\'')
+    hist_cap = create_hist_cap_index(model_par.get('historical_new_capacity'))
+    if tech_cache is not None:
+        tech_cache.begin(config.first_model_year, years, data['technology_parameter'],
+                         {k: list(v.columns) for k, v in model_par.items()})
+    for loc in data['locations'].keys():
+        model_par.update(add_technology(data, model_par, config.first_model_year, years.active_years,
+                                        years.historical_years, years.duration_period_sum, loc, par='technology',
+                                        cache=tech_cache, hist_cap=hist_cap))
+
+    # add demand to the model for all locations
+    logger.info(f'Create demands from: \'{config.base_xls}\'')
+    model_par.update(add_demand(data, model_par))
+    if config.enable_slack_techs is True:
+        for loc, slack_techs in get_slack_techs(data, par='demand').items():
+            model_par.update(add_technology(data, model_par, config.first_model_year, years.active_years,
+                                            years.historical_years, years.duration_period_sum, loc, par='demand',
+                                            slack=True, technology=slack_techs, cache=tech_cache,
+                                            hist_cap=hist_cap))
+    if tech_cache is not None:
+        tech_cache.end()
+
+    # add rel and flex parameter
+    if 'rel_and_flex' in raw_data['base_input'].keys():
+        logger.info(f'Create parameters from: \'{config.base_xls}\' - \'rel_and_flex\'')
+        model_par.update(add_reliability_flexibility_parameter(data, model_par, raw_data))
+
+    # add renewable potential parameter
+    if 'renewable_potential' in raw_data['base_input'].keys():
+        logger.info(f'Create parameters from: \'{config.base_xls}\' - \'renewable_potential\'')
+        model_par.update(create_renewable_potential(raw_data, data, years.active_years))
+
+    # change emission factor
+    if 'emissions' in raw_data['base_input'].keys():
+        logger.info(f'Change emission factor from: \'{config.base_xls}\' - \'emissions\'')
+        model_par.update(change_emission_factor(raw_data, model_par))
+
+    # add sets
+    logger.info(f'Create sets from: \'{config.base_xls}\' and \'{config.manual_parameter_xls}\'')
+    model_par.update(extract_sets(schema.set_list, model_par))
+    model_par.update(add_sets(data, model_par, config.first_model_year))
+
+    # sanity checks
+    check_input_data(raw_data, model_par)
+    return model_par
+
+
+def build_model(config: BuildConfig, schema: ScenarioSchema, profile: Optional[BuildProfile] = None,
+                checkpoint_dir: Optional[Union[str, Path]] = None) -> BuildResult:
+    """Build the model parameters from the input workbooks, without any
+    platform access. The result can be uploaded with `Model.from_build`.
+    """
+    if profile is None:
+        profile = BuildProfile()
+    with profile.stage('create_year_vectors'):
+        years = create_year_vectors(config)
+    return build_stages(config, years, schema, profile, checkpoint_dir)
+
+
+def build_stages(config: BuildConfig, years: YearVectors, schema: ScenarioSchema, profile: BuildProfile,
+                 checkpoint_dir: Optional[Union[str, Path]] = None,
+                 tech_cache: Optional[TechnologyCache] = None) -> BuildResult:
+    """Load, preprocess and create the model. With a `checkpoint_dir` the
+    result of every stage is saved and the next build resumes from the last
+    stage with unchanged inputs. With a `tech_cache` (always with checkpoints)
+    a changed workbook is rebuilt incrementally: the technology rows of the
+    last build are kept in the cache (saved with the checkpoints) and only
+    technologies with changed inputs are created. Without a cache the result
+    has `tech_cache=None`.
+    """
+    checkpoint = BuildCheckpoint(checkpoint_dir) if checkpoint_dir is not None else None
+    raw_key = preprocess_key = model_key = ''
+    if checkpoint is not None:
+        raw_key = checkpoint.key(config.base_xls, config.manual_parameter_xls, file_hash(config.base_xls),
+                                 file_hash(config.manual_parameter_xls), file_hash(_CONFIG_BASE_TECHNOLOGY))
+        key_config = config._replace(workbook_workers=1)
+        preprocess_key = checkpoint.key(raw_key, key_config, years.year_vector, schema)
+        model_key = checkpoint.key(preprocess_key, key_config, schema)
+
+    if tech_cache is None and checkpoint is not None:
+        # builds with checkpoints are incremental, the cache of the last build is resumed
+        found, tech_cache = checkpoint.load(TECHNOLOGY_CACHE, checkpoint.key(TECHNOLOGY_CACHE))
+        if not found:
+            tech_cache = TechnologyCache()
+
+    model_par: ModelPar = {}
+    with profile.stage('load_raw_input_data'):
+        raw_data, manual_input = run_stage(checkpoint, 'load_raw_input_data', raw_key, load_raw_input_data, config,
+                                           max_workers=config.workbook_workers, timings=profile.sheets)
+    with profile.stage('preprocess'):
+        data = run_stage(checkpoint, 'preprocess', preprocess_key, preprocess, raw_data, config, years, schema)
+    with profile.stage('create_model', lambda: model_par):
+        model_par = run_stage(checkpoint, 'create_model', model_key, _create_model_cached, checkpoint, raw_data,
+                              data, config, years, schema, manual_input, tech_cache)
+    return BuildResult(config, years, raw_data, data, model_par, manual_input, tech_cache)
+
+
+def _create_model_cached(checkpoint: Optional[BuildCheckpoint], raw_data: RawData, data: Data, config: BuildConfig,
+                         years: YearVectors, schema: ScenarioSchema, manual_input: bool,
+                         tech_cache: Optional[TechnologyCache]) -> ModelPar:
+    model_par = create_model(raw_data, data, config, years, schema, manual_input, tech_cache)
+    if checkpoint is not None:
+        checkpoint.save(TECHNOLOGY_CACHE, checkpoint.key(TECHNOLOGY_CACHE), tech_cache)
+    return model_par
+
+
+def build_models(configs: Iterable[BuildConfig], schema: ScenarioSchema,
+                 max_workers: Optional[int] = None) -> List[BuildResult]:
+    """Build several model variants in worker processes, the results keep the
+    order of `configs`. The workers are spawned, not forked, the caller may
+    run the JVM of the platform.
+    """
+    configs = list(configs)
+    logger.info(f'Build {len(configs)} models')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return list(executor.map(build_model, configs, [schema] * len(configs)))
@@ -1,39 +1,60 @@
 import logging
 import sys
 from pathlib import Path
-from typing import Dict, Optional, List, Union
+from typing import Callable, Dict, Optional, List, Union
 
 import ixmp as ix
 import message_ix
 import pandas as pd
 from pandas import ExcelWriter
 
-from d2ix import _CONFIG_BASE_TECHNOLOGY, ModelPar, Data, RawData
+from d2ix import ModelPar, Data, RawData
 from d2ix import _LOG_CONFIG_FILE
-from d2ix.demand import add_demand
-from d2ix.manual_parameter import add_parameter_manual
-from d2ix.postprocess import create_timeseries_df, create_barplot, create_plotdata_df, extract_synonyms_colors
-from d2ix.preprocess import process_demand, process_base_techs, process_spec_techs, process_spatial_locations, \
-    process_units, process_lvl_spatial, process_map_spatial_hierarchy, process_level
-from d2ix.sets import add_sets, extract_sets, set_frame_list, set_order
-from d2ix.technology import add_technology, add_reliability_flexibility_parameter, create_renewable_potential, \
-    change_emission_factor
-from d2ix.util import model_data_yml, YAMLd2ix, check_input_data, setup_logging
+from d2ix.build import BuildConfig, BuildResult, create_year_vectors, build_stages
+from d2ix.incremental import TechnologyCache
+from d2ix.platform import acquire_platform, release_platform, open_db, close_db
+from d2ix.postprocess import create_timeseries_df, create_barplot, create_plotdata_df, extract_synonyms_colors, \
+    ScenarioKey, compare_scenarios, rank_scenarios, scenario_plotdata, export_timeseries, export_timeseries_many, \
+    ResultStore
+from d2ix.postprocess.compare import COMPARE_VARIABLES
+from d2ix.diff import ParameterDiff, ScenarioSource, diff_scenarios
+from d2ix.fetch import MAX_FETCH_WORKERS, fetch_items
+from d2ix.schema import ScenarioSchema, get_schema
+from d2ix.sets import set_frame_list, set_order
+from d2ix.snapshot import SnapshotError, load_snapshot, read_manifest, save_snapshot
+from d2ix.upload import MEMORY_BUDGET, UploadProgress, upload_parameters
+from d2ix.util import model_data_yml, YAMLd2ix, setup_logging, BuildProfile, expand_par
+from d2ix.util.checkpoint import BuildCheckpoint, file_hash, run_stage
+from d2ix.util.workbook import SheetSpec, read_workbook
 
 logger = logging.getLogger(__name__)
 
+POSTPROCESS_COLUMNS = ['technology', 'postprocess_color', 'postprocess_synonym']
+
 
 class MessageInterface(object):
+    """Base class of the interfaces to the IX modeling platform. All
+    instances with the same database configuration share one platform, the
+    database is closed after the last instance closed it. Instances can be
+    used as context manager to release the platform after use.
+    """
     LOG_LEVEL = 'INFO'
-    config: dict = {}
+    config: dict
 
     def __init__(self, run_config: Optional[str] = None, verbose: bool = False) -> None:
-
+        self.config = {}
         self._create_logger(verbose)
         self._init_run_config(run_config)
-        self._mp = self.Platform(self.config['db'])
-        self._mp.set_log_level(level=self.LOG_LEVEL)
+        self._mp = acquire_platform(self.config['db'], self.LOG_LEVEL)
         self._local_db = self._mp.dbtype == 'HSQLDB'
+        self._db_open = False
+        self._released = False
+
+    def __enter__(self) -> 'MessageInterface':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
 
     def _init_run_config(self, run_config: Optional[str]) -> None:
         logger.info('Load data base configurations')
@@ -57,15 +78,38 @@ class MessageInterface(object):
             logging.getLogger('d2ix').setLevel(logging.DEBUG)
 
     def close_db(self) -> None:
-        logger.debug(f'> Close database at \'{self.config["db"]["dbprops"]}\'')
-        self._mp.close_db()
+        if self._db_open:
+            close_db(self.config['db'])
+            self._db_open = False
+
+    def _check_released(self) -> None:
+        if self._released:
+            raise ValueError(f'The platform of this {self.__class__.__name__} was released with close(), create a '
+                             f'new instance')
 
     def open_db(self) -> None:
-        logger.debug(f'> Open database at \'{self.config["db"]["dbprops"]}\'')
-        self._mp.open_db()
+        self._check_released()
+        if not self._db_open:
+            open_db(self.config['db'])
+            self._db_open = True
+
+    def close(self) -> None:
+        """Close the database of this instance and release the shared platform"""
+        if not self._released:
+            self.close_db()
+            release_platform(self.config['db'])
+            self._released = True
+
+    def scenario_schema(self, scenario: message_ix.Scenario) -> ScenarioSchema:
+        """Parameter and set definitions, loaded once per platform and
+        MESSAGEix version (and saved to the optional run config entry
+        'schema_cache')
+        """
+        return get_schema(scenario, self.config['db'], self.config['db'].get('schema_cache'))
 
     @staticmethod
     def Platform(db_config: Dict[str, str]) -> ix.Platform:
+        """Create a new platform, which is not shared with other instances"""
         return ix.Platform(dbprops=db_config.get('dbprops'), dbtype=db_config.get('dbtype'))
 
     def Scenario(self, model: str, scen: str, version: Optional[Union[int, str]] = None,
@@ -73,6 +117,7 @@ class MessageInterface(object):
         """Initialize a new message_ix.Scenario (structured input data and
         solution) or get an existing scenario from the ixmp database instance
         """
+        self._check_released()
         if self._local_db:
             self.open_db()
         return message_ix.Scenario(self._mp, model, scen, version, annotation, cache)
@@ -86,17 +131,34 @@ class DBInterface(MessageInterface):
     model_par: ModelPar
     sets: dict
 
-    def __init__(self, run_config: Optional[str], verbose: bool, yaml_export: bool = True) -> None:
+    def __init__(self, run_config: Optional[str], verbose: bool, yaml_export: bool = True, profile: bool = False,
+                 profile_cprofile: bool = False) -> None:
         super().__init__(run_config, verbose)
         self.yaml_export = yaml_export
+        self.profile = BuildProfile(memory=profile, cprofile=profile_cprofile)
+
+    def model2db(self, memory_budget: int = MEMORY_BUDGET,
+                 progress: Optional[Callable[[UploadProgress], None]] = None) -> message_ix.Scenario:
+        """Upload the model to the scenario. The parameters are cleaned and
+        added in row batches of about `memory_budget` bytes, `progress` is
+        called after every batch.
+        """
+        with self.profile.stage('model2db', lambda: self.model_par):
+            return self._model2db(memory_budget, progress)
 
-    def model2db(self) -> message_ix.Scenario:
+    def _model2db(self, memory_budget: int = MEMORY_BUDGET,
+                  progress: Optional[Callable[[UploadProgress], None]] = None) -> message_ix.Scenario:
         logger.info('Prepare model input data')
-        # remove NaN row from data
+        # remove NaN from the sets, the parameters are cleaned batch by batch on upload
+        schema = self.scenario_schema(self.scenario)
+        if self.model_type == 'modify':
+            # the items of the excel file may not be in the schema of the platform
+            schema = schema.with_items(self.scenario)
+        set_list = schema.set_list
         for k, v in self.model_par.items():
             if isinstance(v, list):
                 self.model_par[k] = [x for x in v if str(x) != 'nan']
-            else:
+            elif k in set_list:
                 self.model_par[k] = v.dropna().reset_index(drop=True)
 
         if self.model_type == 'new':
@@ -110,12 +172,12 @@ class DBInterface(MessageInterface):
                 for unit in units_to_add:
                     self._mp.add_unit(unit)
 
-            _sets = {k: v for k, v in self.model_par.items() if k in self.scenario.set_list()}
+            _sets = {k: v for k, v in self.model_par.items() if k in set_list}
             _sets['year'] = self.year_vector
         else:
             # model_tye == 'modify'
-            _sets = {k: v for k, v in self.model_par.items() if k in self.scenario.set_list()}
-            _sets = set_frame_list(self.scenario, _sets)
+            _sets = {k: v for k, v in self.model_par.items() if k in set_list}
+            _sets = set_frame_list(schema, _sets)
 
         logger.info('Add sets to scenario')
         for i in set_order():
@@ -123,9 +185,8 @@ class DBInterface(MessageInterface):
                 self.scenario.add_set(i, _sets[i])
 
         logger.info('Add parameter to scenario')
-        _pars = {k: v for k, v in self.model_par.items() if k in self.scenario.par_list()}
-        for k, v in _pars.items():
-            self.scenario.add_par(k, v)
+        _pars = {k: v for k, v in self.model_par.items() if k in schema.par_list}
+        upload_parameters(self.scenario, _pars, memory_budget, progress)
 
         self.scenario.commit(f'Model {self.scenario} created')
         self.scenario.set_as_default()
@@ -140,7 +201,7 @@ class DBInterface(MessageInterface):
         return self.Scenario(model, scen, version)
 
     def get_parameter(self, par: str) -> pd.DataFrame:
-        return self.model_par.get(par, None)
+        return expand_par(self.model_par.get(par, None))
 
     def set_parameter(self, par: str, name: str) -> None:
         self.model_par[name] = par
@@ -159,14 +220,39 @@ class Model(DBInterface):
         optional parameter 'model' path/name to the model definition
 
     verbose : boolean
+
+    profile : boolean
+        trace the peak memory of every build stage, wall and cpu times as well
+        as parameter row counts are always recorded in `Model.profile`
+
+    profile_cprofile : boolean
+        capture cProfile statistics for every build stage
+
+    build_result : BuildResult
+        model parameters built beforehand with `d2ix.build.build_model`, e.g.
+        in a worker process, the input workbooks are not read again
+
+    checkpoint_dir : string
+        directory for the results of the build stages, the next build resumes
+        from the last stage with unchanged input files and settings
+
+    incremental : boolean
+        keep the technology rows of the build for an incremental
+        `Model.rebuild` (always with `checkpoint_dir`)
+
+    After a change of the input workbooks `Model.rebuild` creates only the
+    parameter rows of changed technologies again (the first rebuild of a model
+    without `incremental` or `checkpoint_dir` creates all rows). `Model.save_snapshot` saves
+    the built parameters, `Model.load_snapshot` creates a model from them
+    without reading the input workbooks.
     """
-    data: Data = {}
-    raw_data: RawData = {}
-    model_par: ModelPar = {}
-    active_years: list = []
-    historical_years: list = []
-    year_vector: list = []
-    duration_period: dict = {}
+    data: Data
+    raw_data: RawData
+    model_par: ModelPar
+    active_years: List[int]
+    historical_years: List[int]
+    year_vector: List[int]
+    duration_period: Dict[int, int]
     duration_period_sum: pd.DataFrame
 
     ENABLE_SLACK_TECHS = True
@@ -176,8 +262,10 @@ class Model(DBInterface):
                  manual_parameter_xls: Optional[str] = None,
                  annotation: Optional[str] = None, historical_data: bool = True,
                  run_config: Optional[str] = None, verbose: bool = False,
-                 yaml_export: bool = True) -> None:
-        super().__init__(run_config, verbose, yaml_export)
+                 yaml_export: bool = True, profile: bool = False, profile_cprofile: bool = False,
+                 build_result: Optional[BuildResult] = None, checkpoint_dir: Optional[str] = None,
+                 incremental: bool = False, workbook_workers: int = 1) -> None:
+        super().__init__(run_config, verbose, yaml_export, profile, profile_cprofile)
 
         self.config['base_xls'] = base_xls
         self.config['manual_parameter_xls'] = manual_parameter_xls
@@ -195,175 +283,113 @@ class Model(DBInterface):
         self.first_model_year = first_model_year
         self.last_model_year = last_model_year
         self.model_range_year = model_range_year
+        self.build_config = BuildConfig(base_xls, historical_range_year, first_historical_year, model_range_year,
+                                        first_model_year, last_model_year, manual_parameter_xls, historical_data,
+                                        self.ENABLE_SLACK_TECHS, workbook_workers)
 
-        self._create_year_vectors()
-        self._calc_duration_period()
-
+        self.data = {}
+        self.raw_data = {}
+        self.model_par = {}
         self.manual_input = False
+        self.tech_cache: Optional[TechnologyCache] = None
 
-        # create new message scenario
-        self.scenario = self.Scenario(model, scen, 'new', annotation)
+        with self.profile.stage('create_year_vectors'):
+            self._create_year_vectors()
 
-        # load raw input data
-        self._load_raw_input_data()
-
-        self._preprocess()
-        self._create_model()
+        # create new message scenario
+        with self.profile.stage('create_scenario'):
+            self.scenario = self.Scenario(model, scen, 'new', annotation)
+            self.schema = self.scenario_schema(self.scenario)
+
+        # load raw input data, preprocess and create the model parameters
+        if build_result is None:
+            build_result = build_stages(self.build_config, self._years, self.schema, self.profile, checkpoint_dir,
+                                        TechnologyCache() if incremental else None)
+        self._set_build_result(build_result)
+
+    @classmethod
+    def from_build(cls, build_result: BuildResult, model: str, scen: str, annotation: Optional[str] = None,
+                   run_config: Optional[str] = None, verbose: bool = False, yaml_export: bool = True) -> 'Model':
+        """Create a new scenario for a model built with `d2ix.build.build_model`"""
+        c = build_result.config
+        return cls(model, scen, c.base_xls, c.historical_range_year, c.first_historical_year, c.model_range_year,
+                   c.first_model_year, c.last_model_year, manual_parameter_xls=c.manual_parameter_xls,
+                   annotation=annotation, historical_data=c.historical_data, run_config=run_config, verbose=verbose,
+                   yaml_export=yaml_export, build_result=build_result, workbook_workers=c.workbook_workers)
+
+    @classmethod
+    def load_snapshot(cls, path: Union[str, Path], model: str, scen: str, annotation: Optional[str] = None,
+                      run_config: Optional[str] = None, verbose: bool = False, yaml_export: bool = True,
+                      verify: bool = False) -> 'Model':
+        """Create a new scenario for the parameters of a snapshot saved with
+        `Model.save_snapshot`, the parameters are read from the memory-mapped
+        files on first access
+        """
+        manifest = read_manifest(path)
+        if manifest['config'] is None:
+            raise SnapshotError(f'The model snapshot \'{path}\' has no build configuration')
+        config = BuildConfig(**manifest['config'])
+        data: Data = {'units': {k: {'unit': v} for k, v in manifest['units'].items()}}
+        build_result = BuildResult(config, create_year_vectors(config), {}, data, load_snapshot(path, verify),
+                                   manifest['manual_input'])
+        return cls.from_build(build_result, model, scen, annotation, run_config, verbose, yaml_export)
+
+    def save_snapshot(self, path: Union[str, Path]) -> Path:
+        """Save all parameters and sets to Arrow IPC files with a manifest,
+        see `d2ix.snapshot.save_snapshot`
+        """
+        units = {k: v['unit'] for k, v in self.data.get('units', {}).items() if 'unit' in v}
+        return save_snapshot(self.model_par, path, self.build_config, units, self.manual_input)
+
+    def _set_build_result(self, build_result: BuildResult) -> None:
+        if build_result.config._replace(enable_slack_techs=self.ENABLE_SLACK_TECHS) != self.build_config:
+            raise ValueError('The build result was created with a different configuration')
+        self.build_config = build_result.config
+        self.raw_data = build_result.raw_data
+        self.data = build_result.data
+        self.model_par = build_result.model_par
+        self.manual_input = build_result.manual_input
+        self.tech_cache = build_result.tech_cache
+
+    def rebuild(self, checkpoint_dir: Optional[str] = None) -> None:
+        """Read the input workbooks again and update `model_par`, the rows
+        of technologies with unchanged definitions are taken from the last
+        build
+        """
+        tech_cache = self.tech_cache
+        if tech_cache is None and checkpoint_dir is None:
+            # all rows are created and kept for the next rebuild
+            tech_cache = TechnologyCache()
+        build_result = build_stages(self.build_config, self._years, self.schema, self.profile, checkpoint_dir,
+                                    tech_cache)
+        self._set_build_result(build_result)
 
     def _create_year_vectors(self) -> None:
-        if self.historical_data:
-            if not (self.first_historical_year < self.first_model_year
-                    < self.last_model_year):
-                logger.error(
-                    f'Wrong year settings: first_historical_year:'
-                    f'{self.first_historical_year} < first_model_year:'
-                    f'{self.first_model_year} < last_model_year:'
-                    f'{self.last_model_year}')
-                sys.exit()
-        else:
-            if not self.first_model_year < self.last_model_year:
-                logger.error(
-                    f'Wrong year settings: first_model_year:'
-                    f'{self.first_model_year} < last_model_year:'
-                    f'{self.last_model_year}')
-                sys.exit()
-
-        self.active_years = list(
-            range(self.first_model_year, self.last_model_year + 1, self.model_range_year))
-        if self.historical_data:
-            self.historical_years = list(
-                range(self.first_historical_year, self.first_model_year - self.model_range_year + 1,
-                      self.historical_range_year))
-            self.year_vector = self.historical_years + self.active_years
-        else:
-            self.year_vector = self.active_years
-
-    def _calc_duration_period(self) -> None:
-        _years = self.year_vector
-
-        self.duration_period[_years[0]] = None
-        self.duration_period.update({_years[i + 1]: _years[i + 1] - _years[i] for i in range(0, len(_years) - 1)})
-        self.duration_period[_years[0]] = self.duration_period[_years[1]]
-
-        _d_p_sum = {_years[1]: self.duration_period[_years[0]]}
-        _tmp = list(self.duration_period.values())[1:]
-        _d_p_sum.update(
-            {_years[i + 1]: sum(_tmp[0:i]) + self.duration_period[_years[0]] for i in range(1, len(_years) - 1)})
-
-        df = pd.DataFrame(columns=self.year_vector[1:], index=self.year_vector[1:-1])
-
-        idx = list(df.index)
-        for y2 in df.columns:
-            df.loc[:, y2] = [int(_d_p_sum[y2] - _d_p_sum[y1]) if y1 < y2 else 0 for y1 in idx]
-        df.loc[_years[0], :] = [v for k, v in _d_p_sum.items()]
-        df.loc[_years[-1], :] = 0
-        df[_years[0]] = 0
-        df = df.sort_index().astype(int)
-        df = df[self.year_vector]
-        self.duration_period_sum = df
-
-    def _load_raw_input_data(self) -> None:
-        logger.info(f'Load model input data from: \'{self.config["base_xls"]}\'')
-        pars = ['demand', 'spec_techs', 'unit', 'locations', 'lvl_spatial', 'map_spatial_hierarchy', 'level',
-                'rel_and_flex', 'renewable_potential', 'emissions']
-
-        _tmp = pd.read_excel(self.config['base_xls'], sheet_name=None)
-        _tmp = {k: v for k, v in _tmp.items() if (k in pars) and not v.empty}
-        self.raw_data['base_input'] = _tmp
-
-        # load default techs
-        self.raw_data['base_tech'] = YAMLd2ix().load(_CONFIG_BASE_TECHNOLOGY)
-
-        p = Path(self.config['manual_parameter_xls'])
-        if p.exists():
-            self.manual_input = True
-            logger.info(f'Load model input data from: \'{self.config["manual_parameter_xls"]}\'')
-            _tmp = pd.read_excel(p, sheet_name=None)
-            _tmp = {k: v for k, v in _tmp.items() if not v.empty}
-            self.raw_data['manual_input'] = _tmp
-        elif self.config['manual_parameter_xls'] is not None:
-            logger.error(f'Path \'{p}\'does not exist')
-
-    def _preprocess(self) -> None:
-        logger.debug('Create helper dict structure')
-        self.data['demand'] = process_demand(self.raw_data)
-        self.data['technology'] = process_base_techs(self.raw_data, self.year_vector, self.first_model_year,
-                                                     self.duration_period_sum)
-        self.data['units'] = process_units(self.raw_data)
-        self.data['technology'].update(
-            process_spec_techs(self.raw_data, self.data, self.year_vector, self.first_model_year,
-                               list(self.scenario.par_list()), self.duration_period_sum))
-        self.data['locations'] = process_spatial_locations(self.raw_data)
-        self.data['lvl_spatial'] = process_lvl_spatial(self.raw_data)
-        self.data['map_spatial_hierarchy'] = process_map_spatial_hierarchy(self.raw_data)
-
-        _levels = process_level(self.raw_data)
-        for k, v in _levels.items():
-            getattr(self, 'data')[k] = v
-
-    def _create_model(self) -> None:
-        # get used parameter
-        par_list = list(self.data['units'].keys())
-        par_list.remove('demand')
-        self.data['technology_parameter'] = par_list
-        par_list.extend(['demand'])
-        self.model_par = {i: self.scenario.par(i) for i in par_list}
-
-        # add parameters manual to the model
-        if self.manual_input:
-            logger.info(f'Create parameters from: \'{self.config["manual_parameter_xls"]}\'')
-            self.model_par.update(add_parameter_manual(self.raw_data['manual_input']))
-
-        # add technologies over locations
-        logger.info(f'Create parameters from: \'{self.config["base_xls"]}\'')
-        for loc in self.data['locations'].keys():
-            self.model_par.update(add_technology(self.data, self.model_par, self.first_model_year, self.active_years,
-                                                 self.historical_years, self.duration_period_sum, loc,
-                                                 par='technology'))
-
-        # add demand to the model over locations
-        logger.info(f'Create demands from: \'{self.config["base_xls"]}\'')
-        for loc in sorted(self.data['demand'].keys()):
-            self.model_par.update(add_demand(self.data, self.model_par, loc))
-            if self.ENABLE_SLACK_TECHS is True:
-                self.model_par.update(
-                    add_technology(self.data, self.model_par, self.first_model_year, self.active_years,
-                                   self.historical_years, self.duration_period_sum, loc, par='demand', slack=True))
-
-        # add rel and flex parameter
-        if 'rel_and_flex' in self.raw_data['base_input'].keys():
-            logger.info(f'Create parameters from: \'{self.config["base_xls"]}\' - \'rel_and_flex\'')
-            self.model_par.update(add_reliability_flexibility_parameter(self.data, self.model_par, self.raw_data))
-
-        # add renewable potential parameter
-        if 'renewable_potential' in self.raw_data['base_input'].keys():
-            logger.info(f'Create parameters from: \'{self.config["base_xls"]}\' - \'renewable_potential\'')
-            self.model_par.update(create_renewable_potential(self.raw_data, self.data, self.active_years))
-
-        # change emission factor
-        if 'emissions' in self.raw_data['base_input'].keys():
-            logger.info(f'Change emission factor from: \'{self.config["base_xls"]}\' - \'emissions\'')
-            self.model_par.update(change_emission_factor(self.raw_data, self.model_par))
-
-        # add sets
-        logger.info(f'Create sets from: \'{self.config["base_xls"]}\' and \'{self.config["manual_parameter_xls"]}\'')
-        self.model_par.update(extract_sets(self.scenario, self.model_par))
-        self.model_par.update(add_sets(self.data, self.model_par, self.first_model_year))
-
-        # sanity checks
-        check_input_data(self.raw_data, self.model_par)
+        try:
+            years = create_year_vectors(self.build_config)
+        except ValueError as e:
+            logger.error(e)
+            sys.exit()
+        self.active_years = years.active_years
+        self.historical_years = years.historical_years
+        self.year_vector = years.year_vector
+        self.duration_period = years.duration_period
+        self.duration_period_sum = years.duration_period_sum
+        self._years = years
 
 
 class ModifyModel(DBInterface):
-    model_par: ModelPar = {}
+    model_par: ModelPar
     scenario: message_ix.Scenario
 
     def __init__(self, model: str, scen: str, run_config: Optional[str] = None,
                  xls_dir: str = 'scen2xls', file_name: str = 'data.xlsx', verbose: bool = False,
-                 yaml_export: bool = True) -> None:
-        super().__init__(run_config, verbose, yaml_export)
+                 yaml_export: bool = True, profile: bool = False, checkpoint_dir: Optional[str] = None) -> None:
+        super().__init__(run_config, verbose, yaml_export, profile)
+        self.checkpoint = BuildCheckpoint(checkpoint_dir) if checkpoint_dir is not None else None
         self.model = model
         self.scen = scen
+        self.model_par = {}
         self.version: Optional[Union[int, str]] = None
         self.annotation: Optional[str] = None
         self.xls_dir: Path = Path(xls_dir)
@@ -373,13 +399,32 @@ class ModifyModel(DBInterface):
         self.config['input_path'] = str(self.xls_dir.joinpath('yaml_export'))
         self.model_type = 'modify'
 
-    def get_model_pars(self, version: Optional[Union[int, str]] = None) -> None:
+    def get_model_pars(self, version: Optional[Union[int, str]] = None, pars: Optional[List[str]] = None,
+                       sets: Optional[List[str]] = None, max_workers: int = MAX_FETCH_WORKERS) -> None:
+        """Load the parameters and sets (default: all) of the scenario,
+        non-empty items are fetched concurrently
+        """
         self.scenario = self.pull_results(self.model, self.scen, version)
-        self.model_par.update({par: self.scenario.par(par) for par in self.scenario.par_list()})
-        self.model_par.update({sets: self.scenario.set(sets) for sets in self.scenario.set_list()})
-
-    def scen2xls(self, version: Optional[Union[int, str]] = None) -> None:
-        self.get_model_pars(version)
+        schema = self.scenario_schema(self.scenario).with_items(self.scenario)
+        self.model_par.update(fetch_items(self.scenario, schema, pars, sets, max_workers))
+
+    def diff(self, other: ScenarioKey, version: Optional[Union[int, str]] = None, pars: Optional[List[str]] = None,
+             rtol: float = 1e-9, atol: float = 0.0) -> Dict[str, ParameterDiff]:
+        """Parameter rows which were added, removed or changed from this
+        scenario (`version`) to the scenario `other`, compared one parameter
+        at a time
+        """
+        scenario = self.pull_results(self.model, self.scen, version)
+        other_scenario = self.pull_results(other.model, other.scenario, other.version)
+        schema = self.scenario_schema(scenario)
+        diffs = diff_scenarios(ScenarioSource(scenario, schema.with_items(scenario)),
+                               ScenarioSource(other_scenario, schema.with_items(other_scenario)), pars, rtol, atol)
+        logger.info(f'{len(diffs)} parameters differ from \'{other.name}\'')
+        return diffs
+
+    def scen2xls(self, version: Optional[Union[int, str]] = None, pars: Optional[List[str]] = None,
+                 sets: Optional[List[str]] = None, max_workers: int = MAX_FETCH_WORKERS) -> None:
+        self.get_model_pars(version, pars, sets, max_workers)
 
         logger.info('Write model to excel')
         with ExcelWriter(str(self.file_name)) as writer:
@@ -390,7 +435,8 @@ class ModifyModel(DBInterface):
 
     def xls2model(self, annotation: Optional[str] = None) -> None:
         logger.info('Create model from excel')
-        self.model_par = pd.read_excel(self.file_name, sheet_name=None)
+        key = self.checkpoint.key(str(self.file_name), file_hash(self.file_name)) if self.checkpoint else ''
+        self.model_par = run_stage(self.checkpoint, 'xls2model', key, read_workbook, self.file_name)
         self.version = 'new'
         self.annotation = annotation
         self.scenario = self.Scenario(self.model, self.scen, self.version, self.annotation)
@@ -398,11 +444,13 @@ class ModifyModel(DBInterface):
 
 class PostProcess(DBInterface):
     raw_data: RawData
-    attributes: dict = {}
+    attributes: dict
 
     def __init__(self, run_config: Optional[str], model: str, scen: str, version: Optional[Union[int, str]] = None,
                  base_xls: Optional[str] = None, verbose: bool = False) -> None:
         super().__init__(run_config, verbose)
+        self.raw_data = {}
+        self.attributes = {}
         self.model = model
         self.scen = scen
         self.version = version
@@ -412,8 +460,9 @@ class PostProcess(DBInterface):
 
     def _get_synonyms_colors(self) -> None:
         logger.info(f'Load model input data from: \'{self.base_xls}\'')
-        self.raw_data['spec_techs'] = pd.read_excel(self.base_xls, sheet_name='spec_techs')
-        _tmp = self.raw_data['spec_techs'].get(['technology', 'postprocess_color', 'postprocess_synonym'])
+        self.raw_data['spec_techs'] = read_workbook(self.base_xls, [SheetSpec('spec_techs', POSTPROCESS_COLUMNS)],
+                                                    max_workers=1)['spec_techs']
+        _tmp = self.raw_data['spec_techs'].get(POSTPROCESS_COLUMNS)
         if isinstance(_tmp, pd.DataFrame):
             if not _tmp.empty:
                 _tmp = _tmp.rename(columns={k: k.replace('postprocess_', '') for k in _tmp.columns})
@@ -433,3 +482,52 @@ class PostProcess(DBInterface):
     @staticmethod
     def create_plotdata(results: message_ix.Scenario) -> pd.DataFrame:
         return create_plotdata_df(results)
+
+    def compare(self, scenarios: List[ScenarioKey], baseline: Optional[ScenarioKey] = None,
+                variables: Optional[List[str]] = None, max_workers: int = 4) -> pd.DataFrame:
+        """Load the results of several scenarios concurrently into one long-format
+        DataFrame with the key column 'scenario_key' and the deltas against the
+        baseline (default: first scenario)
+        """
+        logger.info(f'Compare {len(scenarios)} scenarios')
+        return compare_scenarios(lambda key: self.pull_results(key.model, key.scenario, key.version), scenarios,
+                                 baseline, variables, max_workers)
+
+    @staticmethod
+    def export_timeseries(results: message_ix.Scenario, path: Union[str, Path],
+                          variables: Optional[List[str]] = None) -> Path:
+        """Write the timeseries of the results to a '.csv.gz' or '.parquet'
+        file instead of the scenario
+        """
+        return export_timeseries(results, path, variables=variables)
+
+    def export_timeseries_many(self, scenarios: List[ScenarioKey], directory: Union[str, Path], fmt: str = 'csv.gz',
+                               variables: Optional[List[str]] = None, max_workers: int = 4) -> List[Path]:
+        logger.info(f'Export timeseries of {len(scenarios)} scenarios')
+        return export_timeseries_many(lambda key: self.pull_results(key.model, key.scenario, key.version),
+                                      scenarios, directory, fmt, variables, max_workers)
+
+    def archive(self, directory: Optional[Union[str, Path]] = None, variables: Optional[List[str]] = None) -> List[str]:
+        """Add the results of the scenario to the local results store in
+        `directory` (default: run config entry 'results_store'), variables
+        which are already archived for this version are not loaded again
+        """
+        directory = directory if directory is not None else self.config['db'].get('results_store')
+        if directory is None:
+            raise ValueError('No results store, set \'results_store\' in the run config or pass a directory')
+        store = ResultStore(directory)
+        variables = variables if variables is not None else COMPARE_VARIABLES
+        if isinstance(self.version, int) and all(store.has(self.model, self.scen, self.version, v) for v in variables):
+            return []
+        results = self.get_results()
+        logger.info(f'Archive results of \'{self.model}|{self.scen}|{results.version}\' to \'{store.directory}\'')
+        return store.archive(results, self.model, self.scen, results.version, variables)
+
+    @staticmethod
+    def rank(comparison: pd.DataFrame, variable: str, by: str = 'lvl', year: Optional[int] = None,
+             technology: Optional[List[str]] = None, ascending: bool = False) -> pd.DataFrame:
+        return rank_scenarios(comparison, variable, by, year, technology, ascending)
+
+    @staticmethod
+    def comparison_plotdata(comparison: pd.DataFrame, scenario_key: str, value: str = 'lvl') -> pd.DataFrame:
+        return scenario_plotdata(comparison, scenario_key, value)
@@ -0,0 +1,176 @@
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import message_ix
+import numpy as np
+import pandas as pd
+
+from d2ix.fetch import FetchItem, empty_item, item_size
+from d2ix.schema import ScenarioSchema
+
+logger = logging.getLogger(__name__)
+
+VALUE_COLUMNS = ['value', 'unit']
+
+
+class ParameterDiff(NamedTuple):
+    """Rows of a parameter which were added, removed or changed (value or
+    unit) from the old to the new scenario. `changed` has the columns
+    'value_old', 'value_new', 'delta', 'unit_old' and 'unit_new'.
+    """
+    name: str
+    added: pd.DataFrame
+    removed: pd.DataFrame
+    changed: pd.DataFrame
+
+    @property
+    def empty(self) -> bool:
+        return self.added.empty and self.removed.empty and self.changed.empty
+
+
+class ScenarioSource(object):
+    """Parameters of a scenario on the platform, empty parameters are not
+    fetched
+    """
+
+    def __init__(self, scenario: message_ix.Scenario, schema: ScenarioSchema) -> None:
+        self.scenario = scenario
+        self.schema = schema
+
+    def par_list(self) -> List[str]:
+        return self.schema.par_list
+
+    def idx_names(self, name: str) -> List[str]:
+        return self.schema.idx_names[name]
+
+    def par(self, name: str) -> pd.DataFrame:
+        if item_size(self.scenario, 'par', name) == 0:
+            return empty_item(self.schema, FetchItem(name, 'par'))
+        return self.scenario.par(name)
+
+
+class ParquetSource(object):
+    """Parameters of a scenario snapshot, one Parquet file per parameter in
+    `directory` (see `write_snapshot`)
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory = Path(directory)
+        self._columns: Dict[str, List[str]] = {}
+
+    def _path(self, name: str) -> Path:
+        return self.directory.joinpath(f'{name}.parquet')
+
+    def par_list(self) -> List[str]:
+        return sorted(p.stem for p in self.directory.glob('*.parquet'))
+
+    def idx_names(self, name: str) -> List[str]:
+        if name not in self._columns:
+            self.par(name)
+        return [c for c in self._columns[name] if c not in VALUE_COLUMNS]
+
+    def par(self, name: str) -> pd.DataFrame:
+        df = pd.read_parquet(self._path(name))
+        self._columns[name] = list(df.columns)
+        return df
+
+
+Source = Union[ScenarioSource, ParquetSource]
+
+
+def write_snapshot(source: Source, directory: Union[str, Path], pars: Optional[Iterable[str]] = None) -> None:
+    """Save the parameters of a source to Parquet files, e.g. for offline
+    tests of scenario diffs
+    """
+    p = Path(directory)
+    p.mkdir(parents=True, exist_ok=True)
+    for name in (source.par_list() if pars is None else pars):
+        df = source.par(name)
+        if not df.empty:
+            df.reset_index(drop=True).to_parquet(p.joinpath(f'{name}.parquet'), index=False)
+
+
+def _row_hash(df: pd.DataFrame, index: List[str]) -> np.ndarray:
+    # years may be stored as int or float, all numbers are hashed as float
+    keys = {c: df[c].astype(float) if pd.api.types.is_numeric_dtype(df[c]) else df[c] for c in index}
+    return pd.util.hash_pandas_object(pd.DataFrame(keys, columns=index), index=False).values
+
+
+def _unique(df: pd.DataFrame, index: List[str]) -> Tuple[pd.DataFrame, pd.Index]:
+    # a scenario keeps the last row of an index key
+    if df.empty:
+        return df.reset_index(drop=True), pd.Index(np.array([], dtype=np.uint64))
+    row_hash = pd.Index(_row_hash(df, index))
+    keep = ~row_hash.duplicated(keep='last')
+    if keep.all():
+        return df.reset_index(drop=True), row_hash
+    return df[keep].reset_index(drop=True), row_hash[keep]
+
+
+def diff_parameter(name: str, old: pd.DataFrame, new: pd.DataFrame, index: List[str], rtol: float = 1e-9,
+                   atol: float = 0.0) -> ParameterDiff:
+    """Align the rows of a parameter on a 64 bit hash of its index columns
+    and compare value and unit. The probability of a hash collision is about
+    1e-6 for ten million rows.
+    """
+    old, old_hash = _unique(old, index)
+    new, new_hash = _unique(new, index)
+
+    # positions of the rows of the old parameter in the new one
+    new_pos = new_hash.get_indexer(old_hash)
+    matched = np.flatnonzero(new_pos >= 0)
+    new_matched = new_pos[matched]
+
+    removed = old.iloc[np.flatnonzero(new_pos < 0)].reset_index(drop=True)
+    added = new[~new_hash.isin(old_hash)].reset_index(drop=True)
+
+    value_old = old['value'].values[matched].astype(float)
+    value_new = new['value'].values[new_matched].astype(float)
+    unit_old = old['unit'].values[matched]
+    unit_new = new['unit'].values[new_matched]
+    mask = ~np.isclose(value_old, value_new, rtol=rtol, atol=atol, equal_nan=True) | \
+        (unit_old.astype(str) != unit_new.astype(str))
+
+    changed = old[index].iloc[matched[mask]].reset_index(drop=True)
+    changed['value_old'] = value_old[mask]
+    changed['value_new'] = value_new[mask]
+    changed['delta'] = value_new[mask] - value_old[mask]
+    changed['unit_old'] = unit_old[mask]
+    changed['unit_new'] = unit_new[mask]
+    return ParameterDiff(name, added, removed, changed)
+
+
+def iter_diff(old: Source, new: Source, pars: Optional[Iterable[str]] = None, rtol: float = 1e-9,
+              atol: float = 0.0) -> Iterator[ParameterDiff]:
+    """Diffs of the parameters (default: all parameters of both sources), one
+    parameter at a time to bound the memory
+    """
+    old_pars = old.par_list()
+    new_pars = new.par_list()
+    if pars is None:
+        pars = old_pars + [i for i in new_pars if i not in old_pars]
+    for name in pars:
+        df_old = old.par(name) if name in old_pars else None
+        df_new = new.par(name) if name in new_pars else None
+        if df_old is None and df_new is None:
+            continue
+        index = (old if df_old is not None else new).idx_names(name)
+        if df_old is None:
+            df_old = df_new.iloc[:0]
+        if df_new is None:
+            df_new = df_old.iloc[:0]
+        logger.debug(f'Diff parameter \'{name}\'')
+        yield diff_parameter(name, df_old, df_new, index, rtol, atol)
+
+
+def diff_summary(diffs: Iterable[ParameterDiff]) -> pd.DataFrame:
+    return pd.DataFrame([{'parameter': d.name, 'added': len(d.added), 'removed': len(d.removed),
+                          'changed': len(d.changed)} for d in diffs],
+                        columns=['parameter', 'added', 'removed', 'changed'])
+
+
+def diff_scenarios(old: Source, new: Source, pars: Optional[Iterable[str]] = None, rtol: float = 1e-9,
+                   atol: float = 0.0) -> Dict[str, ParameterDiff]:
+    """Diffs of all parameters with differences"""
+    return {d.name: d for d in iter_diff(old, new, pars, rtol, atol) if not d.empty}
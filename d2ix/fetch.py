@@ -0,0 +1,81 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+import message_ix
+import pandas as pd
+
+from d2ix.schema import ScenarioSchema
+
+logger = logging.getLogger(__name__)
+
+MAX_FETCH_WORKERS = 4
+
+Item = Union[pd.DataFrame, pd.Series]
+
+
+class FetchItem(NamedTuple):
+    name: str
+    ix_type: str
+
+
+def item_size(scenario: message_ix.Scenario, ix_type: str, name: str) -> Optional[int]:
+    """Number of elements of a parameter or set, without converting the
+    elements to a DataFrame. None if the platform does not report the size.
+    """
+    try:
+        return int(scenario._item(ix_type, name).getSize())
+    except Exception as e:
+        # private ixmp API, it may be missing or raise (e.g. a Java exception) in other ixmp releases
+        logger.debug(f'Size of {ix_type} \'{name}\' is unknown: {e!r}')
+        return None
+
+
+def empty_item(schema: ScenarioSchema, item: FetchItem) -> Item:
+    # equal to the empty scenario.par(name) or scenario.set(name)
+    if item.ix_type == 'par':
+        return schema.par(item.name)
+    if schema.is_index_set(item.name):
+        return pd.Series(dtype=object)
+    return pd.DataFrame(columns=schema.idx_names[item.name])
+
+
+def _select(names: List[str], subset: Optional[Iterable[str]], ix_type: str) -> List[str]:
+    if subset is None:
+        return names
+    subset = list(subset)
+    unknown = [i for i in subset if i not in names]
+    if unknown:
+        raise ValueError(f'Unknown {ix_type}: {unknown}')
+    return [i for i in names if i in subset]
+
+
+def fetch_items(scenario: message_ix.Scenario, schema: ScenarioSchema, pars: Optional[Iterable[str]] = None,
+                sets: Optional[Iterable[str]] = None,
+                max_workers: int = MAX_FETCH_WORKERS) -> Dict[str, Item]:
+    """Parameters and sets of a scenario (default: all), fetched concurrently
+    in a thread pool. The size of every item is asked first, empty items are
+    created from the schema without fetching them. If the platform does not
+    report the sizes all items are fetched.
+    """
+    items = [FetchItem(i, 'par') for i in _select(schema.par_list, pars, 'parameters')] + \
+            [FetchItem(i, 'set') for i in _select(schema.set_list, sets, 'sets')]
+
+    sizes: Dict[FetchItem, int] = {}
+    for item in items:
+        size = item_size(scenario, item.ix_type, item.name)
+        if size is None:
+            logger.debug('The platform does not report the item sizes, all items are fetched')
+            sizes = {}
+            break
+        sizes[item] = size
+
+    def _fetch(item: FetchItem) -> Item:
+        if sizes.get(item) == 0:
+            return empty_item(schema, item)
+        logger.debug(f'Fetch {item.ix_type} \'{item.name}\'')
+        return scenario.par(item.name) if item.ix_type == 'par' else scenario.set(item.name)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = list(executor.map(_fetch, items))
+    return {item.name: df for item, df in zip(items, frames)}
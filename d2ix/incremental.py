@@ -0,0 +1,72 @@
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+import pandas as pd
+
+from d2ix.util import materialize
+from d2ix.util.vintage import VintageBlock
+
+logger = logging.getLogger(__name__)
+
+TechKey = Tuple[str, str, str]
+Piece = Union[pd.DataFrame, VintageBlock]
+
+
+def _hash(*inputs: Any) -> str:
+    return hashlib.sha256(repr(inputs).encode()).hexdigest()
+
+
+class TechnologyCache(object):
+    """Parameter rows created by `add_technology` for every (location,
+    parameter sheet, technology), together with a hash of the resolved
+    technology definition (spec_techs row, base technology and location
+    override) and its historical vintages. In a rebuild only technologies
+    with a changed hash are created again, all other rows are spliced in from
+    the cache. The cache is cleared if the `context` (year vectors, used
+    parameters) changes.
+    """
+
+    def __init__(self) -> None:
+        self.context = ''
+        self._entries: Dict[TechKey, Tuple[str, Dict[str, Piece]]] = {}
+        self._used: Set[TechKey] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def begin(self, *context: Any) -> None:
+        context_hash = _hash(*context)
+        if context_hash != self.context:
+            if self._entries:
+                logger.info('Model settings changed, the technology cache is cleared')
+            self._entries = {}
+            self.context = context_hash
+        self._used = set()
+        self.hits = 0
+        self.misses = 0
+
+    def end(self) -> None:
+        """Drop the entries of technologies which were not part of the build"""
+        removed = set(self._entries) - self._used
+        for k in removed:
+            del self._entries[k]
+        logger.info(f'Technologies: {self.misses} created, {self.hits} from cache, {len(removed)} removed')
+
+    @staticmethod
+    def key(technology: dict, years_no_hist_cap: List[int]) -> str:
+        return _hash(materialize(technology), sorted(years_no_hist_cap))
+
+    def get(self, tech_key: TechKey, key: str) -> Optional[Dict[str, Piece]]:
+        self._used.add(tech_key)
+        entry = self._entries.get(tech_key)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, tech_key: TechKey, key: str, pieces: Dict[str, Piece]) -> None:
+        self._entries[tech_key] = (key, pieces)
+
+    def __len__(self) -> int:
+        return len(self._entries)
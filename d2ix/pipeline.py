@@ -0,0 +1,178 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import message_ix
+import pandas as pd
+
+from d2ix.build import BuildConfig, BuildResult, build_model
+from d2ix.core import Model
+from d2ix.platform import write_lock
+from d2ix.postprocess import create_plotdata_df
+from d2ix.schema import ScenarioSchema
+
+logger = logging.getLogger(__name__)
+
+STAGES = ['build', 'upload', 'solve', 'extract']
+
+
+class ScenarioJob(NamedTuple):
+    name: str
+    config: BuildConfig
+    model: str
+    scenario: str
+    annotation: Optional[str] = None
+    run_config: Optional[str] = None
+    solve_options: Optional[dict] = None
+
+
+class JobResult(NamedTuple):
+    job: ScenarioJob
+    status: str
+    timings: Dict[str, float]
+    results: Optional[pd.DataFrame] = None
+    failed_stage: Optional[str] = None
+    error: Optional[str] = None
+
+
+class UploadedScenario(NamedTuple):
+    """Uploaded scenario and the model holding the shared platform, released
+    with `close` when the job is finished
+    """
+    model: Model
+    scenario: message_ix.Scenario
+
+    def close(self) -> None:
+        self.model.close()
+
+
+def upload_model(job: ScenarioJob, build_result: BuildResult) -> UploadedScenario:
+    model = Model.from_build(build_result, job.model, job.scenario, job.annotation, run_config=job.run_config,
+                             yaml_export=False)
+    try:
+        with write_lock(model.config['db']):
+            scenario = model.model2db()
+        return UploadedScenario(model, scenario)
+    except Exception:
+        model.close()
+        raise
+
+
+def solve_scenario(job: ScenarioJob, uploaded: UploadedScenario) -> UploadedScenario:
+    # the solution is written back through the shared platform, one solve per database at a time
+    with write_lock(uploaded.model.config['db']):
+        uploaded.scenario.solve(model='MESSAGE', **(job.solve_options or {}))
+    return uploaded
+
+
+def extract_results(job: ScenarioJob, solved: UploadedScenario) -> pd.DataFrame:
+    return create_plotdata_df(solved.scenario)
+
+
+class PipelineRunner(object):
+    """Run many scenario jobs through build -> upload -> solve -> extract.
+
+    The stages of different jobs overlap, the number of jobs per stage is
+    limited by `max_build`, `max_solve` and `max_extract`. Builds run in a
+    pool of spawned processes, all other stages in threads. The platform has
+    a single writer: uploads are serialized and the default uploader and
+    solver hold the write lock of the database, so the default solves of
+    jobs on the same database do not overlap. Each stage is replaceable,
+    e.g. with a local stub for the solver in offline tests:
+
+        builder(config) -> built model (picklable, runs in a worker process)
+        uploader(job, built) -> uploaded scenario
+        solver(job, uploaded) -> solved scenario
+        extractor(job, solved) -> pd.DataFrame
+
+    The default stages pass an `UploadedScenario`, it is closed (and the
+    shared platform released) after the last stage of the job.
+    """
+
+    def __init__(self, schema: Optional[ScenarioSchema] = None, builder: Optional[Callable[[BuildConfig], Any]] = None,
+                 uploader: Callable[[ScenarioJob, Any], Any] = upload_model,
+                 solver: Callable[[ScenarioJob, Any], Any] = solve_scenario,
+                 extractor: Callable[[ScenarioJob, Any], pd.DataFrame] = extract_results,
+                 max_build: Optional[int] = None, max_solve: int = 2, max_extract: int = 4,
+                 build_executor: Optional[Executor] = None) -> None:
+        if builder is None:
+            if schema is None:
+                raise ValueError('A scenario schema is required for the default builder')
+            builder = functools.partial(build_model, schema=schema)
+        self.builder = builder
+        self.uploader = uploader
+        self.solver = solver
+        self.extractor = extractor
+        self.max_build = max_build or os.cpu_count() or 1
+        self.max_solve = max_solve
+        self.max_extract = max_extract
+        self.build_executor = build_executor
+
+    async def run(self, jobs: List[ScenarioJob]) -> List[JobResult]:
+        logger.info(f'Run pipeline for {len(jobs)} jobs')
+        limits = {'build': self.max_build, 'upload': 1, 'solve': self.max_solve, 'extract': self.max_extract}
+        self._semaphores = {k: asyncio.Semaphore(v) for k, v in limits.items()}
+
+        # spawned, not forked: this process may run the JVM of the shared platform
+        build_executor = self.build_executor or ProcessPoolExecutor(
+            max_workers=self.max_build, mp_context=multiprocessing.get_context('spawn'))
+        thread_executor = ThreadPoolExecutor(max_workers=self.max_solve + self.max_extract + 1)
+        try:
+            return await asyncio.gather(*[self._run_job(job, build_executor, thread_executor) for job in jobs])
+        finally:
+            thread_executor.shutdown(wait=True)
+            if self.build_executor is None:
+                build_executor.shutdown(wait=True)
+
+    def run_sync(self, jobs: List[ScenarioJob]) -> List[JobResult]:
+        return asyncio.run(self.run(jobs))
+
+    async def _run_job(self, job: ScenarioJob, build_executor: Executor, thread_executor: Executor) -> JobResult:
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        stage = 'build'
+        uploaded = None
+        try:
+            built = await self._stage(timings, stage, build_executor, self.builder, job.config)
+            stage = 'upload'
+            uploaded = await self._stage(timings, stage, thread_executor, self.uploader, job, built)
+            stage = 'solve'
+            solved = await self._stage(timings, stage, thread_executor, self.solver, job, uploaded)
+            stage = 'extract'
+            results = await self._stage(timings, stage, thread_executor, self.extractor, job, solved)
+        except Exception as e:
+            timings['total'] = time.perf_counter() - start
+            logger.error(f'Job \'{job.name}\' failed in stage \'{stage}\': {e!r}')
+            return JobResult(job, 'failed', timings, failed_stage=stage, error=repr(e))
+        finally:
+            if isinstance(uploaded, UploadedScenario):
+                try:
+                    await asyncio.get_running_loop().run_in_executor(thread_executor, uploaded.close)
+                except Exception as e:
+                    logger.warning(f'Model of job \'{job.name}\' can not be closed: {e!r}')
+        timings['total'] = time.perf_counter() - start
+        logger.info(f'Job \'{job.name}\' finished in {timings["total"]:.1f}s')
+        return JobResult(job, 'ok', timings, results=results)
+
+    async def _stage(self, timings: Dict[str, float], stage: str, executor: Executor, func: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        wait = time.perf_counter()
+        async with self._semaphores[stage]:
+            start = time.perf_counter()
+            timings[f'{stage}_wait'] = start - wait
+            try:
+                return await loop.run_in_executor(executor, functools.partial(func, *args))
+            finally:
+                timings[stage] = time.perf_counter() - start
+
+
+def timings_frame(results: List[JobResult]) -> pd.DataFrame:
+    """Per-job stage and waiting times in seconds"""
+    df = pd.DataFrame([r.timings for r in results], index=[r.job.name for r in results])
+    df['status'] = [r.status for r in results]
+    return df
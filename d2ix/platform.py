@@ -0,0 +1,111 @@
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+import ixmp as ix
+
+logger = logging.getLogger(__name__)
+
+PlatformKey = Tuple[Optional[str], Optional[str]]
+
+
+class _SharedPlatform(object):
+    def __init__(self, mp: ix.Platform) -> None:
+        self.mp = mp
+        self.users = 0
+        self.open_count = 0
+        self.is_open = True
+
+
+_platforms: Dict[PlatformKey, _SharedPlatform] = {}
+_write_locks: Dict[PlatformKey, threading.Lock] = {}
+_lock = threading.RLock()
+
+
+def platform_key(db_config: dict) -> PlatformKey:
+    return db_config.get('dbprops'), db_config.get('dbtype')
+
+
+def acquire_platform(db_config: dict, log_level: Optional[str] = None) -> ix.Platform:
+    """Return the shared platform for the database in `db_config`, the
+    platform (JVM and connection) is only created for the first user
+    """
+    key = platform_key(db_config)
+    with _lock:
+        shared = _platforms.get(key)
+        if shared is None:
+            logger.debug(f'Create platform for \'{key}\'')
+            shared = _SharedPlatform(ix.Platform(dbprops=key[0], dbtype=key[1]))
+            if log_level is not None:
+                shared.mp.set_log_level(level=log_level)
+            _platforms[key] = shared
+        shared.users += 1
+        return shared.mp
+
+
+def release_platform(db_config: dict) -> None:
+    """Release a platform acquired with `acquire_platform`, the database is
+    closed and the platform dropped from the registry after the last user
+    """
+    key = platform_key(db_config)
+    with _lock:
+        shared = _platforms.get(key)
+        if shared is None:
+            return
+        shared.users -= 1
+        if shared.users <= 0:
+            if shared.is_open:
+                logger.debug(f'Close database at \'{key[0]}\'')
+                shared.mp.close_db()
+            del _platforms[key]
+
+
+def open_db(db_config: dict) -> None:
+    key = platform_key(db_config)
+    with _lock:
+        shared = _platforms.get(key)
+        if shared is None:
+            raise ValueError(f'No platform for \'{key}\', it was not acquired or already released')
+        shared.open_count += 1
+        if not shared.is_open:
+            logger.debug(f'> Open database at \'{key[0]}\'')
+            shared.mp.open_db()
+            shared.is_open = True
+
+
+def close_db(db_config: dict) -> None:
+    """Close the database if no other user keeps it open, a released
+    platform is already closed
+    """
+    key = platform_key(db_config)
+    with _lock:
+        shared = _platforms.get(key)
+        if shared is None:
+            return
+        shared.open_count = max(shared.open_count - 1, 0)
+        if shared.open_count == 0 and shared.is_open:
+            logger.debug(f'> Close database at \'{key[0]}\'')
+            shared.mp.close_db()
+            shared.is_open = False
+
+
+def write_lock(db_config: dict) -> threading.Lock:
+    """Lock of the database in `db_config`, threads which write through the
+    shared platform (uploads, solution write-back) hold it, the database has
+    a single writer
+    """
+    with _lock:
+        return _write_locks.setdefault(platform_key(db_config), threading.Lock())
+
+
+@contextmanager
+def shared_platform(db_config: dict, log_level: Optional[str] = None):
+    """Shared platform with an open database for the duration of the block"""
+    mp = acquire_platform(db_config, log_level)
+    open_db(db_config)
+    try:
+        yield mp
+    finally:
+        close_db(db_config)
+        release_platform(db_config)
@@ -1,3 +1,6 @@
+from d2ix.postprocess.compare import ScenarioKey, compare_scenarios, rank_scenarios, scenario_plotdata
+from d2ix.postprocess.hierarchy import NodeHierarchy, aggregate_regions, create_hierarchy
 from d2ix.postprocess.plot import create_barplot
-from d2ix.postprocess.timeseries import create_timeseries_df
+from d2ix.postprocess.store import ResultStore
+from d2ix.postprocess.timeseries import create_timeseries_df, export_timeseries, export_timeseries_many
 from d2ix.postprocess.utils import create_plotdata_df, extract_synonyms_colors, group_data
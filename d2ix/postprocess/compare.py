@@ -0,0 +1,102 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, NamedTuple, Optional, Union
+
+import message_ix
+import pandas as pd
+
+from d2ix.postprocess.utils import group_data
+
+logger = logging.getLogger(__name__)
+
+COMPARE_VARIABLES = ['ACT', 'CAP', 'CAP_NEW', 'EMISS']
+
+
+class ScenarioKey(NamedTuple):
+    model: str
+    scenario: str
+    version: Optional[Union[int, str]] = None
+
+    @property
+    def name(self) -> str:
+        if self.version is None:
+            return f'{self.model}|{self.scenario}'
+        return f'{self.model}|{self.scenario}|{self.version}'
+
+
+def load_scenario_data(results: message_ix.Scenario, variables: List[str]) -> pd.DataFrame:
+    _df_list = []
+    for var in variables:
+        df = group_data(var, results)
+        if var == 'EMISS':
+            df = df.rename(columns={'emission': 'technology'})
+        _df_list.append(df)
+    return pd.concat(_df_list, sort=False, ignore_index=True)
+
+
+def compare_scenarios(load_results: Callable[[ScenarioKey], message_ix.Scenario], scenarios: List[ScenarioKey],
+                      baseline: Optional[ScenarioKey] = None, variables: Optional[List[str]] = None,
+                      max_workers: int = 4) -> pd.DataFrame:
+    if not scenarios:
+        raise ValueError('No scenarios to compare')
+    if baseline is None:
+        baseline = scenarios[0]
+    if baseline not in scenarios:
+        scenarios = [baseline] + list(scenarios)
+    if variables is None:
+        variables = COMPARE_VARIABLES
+
+    def _load(key: ScenarioKey) -> pd.DataFrame:
+        logger.debug(f'Load comparison data for \'{key.name}\'')
+        df = load_scenario_data(load_results(key), variables)
+        return df.assign(model=key.model, scenario=key.scenario, version=key.version, scenario_key=key.name)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = list(executor.map(_load, scenarios))
+
+    df = pd.concat(frames, sort=False, ignore_index=True)
+    return _add_deltas(df, scenarios, baseline)
+
+
+def _add_deltas(df: pd.DataFrame, scenarios: List[ScenarioKey], baseline: ScenarioKey) -> pd.DataFrame:
+    keys = ['variable', 'node', 'technology', 'year']
+    base = df.loc[df['scenario_key'] == baseline.name, keys + ['unit', 'lvl']]
+    base = base.rename(columns={'lvl': 'lvl_baseline'})
+
+    # rows which only exist in the baseline are added with a zero level to the other scenarios
+    _df_list = [df]
+    base_idx = base.set_index(keys).index
+    for key in scenarios:
+        if key == baseline:
+            continue
+        _scen_idx = df.loc[df['scenario_key'] == key.name].set_index(keys).index
+        _missing = base.loc[~base_idx.isin(_scen_idx), keys + ['unit']]
+        if not _missing.empty:
+            _df_list.append(_missing.assign(lvl=0.0, model=key.model, scenario=key.scenario, version=key.version,
+                                            scenario_key=key.name))
+    df = pd.concat(_df_list, sort=False, ignore_index=True)
+
+    df = df.merge(base.drop(columns='unit'), on=keys, how='left')
+    df['lvl_baseline'] = df['lvl_baseline'].fillna(0)
+    df['delta'] = df['lvl'] - df['lvl_baseline']
+    df['delta_rel'] = df['delta'] / df['lvl_baseline'].where(df['lvl_baseline'] != 0)
+    return df
+
+
+def scenario_plotdata(df: pd.DataFrame, scenario_key: str, value: str = 'lvl') -> pd.DataFrame:
+    _df = df.loc[df['scenario_key'] == scenario_key, ['node', 'technology', 'year', value, 'unit', 'variable']]
+    return _df.rename(columns={value: 'lvl'}).reset_index(drop=True)
+
+
+def rank_scenarios(df: pd.DataFrame, variable: str, by: str = 'lvl', year: Optional[int] = None,
+                   technology: Optional[List[str]] = None, ascending: bool = False) -> pd.DataFrame:
+    _df = df.loc[df['variable'] == variable]
+    if year is not None:
+        _df = _df.loc[_df['year'] == year]
+    if technology is not None:
+        _df = _df.loc[_df['technology'].isin(technology)]
+    ranking = _df.groupby('scenario_key', as_index=False)[[by]].sum()
+    # equal values share the best rank and are ordered by scenario key
+    ranking = ranking.sort_values([by, 'scenario_key'], ascending=[ascending, True]).reset_index(drop=True)
+    ranking['rank'] = ranking[by].rank(method='min', ascending=ascending).astype(int)
+    return ranking
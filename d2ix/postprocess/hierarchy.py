@@ -0,0 +1,85 @@
+import logging
+from typing import Dict, List, NamedTuple, Optional, Union
+
+import message_ix
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+HIERARCHY_COLUMNS = ['lvl_spatial', 'node', 'node_parent']
+ROOT_LEVEL = 'World'
+
+
+class NodeHierarchy(NamedTuple):
+    """Spatial hierarchy of the nodes from the set 'map_spatial_hierarchy'.
+    `regions` has a row for every node and each region it belongs to (the
+    node itself and all its ancestors) with the columns 'node' and 'region'.
+    """
+    parents: Dict[str, List[str]]
+    levels: Dict[str, str]
+    regions: pd.DataFrame
+
+    def ancestors(self, node: str) -> List[str]:
+        return self.regions.loc[(self.regions['node'] == node) & (self.regions['region'] != node), 'region'].tolist()
+
+
+def create_hierarchy(map_spatial_hierarchy: Union[pd.DataFrame, List[List[str]], None]) -> NodeHierarchy:
+    """Node hierarchy of the rows (lvl_spatial, node, node_parent), e.g. of
+    `model_par['map_spatial_hierarchy']` or the set of a scenario. Nodes
+    which are only a parent are on the level 'World'.
+    """
+    df = pd.DataFrame(map_spatial_hierarchy if map_spatial_hierarchy is not None else [], columns=HIERARCHY_COLUMNS)
+    parents: Dict[str, List[str]] = {}
+    levels: Dict[str, str] = {}
+    for lvl, node, parent in df[HIERARCHY_COLUMNS].itertuples(index=False):
+        levels[node] = lvl
+        if parent != node and parent not in parents.get(node, []):
+            parents.setdefault(node, []).append(parent)
+    for parent in df['node_parent']:
+        levels.setdefault(parent, ROOT_LEVEL)
+
+    rows = []
+    for node in levels:
+        # breadth first, a node may be part of several regions
+        seen = [node]
+        for region in seen:
+            seen.extend(p for p in parents.get(region, []) if p not in seen)
+        rows.extend((node, region) for region in seen)
+    regions = pd.DataFrame(rows, columns=['node', 'region'])
+    return NodeHierarchy(parents, levels, regions)
+
+
+def scenario_hierarchy(results: message_ix.Scenario) -> NodeHierarchy:
+    return create_hierarchy(results.set('map_spatial_hierarchy'))
+
+
+def aggregate_regions(df: pd.DataFrame, hierarchy: NodeHierarchy, levels: Optional[List[str]] = None,
+                      value: str = 'lvl') -> pd.DataFrame:
+    """Sum the rows of every node to the node itself and all its ancestors in
+    one groupby. All columns except 'node' and `value` are kept as keys (also
+    with NaN), the column 'node' is replaced by 'region' and 'lvl_spatial'.
+    Nodes which are not in the hierarchy are only their own region. Without
+    any hierarchy all nodes are summed to the region 'World'. With `levels`
+    only regions on these levels are returned.
+    """
+    regions = hierarchy.regions
+    node_levels = hierarchy.levels
+    unknown = [n for n in df['node'].unique() if n not in hierarchy.levels]
+    if unknown:
+        _regions = pd.DataFrame({'node': unknown, 'region': unknown})
+        if not hierarchy.levels:
+            logger.warning(f'No spatial hierarchy, the nodes are summed to the region \'{ROOT_LEVEL}\'')
+            _regions = pd.concat([_regions, pd.DataFrame({'node': [n for n in unknown if n != ROOT_LEVEL],
+                                                          'region': ROOT_LEVEL})], ignore_index=True)
+            node_levels = {ROOT_LEVEL: ROOT_LEVEL}
+        else:
+            logger.warning(f'Nodes {unknown} are not in the spatial hierarchy, they are only their own region')
+        regions = pd.concat([regions, _regions], ignore_index=True)
+    if levels is not None:
+        regions = regions.loc[regions['region'].map(node_levels).isin(levels)]
+
+    keys = [c for c in df.columns if c not in ['node', value]]
+    df = df.merge(regions, on='node').drop(columns='node')
+    df = df.groupby(['region'] + keys, as_index=False, sort=False, dropna=False)[value].sum()
+    df.insert(1, 'lvl_spatial', df['region'].map(node_levels))
+    return df
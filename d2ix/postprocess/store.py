@@ -0,0 +1,219 @@
+import logging
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+from urllib.parse import quote
+
+import message_ix
+import pandas as pd
+
+from d2ix.postprocess.compare import COMPARE_VARIABLES
+from d2ix.postprocess.utils import group_data
+
+logger = logging.getLogger(__name__)
+
+CATALOG = 'catalog.sqlite'
+STORE_COLUMNS = ['node', 'technology', 'year', 'unit', 'lvl']
+KEY_COLUMNS = ['model', 'scenario', 'version', 'variable']
+FILTER_COLUMNS = ['node', 'technology']
+ROW_GROUP_SIZE = 50000
+
+_CATALOG_SQL = """
+CREATE TABLE IF NOT EXISTS partitions (
+    id INTEGER PRIMARY KEY,
+    model TEXT NOT NULL,
+    scenario TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    variable TEXT NOT NULL,
+    path TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    year_min INTEGER,
+    year_max INTEGER,
+    created TEXT NOT NULL,
+    UNIQUE (model, scenario, version, variable)
+);
+CREATE TABLE IF NOT EXISTS partition_values (
+    partition_id INTEGER NOT NULL REFERENCES partitions (id),
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS partition_values_idx ON partition_values (kind, value, partition_id);
+"""
+
+
+def _in(column: str, values: Optional[Iterable[Any]], where: List[str], params: List[Any]) -> None:
+    if values is not None:
+        values = list(values)
+        where.append(f'{column} IN ({", ".join("?" * len(values))})' if values else '0')
+        params.extend(values)
+
+
+def _stat(value: Any) -> Any:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class ResultStore(object):
+    """Append-only local store of scenario results. The rows of
+    `group_data` (node, technology, year, unit, lvl) of every variable are
+    saved to a Parquet file, sorted by node, technology and year. A SQLite
+    catalog keyed by (model, scenario, version, variable) holds the year
+    range and the nodes and technologies of every file.
+
+    `query` selects the files from the catalog and reads only the row groups
+    whose statistics match the node, technology and year filters, the
+    platform is not used.
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as con, con:
+            con.executescript(_CATALOG_SQL)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.directory.joinpath(CATALOG)), timeout=60)
+
+    def has(self, model: str, scenario: str, version: int, variable: str) -> bool:
+        with closing(self._connect()) as con:
+            row = con.execute('SELECT 1 FROM partitions WHERE model = ? AND scenario = ? AND version = ? AND '
+                              'variable = ?', (model, scenario, int(version), variable)).fetchone()
+        return row is not None
+
+    def write(self, model: str, scenario: str, version: int, variable: str, df: pd.DataFrame) -> bool:
+        """Add the rows (columns `STORE_COLUMNS`) of a variable, an existing
+        partition is not replaced and False is returned
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.has(model, scenario, version, variable):
+            logger.info(f'\'{model}|{scenario}|{version}\' \'{variable}\' is already in the results store')
+            return False
+        df = df[STORE_COLUMNS].astype({'node': str, 'technology': str, 'year': 'int64', 'unit': str, 'lvl': float})
+        df = df.sort_values(['node', 'technology', 'year']).reset_index(drop=True)
+
+        path = Path(quote(model, safe=''), quote(scenario, safe=''), str(int(version)), f'{variable}.parquet')
+        dest = self.directory.joinpath(path)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f'.{dest.name}.{os.getpid()}')
+        schema = pa.schema([('node', pa.string()), ('technology', pa.string()), ('year', pa.int64()),
+                            ('unit', pa.string()), ('lvl', pa.float64())])
+        pq.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False), str(tmp),
+                       row_group_size=ROW_GROUP_SIZE)
+
+        try:
+            with closing(self._connect()) as con, con:
+                cur = con.execute('INSERT INTO partitions (model, scenario, version, variable, path, rows, year_min, '
+                                  'year_max, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                  (model, scenario, int(version), variable, path.as_posix(), len(df),
+                                   int(df['year'].min()) if not df.empty else None,
+                                   int(df['year'].max()) if not df.empty else None,
+                                   datetime.now().isoformat(timespec='seconds')))
+                con.executemany('INSERT INTO partition_values VALUES (?, ?, ?)',
+                                [(cur.lastrowid, c, v) for c in FILTER_COLUMNS for v in df[c].unique()])
+                os.replace(str(tmp), str(dest))
+        except sqlite3.IntegrityError:
+            # archived concurrently by another process
+            tmp.unlink()
+            return False
+        logger.debug(f'Archived \'{model}|{scenario}|{version}\' \'{variable}\' ({len(df)} rows)')
+        return True
+
+    def archive(self, results: message_ix.Scenario, model: str, scenario: str, version: int,
+                variables: Optional[List[str]] = None) -> List[str]:
+        """Add the variables (default: ACT, CAP, CAP_NEW and EMISS) of the
+        results which are not yet in the store, returns the added variables
+        """
+        added = []
+        for var in (variables if variables is not None else COMPARE_VARIABLES):
+            if self.has(model, scenario, version, var):
+                continue
+            df = group_data(var, results)
+            if var == 'EMISS':
+                df = df.rename(columns={'emission': 'technology'})
+            if self.write(model, scenario, version, var, df):
+                added.append(var)
+        return added
+
+    def partitions(self, models: Optional[Iterable[str]] = None, scenarios: Optional[Iterable[str]] = None,
+                   versions: Optional[Iterable[int]] = None, variables: Optional[Iterable[str]] = None,
+                   nodes: Optional[Iterable[str]] = None, technologies: Optional[Iterable[str]] = None,
+                   years: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """Catalog entries of the partitions which may contain matching rows"""
+        where: List[str] = []
+        params: List[Any] = []
+        _in('model', models, where, params)
+        _in('scenario', scenarios, where, params)
+        _in('version', None if versions is None else [int(v) for v in versions], where, params)
+        _in('variable', variables, where, params)
+        for kind, values in zip(FILTER_COLUMNS, [nodes, technologies]):
+            if values is not None:
+                sub: List[str] = []
+                _in('v.value', values, sub, params)
+                where.append(f'EXISTS (SELECT 1 FROM partition_values v WHERE v.partition_id = p.id AND '
+                             f'v.kind = \'{kind}\' AND {sub[0]})')
+        if years is not None:
+            years = list(years)
+            if not years:
+                where.append('0')
+            else:
+                where.append('year_min <= ? AND year_max >= ?')
+                params.extend([max(years), min(years)])
+
+        sql = 'SELECT model, scenario, version, variable, path, rows, year_min, year_max, created FROM partitions p'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        with closing(self._connect()) as con:
+            return pd.read_sql_query(sql + ' ORDER BY id', con, params=params)
+
+    def query(self, models: Optional[Iterable[str]] = None, scenarios: Optional[Iterable[str]] = None,
+              versions: Optional[Iterable[int]] = None, variables: Optional[Iterable[str]] = None,
+              nodes: Optional[Iterable[str]] = None, technologies: Optional[Iterable[str]] = None,
+              years: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """Rows of all matching partitions with the key columns 'model',
+        'scenario', 'version' and 'variable', e.g.
+        `store.query(variables=['ACT'], nodes=['Java'], years=range(2030, 2051))`
+        """
+        filters: Dict[str, Optional[set]] = {'node': None if nodes is None else set(nodes),
+                                             'technology': None if technologies is None else set(technologies),
+                                             'year': None if years is None else set(int(y) for y in years)}
+        parts = self.partitions(models, scenarios, versions, variables, filters['node'], filters['technology'],
+                                filters['year'])
+        frames = []
+        for part in parts.itertuples(index=False):
+            df = self._read(self.directory.joinpath(part.path), filters)
+            if not df.empty:
+                frames.append(df.assign(**{c: getattr(part, c) for c in KEY_COLUMNS}))
+        if not frames:
+            return pd.DataFrame(columns=KEY_COLUMNS + STORE_COLUMNS)
+        return pd.concat(frames, ignore_index=True, sort=False)[KEY_COLUMNS + STORE_COLUMNS]
+
+    @staticmethod
+    def _read(path: Path, filters: Dict[str, Optional[set]]) -> pd.DataFrame:
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(str(path))
+        names = pf.schema.names
+        active = {c: v for c, v in filters.items() if v is not None}
+        frames = []
+        for i in range(pf.num_row_groups):
+            if not all(ResultStore._may_contain(pf.metadata.row_group(i).column(names.index(c)).statistics, v)
+                       for c, v in active.items()):
+                continue
+            df = pf.read_row_group(i).to_pandas()
+            for c, v in active.items():
+                df = df.loc[df[c].isin(v)]
+            frames.append(df)
+        if not frames:
+            return pd.DataFrame(columns=STORE_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    @staticmethod
+    def _may_contain(stats: Any, values: set) -> bool:
+        if stats is None or not getattr(stats, 'has_min_max', True):
+            return True
+        lo, hi = _stat(stats.min), _stat(stats.max)
+        return any(lo <= v <= hi for v in values)
@@ -1,25 +1,114 @@
+import gzip
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Union
 
 import message_ix
 import pandas as pd
+
+from d2ix.postprocess.compare import ScenarioKey
+from d2ix.postprocess.hierarchy import NodeHierarchy, aggregate_regions, scenario_hierarchy
 from d2ix.postprocess.utils import group_data
 
 logger = logging.getLogger(__name__)
 
+TIMESERIES_VARIABLES = ['ACT', 'CAP', 'CAP_NEW', 'EMISS']
+IAMC_COLUMNS = ['model', 'scenario', 'region', 'variable', 'unit', 'year', 'value']
+EXPORT_FORMATS = ['csv.gz', 'parquet']
+
+
+def timeseries_data(var: str, results: message_ix.Scenario,
+                    hierarchy: Optional[NodeHierarchy] = None) -> pd.DataFrame:
+    """Long-format timeseries of a variable with the columns 'region',
+    'variable', 'unit', 'year' and 'lvl'. The rows of a node are summed to
+    the node and all its regions in 'map_spatial_hierarchy'.
+    """
+    df = group_data(var, results)
+    name = df['technology'] if var != 'EMISS' else df['emission']
+    df['variable'] = name.astype(str) + '|' + df['variable']
+    if hierarchy is None:
+        hierarchy = scenario_hierarchy(results)
+    df = aggregate_regions(df[['node', 'variable', 'unit', 'year', 'lvl']], hierarchy)
+    return df[['region', 'variable', 'unit', 'year', 'lvl']]
+
 
 def create_timeseries_df(results: message_ix.Scenario) -> message_ix.Scenario:
     logger.info('Create timeseries')
+    hierarchy = scenario_hierarchy(results)
     results.check_out(timeseries_only=True)
-    for var in ['ACT', 'CAP', 'CAP_NEW', 'EMISS']:
-        df = group_data(var, results)
-        if var != 'EMISS':
-            df['variable'] = ([f'{df.loc[i, "technology"]}|{df.loc[i, "variable"]}' for i in df.index])
-        else:
-            df['variable'] = [f'{df.loc[i, "emission"]}|{df.loc[i, "variable"]}' for i in df.index]
-        df['node'] = 'World'  # TODO: wenn #6 gelöst, dann implementieren
-        df = df.rename(columns={'node': 'region'})
+    for var in TIMESERIES_VARIABLES:
+        df = timeseries_data(var, results, hierarchy)
         ts = pd.pivot_table(df, values='lvl', index=['region', 'variable', 'unit'], columns=['year']).reset_index(
             drop=False)
         results.add_timeseries(ts)
     results.commit('timeseries added')
     return results
+
+
+def _export_format(path: Path) -> str:
+    for fmt in EXPORT_FORMATS:
+        if path.name.endswith(f'.{fmt}'):
+            return fmt
+    raise ValueError(f'Unknown timeseries file format: \'{path.name}\', use one of {EXPORT_FORMATS}')
+
+
+def export_timeseries(results: message_ix.Scenario, path: Union[str, Path], model: Optional[str] = None,
+                      scenario: Optional[str] = None, variables: Optional[List[str]] = None) -> Path:
+    """Write the timeseries in IAMC long format (model, scenario, region,
+    variable, unit, year, value) to a compressed csv ('.csv.gz') or Parquet
+    file, variable by variable and without writing to the platform
+    """
+    p = Path(path)
+    fmt = _export_format(p)
+    model = model if model is not None else getattr(results, 'model', None)
+    scenario = scenario if scenario is not None else getattr(results, 'scenario', None)
+    variables = variables if variables is not None else TIMESERIES_VARIABLES
+    logger.info(f'Export timeseries to \'{p}\'')
+    hierarchy = scenario_hierarchy(results)
+
+    def _frames():
+        for var in variables:
+            df = timeseries_data(var, results, hierarchy).rename(columns={'lvl': 'value'})
+            yield df.assign(model=model, scenario=scenario)[IAMC_COLUMNS]
+
+    p.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == 'csv.gz':
+        with gzip.open(p, 'wt', newline='') as f:
+            for i, df in enumerate(_frames()):
+                df.to_csv(f, header=i == 0, index=False)
+    else:
+        _write_parquet(p, _frames())
+    return p
+
+
+def _write_parquet(path: Path, frames) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([('model', pa.string()), ('scenario', pa.string()), ('region', pa.string()),
+                        ('variable', pa.string()), ('unit', pa.string()), ('year', pa.int64()),
+                        ('value', pa.float64())])
+    with pq.ParquetWriter(str(path), schema) as writer:
+        for df in frames:
+            df = df.astype({'model': str, 'scenario': str, 'year': 'int64', 'value': float})
+            writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+
+
+def export_timeseries_many(load_results: Callable[[ScenarioKey], message_ix.Scenario], scenarios: List[ScenarioKey],
+                           directory: Union[str, Path], fmt: str = 'csv.gz',
+                           variables: Optional[List[str]] = None, max_workers: int = 4) -> List[Path]:
+    """Export the timeseries of several scenarios concurrently, one file per
+    scenario named after the scenario key
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f'Unknown timeseries file format: \'{fmt}\', use one of {EXPORT_FORMATS}')
+    d = Path(directory)
+
+    def _export(key: ScenarioKey) -> Path:
+        name = key.name.replace('|', '_').replace('/', '_')
+        return export_timeseries(load_results(key), d.joinpath(f'{name}.{fmt}'), key.model, key.scenario,
+                                 variables)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_export, scenarios))
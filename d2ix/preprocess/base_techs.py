@@ -1,4 +1,3 @@
-import copy
 import logging
 from typing import List
 
@@ -6,6 +5,7 @@ import pandas as pd
 
 from d2ix import RawData
 from d2ix.preprocess.util import get_year_vector
+from d2ix.util import TechTemplate
 
 logger = logging.getLogger(__name__)
 
@@ -23,16 +23,16 @@ def process_base_techs(raw_data: RawData, year_vector: List[int], first_model_ye
     base_techs: dict = {'technology': {}}
     for n, com in sorted(commodity.items()):
         for c in sorted(com):
-            tmp = get_base_techs(default, c, year_vector, first_model_year, duration_period_sum)
-            tmp = copy.deepcopy(dict(tmp))
-            base_techs['technology']['slack_' + c] = tmp
+            if 'slack_' + c not in base_techs['technology']:
+                base_techs['technology']['slack_' + c] = get_base_techs(default, c, year_vector, first_model_year,
+                                                                        duration_period_sum)
 
     logger.debug('Created helper data structure: \'base techs\'')
     return base_techs['technology']
 
 
 def get_base_techs(default: dict, com: str, year_vector: List[int], first_model_year: int,
-                   duration_period_sum: pd.DataFrame) -> dict:
+                   duration_period_sum: pd.DataFrame) -> TechTemplate:
     life_time = default['year_vtg']['technical_lifetime']['value']
     first_tech_year = first_model_year
     last_tech_year = year_vector[-1]
@@ -42,13 +42,13 @@ def get_base_techs(default: dict, com: str, year_vector: List[int], first_model_
     year_info = ['last_year', 'first_year']
     options = set(default.keys()).difference(set(year_info))
 
-    tech = {}
+    # the default settings are shared by all technologies, only changes are stored per technology
+    tech = TechTemplate()
     for k in sorted(options):
         if k == 'output':
-            tech['output'] = default[k]
-            tech['output']['commodity'] = com
+            tech['output'] = TechTemplate({'commodity': com}, default[k])
         elif k == 'year_vtg':
-            tech['year_vtg'] = dict.fromkeys(years, default['year_vtg'])
+            tech['year_vtg'] = TechTemplate({}, dict.fromkeys(years, default['year_vtg']))
         else:
             tech[k] = default[k]
 
@@ -1,12 +1,12 @@
 import logging
 
 from d2ix import RawData
-from d2ix.util import df_to_nested_dict
+from d2ix.util import FrameDict
 
 logger = logging.getLogger(__name__)
 
 
-def process_demand(raw_data: RawData) -> dict:
+def process_demand(raw_data: RawData) -> FrameDict:
     df = raw_data['base_input']['demand'].copy()
 
     df = df.assign(y='year')
@@ -16,8 +16,8 @@ def process_demand(raw_data: RawData) -> dict:
 
     df = df.set_index(['d', 'n', 'y', 'year', 'c'])
 
-    # create nested dict from DataFrame
-    data = df_to_nested_dict(df)
+    # nested dict view of the DataFrame
+    data = FrameDict(df)
 
     logger.debug('Created helper data structure: \'demand\'')
     return data['demand']
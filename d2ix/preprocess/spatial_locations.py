@@ -1,19 +1,18 @@
 import logging
 
 from d2ix import RawData
-from d2ix.util import df_to_nested_dict
+from d2ix.util import FrameDict
 
 logger = logging.getLogger(__name__)
 
 
-def process_spatial_locations(_data: RawData) -> dict:
+def process_spatial_locations(_data: RawData) -> FrameDict:
     df = _data['base_input']['locations'].copy()
     df['tech'] = 'technology'
     df['override'] = 'override'
 
     df = df.set_index(['location', 'tech', 'technology', 'override'], drop=True)
-    data = df_to_nested_dict(df)
-    data = {'locations': data}
+    data = {'locations': FrameDict(df)}
 
     logger.debug('Created helper data structure: \'locations\'')
     return data['locations']
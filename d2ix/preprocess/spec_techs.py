@@ -1,4 +1,3 @@
-import copy
 import logging
 from typing import Tuple, List, Dict
 
@@ -7,7 +6,7 @@ import pandas as pd
 from d2ix import RawData, Data
 from d2ix.preprocess.base_techs import get_base_techs
 from d2ix.preprocess.util import get_year_vector
-from d2ix.util import df_to_nested_dict
+from d2ix.util import FrameDict, TechTemplate
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +15,7 @@ def process_spec_techs(raw_data: RawData, model_data: Data, year_vector: List[in
                        par_list: List[str], duration_period_sum: pd.DataFrame) -> dict:
     df = raw_data['base_input']['spec_techs'].copy()
     df = df.set_index('technology', drop=True)
-    data = df_to_nested_dict(df)
+    data = FrameDict(df)
 
     # load base techs default settings
     _base_tech = model_data['technology']
@@ -31,8 +30,8 @@ def process_spec_techs(raw_data: RawData, model_data: Data, year_vector: List[in
             tech = _base_tech[v['base_techs']]
         else:
             tech = get_base_techs(default, v['commodity_out1'], year_vector, first_model_year, duration_period_sum)
-        tech_dict = copy.deepcopy(dict(tech))
-        tech_dict = _parse_spec_techs(tech_dict, v, units, year_vector, first_model_year, par_list, duration_period_sum)
+        tech_dict = _parse_spec_techs(tech.new_child(), v, units, year_vector, first_model_year, par_list,
+                                      duration_period_sum)
 
         technology[k] = tech_dict
 
@@ -40,8 +39,8 @@ def process_spec_techs(raw_data: RawData, model_data: Data, year_vector: List[in
     return technology
 
 
-def _parse_spec_techs(tech: dict, options: dict, unit: dict, year_vector: List[int], first_model_year: int,
-                      par_list: List[str], duration_period_sum: pd.DataFrame) -> dict:
+def _parse_spec_techs(tech: TechTemplate, options: dict, unit: dict, year_vector: List[int], first_model_year: int,
+                      par_list: List[str], duration_period_sum: pd.DataFrame) -> TechTemplate:
     if options.get('base_techs'):
         del options['base_techs']
     first_tech_year = options.pop('first_year', True)
@@ -74,19 +73,6 @@ def _parse_spec_techs(tech: dict, options: dict, unit: dict, year_vector: List[i
     year_vtg = get_year_vector(year_vector, first_model_year, options['technical_lifetime'], duration_period_sum,
                                first_tech_year, last_tech_year)
 
-    # fill year_vtg historical data
-    exist_year = [int(i) for i in tech['year_vtg'].keys()]
-    year_fill = set(year_vtg).difference(set(exist_year))
-    if len(year_fill):
-        for i in year_fill:
-            tech['year_vtg'][i] = tech['year_vtg'][exist_year[0]]
-
-    # remove years from base technology if is not defined in this period
-    year_remove = set(exist_year).difference(set(year_vtg))
-    if len(year_remove):
-        for i in year_remove:
-            tech['year_vtg'].pop(i)
-
     # post process options
     keys = [i for i in options.keys() if 'postprocess_' in i]
 
@@ -106,12 +92,13 @@ def _parse_spec_techs(tech: dict, options: dict, unit: dict, year_vector: List[i
     for k, v in options.items():
         _tmp_tech[k] = {'unit': unit[k]['unit'], 'value': v}
 
-    tech['year_vtg'] = dict.fromkeys(year_vtg, _tmp_tech)
+    # all vintages share the same parameters until one of them is changed
+    tech['year_vtg'] = TechTemplate({}, dict.fromkeys(year_vtg, _tmp_tech))
 
     return tech
 
 
-def __in_out_efficiency(tech: dict, options: dict) -> Tuple[dict, dict]:
+def __in_out_efficiency(tech: TechTemplate, options: dict) -> Tuple[TechTemplate, dict]:
     efficiency1 = options.pop('efficiency_1', None)
     out_lvl1 = options.pop('level_out1', None)
     out_com1 = options.pop('commodity_out1', None)
@@ -1,16 +1,15 @@
 import logging
 
 from d2ix import RawData
-from d2ix.util import df_to_nested_dict
+from d2ix.util import FrameDict
 
 logger = logging.getLogger(__name__)
 
 
-def process_units(_data: RawData) -> dict:
+def process_units(_data: RawData) -> FrameDict:
     df = _data['base_input']['unit'].copy()
     df = df.set_index(['parameter'], drop=True)
-    data = df_to_nested_dict(df)
-    data = {'units': data}
+    data = {'units': FrameDict(df)}
 
     logger.debug('Created helper data structure: \'unit_techs\'')
     return data['units']
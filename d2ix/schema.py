@@ -0,0 +1,114 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+import message_ix
+import pandas as pd
+
+from d2ix.platform import platform_key
+
+logger = logging.getLogger(__name__)
+
+SchemaKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class ScenarioSchema(NamedTuple):
+    """Parameter and set definitions of a MESSAGEix scenario, picklable and
+    without reference to the platform
+    """
+    par_list: List[str]
+    set_list: List[str]
+    idx_names: Dict[str, List[str]]
+
+    @classmethod
+    def from_scenario(cls, scenario: message_ix.Scenario) -> 'ScenarioSchema':
+        logger.debug('Load scenario schema')
+        par_list = list(scenario.par_list())
+        set_list = list(scenario.set_list())
+        idx_names = {i: list(scenario.idx_names(i)) for i in par_list + set_list}
+        return cls(par_list=par_list, set_list=set_list, idx_names=idx_names)
+
+    def with_items(self, scenario: message_ix.Scenario) -> 'ScenarioSchema':
+        """Schema of the items of `scenario` (e.g. with MACRO parameters or
+        items added with `init_par`/`init_set`), the index names of items
+        unknown to this schema are loaded from the scenario
+        """
+        par_list = list(scenario.par_list())
+        set_list = list(scenario.set_list())
+        idx_names = {i: self.idx_names[i] if i in self.idx_names else list(scenario.idx_names(i))
+                     for i in par_list + set_list}
+        return ScenarioSchema(par_list=par_list, set_list=set_list, idx_names=idx_names)
+
+    def par(self, name: str) -> pd.DataFrame:
+        # empty parameter DataFrame, equal to scenario.par(name) of a new scenario
+        return pd.DataFrame(columns=self.idx_names[name] + ['value', 'unit'])
+
+    def is_index_set(self, name: str) -> bool:
+        # one-dimensional sets (e.g. 'technology') are returned as Series by scenario.set(name)
+        return not self.idx_names[name]
+
+
+_schemas: Dict[SchemaKey, ScenarioSchema] = {}
+_lock = threading.Lock()
+
+
+def schema_key(db_config: dict) -> SchemaKey:
+    return (*platform_key(db_config), getattr(message_ix, '__version__', None))
+
+
+def _schema_path(cache_dir: Union[str, Path], key: SchemaKey) -> Path:
+    name = hashlib.sha256(repr(key).encode()).hexdigest()[:16]
+    return Path(cache_dir).expanduser().joinpath(f'schema_{name}.json')
+
+
+def _load_schema(path: Path, key: SchemaKey) -> Optional[ScenarioSchema]:
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            _schema = json.load(f)
+        if tuple(_schema.pop('key')) != key:
+            return None
+        return ScenarioSchema(**_schema)
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning(f'Schema cache \'{path}\' can not be loaded: {e!r}')
+        return None
+
+
+def _save_schema(path: Path, key: SchemaKey, schema: ScenarioSchema) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump({'key': key, **schema._asdict()}, f)
+    os.replace(str(tmp), str(path))
+
+
+def get_schema(scenario: message_ix.Scenario, db_config: dict,
+               cache_dir: Optional[Union[str, Path]] = None) -> ScenarioSchema:
+    """Schema of the platform in `db_config` and the installed MESSAGEix
+    version, loaded once from `scenario` and shared by all interfaces. With a
+    `cache_dir` the schema is also saved to and loaded from disk.
+    """
+    key = schema_key(db_config)
+    with _lock:
+        schema = _schemas.get(key)
+        if schema is not None:
+            return schema
+        path = _schema_path(cache_dir, key) if cache_dir is not None else None
+        if path is not None:
+            schema = _load_schema(path, key)
+        if schema is None:
+            schema = ScenarioSchema.from_scenario(scenario)
+            if path is not None:
+                _save_schema(path, key, schema)
+        _schemas[key] = schema
+        return schema
+
+
+def clear_schemas() -> None:
+    with _lock:
+        _schemas.clear()
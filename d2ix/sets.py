@@ -1,10 +1,11 @@
 import logging
-from typing import Dict, List
+from typing import Dict, List, Union
 
-import message_ix
 import pandas as pd
 
 from d2ix import ModelPar, Data
+from d2ix.schema import ScenarioSchema
+from d2ix.util.vintage import VintageFrame
 
 logger = logging.getLogger(__name__)
 
@@ -44,10 +45,10 @@ def add_sets(data: Data, model_par: ModelPar, first_model_year: int) -> ModelPar
     return model_par
 
 
-def extract_sets(scenario: message_ix.Scenario, data_dict: Dict[str, pd.DataFrame]) -> Dict[str, list]:
+def extract_sets(set_list: List[str], data_dict: Dict[str, pd.DataFrame]) -> Dict[str, list]:
     _sets: Dict[str, list] = {}
     for par, df in data_dict.items():
-        par_set = _extract_sets_df(scenario, data=df)
+        par_set = _extract_sets_df(set_list, data=df)
         for k in par_set.keys():
             _sets.setdefault(k, []).extend(par_set[k])
 
@@ -56,10 +57,10 @@ def extract_sets(scenario: message_ix.Scenario, data_dict: Dict[str, pd.DataFram
     return _sets
 
 
-def _extract_sets_df(scenario: message_ix.Scenario, data: pd.DataFrame) -> Dict[str, list]:
+def _extract_sets_df(set_list: List[str], data: Union[pd.DataFrame, VintageFrame]) -> Dict[str, list]:
     logger.debug(f'Get sets for \'{data.columns}\'')
 
-    scenario_sets = set(scenario.set_list())
+    scenario_sets = set(set_list)
     scenario_dict = {i: [i] for i in scenario_sets}
     set_synonyms = {**scenario_dict, **SYN_DICT}
 
@@ -68,7 +69,10 @@ def _extract_sets_df(scenario: message_ix.Scenario, data: pd.DataFrame) -> Dict[
     sets_dict = {i: [k for k in set_synonyms[i] for s in set(data) if s == k][0] if i in set_synonyms.keys() else i for
                  i in sets}
 
-    _sets: Dict[str, list] = {i: sorted(data[k].dropna().drop_duplicates().tolist()) for i, k in sets_dict.items()}
+    if isinstance(data, VintageFrame):
+        _sets: Dict[str, list] = {i: sorted(data.unique(k)) for i, k in sets_dict.items()}
+    else:
+        _sets = {i: sorted(data[k].dropna().drop_duplicates().tolist()) for i, k in sets_dict.items()}
 
     return _sets
 
@@ -81,7 +85,7 @@ def set_order() -> List[str]:
             'land_scenario', 'land_type', 'type_tec_land']
 
 
-def set_frame_list(scenario: message_ix.Scenario, set_dict: dict) -> Dict[str, list]:
-    _sets = {(k if isinstance(scenario.set(k), pd.Series) else k): (
-        v[0].tolist() if isinstance(scenario.set(k), pd.Series) else v) for k, v in set_dict.items()}
+def set_frame_list(schema: ScenarioSchema, set_dict: dict) -> Dict[str, list]:
+    # index sets read from excel are a frame with one column
+    _sets = {k: (v[0].tolist() if schema.is_index_set(k) else v) for k, v in set_dict.items()}
     return _sets
@@ -0,0 +1,172 @@
+import collections.abc
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from d2ix import ModelPar
+from d2ix.build import BuildConfig
+from d2ix.util.checkpoint import file_hash
+from d2ix.util.vintage import expand_par
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = 'manifest.json'
+SNAPSHOT_FORMAT = 'd2ix-snapshot'
+SNAPSHOT_VERSION = 1
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def _mixed_columns(df: pd.DataFrame) -> List[str]:
+    # object columns with strings and integers, e.g. 'type_year' of 'cat_year', are stored as strings
+    return [c for c in df.columns if df[c].dtype == object and
+            pd.api.types.infer_dtype(df[c], skipna=True) in ['mixed', 'mixed-integer']]
+
+
+def _restore_mixed(s: pd.Series) -> pd.Series:
+    return s.map(lambda x: int(x) if isinstance(x, str) and x.lstrip('-').isdigit() else x)
+
+
+def _json_default(obj: Any) -> Any:
+    # numpy scalars of the sets, other types raise instead of being converted
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _config_dict(config: BuildConfig) -> Dict[str, Any]:
+    # the workbook paths may be given as `Path`
+    return {k: str(v) if isinstance(v, Path) else v for k, v in config._asdict().items()}
+
+
+def _write_frame(df: pd.DataFrame, path: Path, mixed: List[str]) -> None:
+    import pyarrow as pa
+
+    df = df.reset_index(drop=True)
+    if mixed:
+        df = df.assign(**{c: df[c].where(df[c].isnull(), df[c].astype(str)) for c in mixed})
+    df.columns = [str(c) for c in df.columns]
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # uncompressed Arrow IPC file, the buffers are used from the memory map without a copy
+    with pa.OSFile(str(path), 'wb') as sink:
+        writer = pa.ipc.new_file(sink, table.schema)
+        writer.write_table(table)
+        writer.close()
+
+
+def _read_frame(path: Path, mixed: List[str]) -> pd.DataFrame:
+    import pyarrow as pa
+
+    with pa.memory_map(str(path), 'r') as source:
+        df = pa.ipc.open_file(source).read_all().to_pandas()
+    for c in mixed:
+        df[c] = _restore_mixed(df[c])
+    return df
+
+
+def save_snapshot(model_par: ModelPar, path: Union[str, Path], config: Optional[BuildConfig] = None,
+                  units: Optional[Dict[str, str]] = None, manual_input: bool = False) -> Path:
+    """Save the model parameters and sets to `path`: one Arrow IPC file per
+    DataFrame (vintage frames in full rows) and a manifest with the sets of
+    type list, the sha256 of every file, the build configuration and the
+    units of the parameters
+    """
+    p = Path(path)
+    p.mkdir(parents=True, exist_ok=True)
+    logger.info(f'Save model snapshot to \'{p}\'')
+
+    items: Dict[str, Dict[str, Any]] = {}
+    for name, v in model_par.items():
+        if isinstance(v, list):
+            items[name] = {'kind': 'list', 'values': v}
+            continue
+        df = expand_par(v)
+        mixed = _mixed_columns(df)
+        file = f'{name}.arrow'
+        _write_frame(df, p.joinpath(file), mixed)
+        items[name] = {'kind': 'frame', 'file': file, 'rows': len(df), 'columns': [str(c) for c in df.columns],
+                       'mixed_columns': mixed, 'sha256': file_hash(p.joinpath(file))}
+        logger.debug(f'Saved \'{name}\' ({len(df)} rows)')
+
+    manifest = {'format': SNAPSHOT_FORMAT, 'version': SNAPSHOT_VERSION,
+                'config': _config_dict(config) if config is not None else None, 'units': units or {},
+                'manual_input': manual_input, 'items': items}
+    # the manifest is written last, an interrupted snapshot has no manifest
+    with open(p.joinpath(MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=1, default=_json_default)
+    return p
+
+
+class SnapshotPar(collections.abc.MutableMapping):
+    """Model parameters of a snapshot, the files are memory-mapped and read
+    on first access. With `verify` the sha256 of a file is checked before it
+    is read.
+    """
+
+    def __init__(self, path: Union[str, Path], manifest: dict, verify: bool = False) -> None:
+        self.path = Path(path)
+        self.verify = verify
+        self._items = dict(manifest['items'])
+        self._loaded: Dict[str, Union[pd.DataFrame, list]] = {}
+        self._names = list(self._items)
+
+    def __getitem__(self, key: str) -> Union[pd.DataFrame, list]:
+        if key in self._loaded:
+            return self._loaded[key]
+        item = self._items[key]
+        if item['kind'] == 'list':
+            value: Union[pd.DataFrame, list] = list(item['values'])
+        else:
+            file = self.path.joinpath(item['file'])
+            if self.verify and file_hash(file) != item['sha256']:
+                raise SnapshotError(f'Snapshot file \'{file}\' does not match the manifest')
+            value = _read_frame(file, item['mixed_columns'])
+        self._loaded[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Union[pd.DataFrame, list]) -> None:
+        if key not in self._names:
+            self._names.append(key)
+        self._loaded[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self._names:
+            raise KeyError(key)
+        self._names.remove(key)
+        self._items.pop(key, None)
+        self._loaded.pop(key, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._names))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(\'{self.path}\', {len(self)} items, {len(self._loaded)} loaded)'
+
+
+def read_manifest(path: Union[str, Path]) -> dict:
+    p = Path(path).joinpath(MANIFEST)
+    if not p.exists():
+        raise SnapshotError(f'No model snapshot in \'{Path(path)}\'')
+    with open(p) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != SNAPSHOT_FORMAT or manifest.get('version') != SNAPSHOT_VERSION:
+        raise SnapshotError(f'Unsupported model snapshot: \'{p}\'')
+    return manifest
+
+
+def load_snapshot(path: Union[str, Path], verify: bool = False) -> SnapshotPar:
+    """Model parameters of a snapshot saved with `save_snapshot`"""
+    return SnapshotPar(path, read_manifest(path), verify)
@@ -1,14 +1,16 @@
 import logging
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from message_ix.utils import make_df
 from pandas.io.json import json_normalize
 
 from d2ix import Data, ModelPar, RawData
-from d2ix.util import split_columns
-from d2ix.util.acitve_year_vector import get_act_year_vector, get_years_no_hist_cap
+from d2ix.incremental import Piece, TechnologyCache
+from d2ix.util import split_columns, materialize
+from d2ix.util.acitve_year_vector import HistCapIndex, create_hist_cap_index, get_act_years, \
+    get_years_no_hist_cap
+from d2ix.util.vintage import YEAR_COLUMNS, VintageBlock, VintageFrame, expand_par
 
 logger = logging.getLogger(__name__)
 
@@ -17,80 +19,97 @@ YearVector = List[int]
 
 def add_technology(data: Data, model_par: ModelPar, first_model_year: int, active_years: YearVector,
                    historical_years: YearVector, duration_period_sum: pd.DataFrame, loc: str, par: str,
-                   slack: bool = False) -> ModelPar:
-    if slack is True:
+                   slack: bool = False, technology: Optional[Dict[str, dict]] = None,
+                   cache: Optional[TechnologyCache] = None, hist_cap: Optional[HistCapIndex] = None) -> ModelPar:
+    if technology is not None:
+        technology_exist = bool(technology)
+    elif slack is True:
         technology, technology_exist = _get_slack_techs(data, loc, par)
     else:
         technology, technology_exist = _get_location_techs(data, loc, par)
 
     if technology_exist:
+        if hist_cap is None:
+            hist_cap = create_hist_cap_index(model_par.get('historical_new_capacity'))
         for tech in technology.keys():
-            params: Dict = _get_df_tech(technology, tech)
-            tech_hist = model_par.get('historical_new_capacity')
-            years_no_hist_cap = get_years_no_hist_cap(loc, tech, historical_years, tech_hist)
-
-            tech_parameters = _get_active_model_par(data, params)
-            for tech_par in tech_parameters:
-                model_par[tech_par] = _add_parameter(model_par, params, tech_par, tech, loc, active_years,
-                                                     first_model_year, duration_period_sum, years_no_hist_cap)
+            years_no_hist_cap = get_years_no_hist_cap(loc, tech, historical_years, hist_cap)
+
+            # rows of unchanged technologies are taken from the cache of the previous build
+            pieces = None
+            if cache is not None:
+                key = cache.key(technology[tech], years_no_hist_cap)
+                pieces = cache.get((loc, par, tech), key)
+            if pieces is None:
+                pieces = create_technology_pieces(data, model_par, technology, tech, loc, active_years,
+                                                  first_model_year, duration_period_sum, years_no_hist_cap)
+                if cache is not None:
+                    cache.put((loc, par, tech), key, pieces)
+            for tech_par, piece in pieces.items():
+                model_par[tech_par] = _add_piece(model_par[tech_par], piece)
     return model_par
 
 
+def create_technology_pieces(data: Data, model_par: ModelPar, technology: Dict[str, dict], tech: str, loc: str,
+                             active_years: YearVector, first_model_year: int, duration_period_sum: pd.DataFrame,
+                             years_no_hist_cap: YearVector) -> Dict[str, Piece]:
+    """Parameter rows of one technology in a location, per parameter"""
+    params: Dict = _get_df_tech(technology, tech)
+    tech_parameters = _get_active_model_par(data, params)
+    return {tech_par: _add_parameter(model_par, params, tech_par, tech, loc, active_years, first_model_year,
+                                     duration_period_sum, years_no_hist_cap) for tech_par in tech_parameters}
+
+
+def _add_piece(df: Piece, piece: Piece) -> Piece:
+    if isinstance(piece, VintageBlock):
+        return (df if isinstance(df, VintageFrame) else VintageFrame(df)).append(piece)
+    return pd.concat([df, piece])
+
+
 def _add_parameter(model_par: ModelPar, params: Dict[str, pd.DataFrame], tech_par: str, tech: str, loc: str,
                    active_years: YearVector, first_model_year: int, duration_period_sum: pd.DataFrame,
-                   years_no_hist_cap: YearVector) -> pd.DataFrame:
+                   years_no_hist_cap: YearVector) -> Piece:
     df = model_par[tech_par]
 
-    # emission helper
-    _emissions_is_list = _check_emissions_is_list(params)
-
-    # single input - double output
-    if isinstance(params['in_out'].loc['output', 'level'], list) and tech_par == 'output':
-        _level = params['in_out'].loc['output', 'level']
-        _com = params['in_out'].loc['output', 'commodity']
-        _df_out = params['year_vtg'][
-            (params['year_vtg']['par_name'] == 'output') & (params['year_vtg']['par'] == 'value')]
-        _df_out_val = pd.DataFrame(_df_out.val.values.tolist(), index=_df_out.index)
-        _df_list = []
-        for _out in range(len(_com)):
-            params['year_vtg'].loc[_df_out_val.index, 'val'] = _df_out_val[_out]
-            params['in_out'].loc['output', 'level'] = _level[_out]
-            params['in_out'].loc['output', 'commodity'] = _com[_out]
-
-            df_base_dict = _create_parameter_df(params, tech_par, df, first_model_year, active_years,
-                                                duration_period_sum, years_no_hist_cap)
-            _df_list.append(df_base_dict)
-        df_base_dict = pd.concat(_df_list, ignore_index=True)
+    # multiple outputs or emissions are broadcast on the parameter rows of the technology
+    expand = _get_expand_columns(params, tech_par)
+    logger.debug(f'Create parameter in location \'{loc}\' for \'{tech}\': \'{tech_par}\'')
+    if set(YEAR_COLUMNS).issubset(df.columns):
+        # (year_vtg, year_act) parameters are stored per vintage and expanded in model2db
+        return _create_vintage_block(params, tech_par, list(df.columns), first_model_year, active_years,
+                                     duration_period_sum, years_no_hist_cap, expand)
 
-    # emissions: C02 and CH4
-    elif _emissions_is_list and tech_par == 'emission_factor':
-        _emission = params['others'].loc['emission'].val
-        _df_em = params['year_vtg'][
-            (params['year_vtg']['par_name'] == 'emission_factor') & (params['year_vtg']['par'] == 'value')]
-        _df_em_val = pd.DataFrame(_df_em.val.values.tolist(), index=_df_em.index)
-
-        _df_list = []
-        for _emi in range(len(_emission)):
-            params['others'].loc['emission'].val = _emission[_emi]
-            params['year_vtg'].loc[_df_em_val.index, 'val'] = _df_em_val[_emi]
-
-            df_base_dict = _create_parameter_df(params, tech_par, df, first_model_year, active_years,
-                                                duration_period_sum, years_no_hist_cap)
-            _df_list.append(df_base_dict)
-        df_base_dict = pd.concat(_df_list, ignore_index=True)
+    return _create_parameter_df(params, tech_par, df, active_years, years_no_hist_cap, expand)
 
-    else:
-        df_base_dict = _create_parameter_df(params, tech_par, df, first_model_year, active_years, duration_period_sum,
-                                            years_no_hist_cap)
 
-    model = pd.concat([df, df_base_dict])
-    logger.debug(f'Create parameter in location \'{loc}\' for \'{tech}\': \'{tech_par}\'')
-    return model
+def _get_expand_columns(params: Dict[str, pd.DataFrame], tech_par: str) -> Dict[str, list]:
+    # single input - double output
+    if tech_par == 'output' and isinstance(params['in_out'].loc['output', 'level'], list):
+        return {'level': params['in_out'].loc['output', 'level'],
+                'commodity': params['in_out'].loc['output', 'commodity']}
+    # emissions: C02 and CH4
+    if tech_par == 'emission_factor' and _check_emissions_is_list(params):
+        return {'emission': params['others'].loc['emission', 'val']}
+    return {}
+
+
+def _broadcast(df: pd.DataFrame, expand: Dict[str, list]) -> pd.DataFrame:
+    # cross product of the parameter rows and the outputs/emissions, the values are given as list per row
+    n = len(next(iter(expand.values())))
+    rows = len(df)
+    values = np.array(df['value'].tolist())
+    if values.ndim == 1:
+        values = np.tile(values, (n, 1)).T
+
+    df = df.iloc[np.tile(np.arange(rows), n)].reset_index(drop=True)
+    for col, v in expand.items():
+        df[col] = np.repeat(np.array(v, dtype=object), rows)
+    df['value'] = values.T.reshape(-1)
+    return df
 
 
-def _create_parameter_df(params: Dict[str, pd.DataFrame], model_par: str, df: pd.DataFrame, first_model_year: int,
-                         active_years: YearVector, duration_period_sum: pd.DataFrame,
-                         years_no_hist_cap: YearVector) -> pd.DataFrame:
+def _create_parameter_df(params: Dict[str, pd.DataFrame], model_par: str, df: pd.DataFrame, active_years: YearVector,
+                         years_no_hist_cap: YearVector, expand: Optional[Dict[str, list]] = None) -> pd.DataFrame:
+    expand = expand or {}
     model_par_vtg = params['year_vtg'][
         (params['year_vtg']['par_name'] == model_par) & (~params['year_vtg']['year_vtg'].isin(years_no_hist_cap))]
 
@@ -102,7 +121,10 @@ def _create_parameter_df(params: Dict[str, pd.DataFrame], model_par: str, df: pd
     # base_dict = df.to_dict()
     keys = base_dict.keys()
     for i in keys:
-        if i in params['others'].index:
+        if i in expand:
+            # filled by the broadcast over outputs/emissions
+            continue
+        elif i in params['others'].index:
             # load data not depends on year_vtg or year_act
             base_dict[i] = params['others'].loc[i].val
 
@@ -110,19 +132,13 @@ def _create_parameter_df(params: Dict[str, pd.DataFrame], model_par: str, df: pd
             # load output and/or input data
             base_dict[i] = params['in_out'].loc[model_par][i]
         else:
-            if ('year_act' in keys and 'year_vtg' in keys) or ('year_vtg' in keys):
-                # parameter depends on year_vtg or (year_act and year_vtg)
-                if i == 'year_act':
-                    # load data for year tuples (year_vtg, year_act)
-                    base_dict.update(
-                        _create_dict_year_act(params, model_par, base_dict, first_model_year, duration_period_sum,
-                                              years_no_hist_cap))
-                elif i == 'year_vtg' and 'year_act' not in keys:
-                    # load year_vtg data if only depends on year_vtg
+            if 'year_vtg' in keys:
+                # parameter depends only on year_vtg, (year_vtg, year_act) parameters are vintage blocks
+                if i == 'year_vtg':
+                    # load year_vtg data
                     base_dict[i] = model_par_vtg.year_vtg[model_par_vtg.par == 'value'].tolist()
 
-                elif (i == 'unit' or i == 'value') and (
-                        'year_act' not in keys):
+                elif i == 'unit' or i == 'value':
                     # load value and unit data
                     base_dict[i] = model_par_vtg.val[model_par_vtg.par == i].tolist()
 
@@ -133,6 +149,8 @@ def _create_parameter_df(params: Dict[str, pd.DataFrame], model_par: str, df: pd
                 base_dict['value'] = model_par_act.val[model_par_act.par == 'value'].tolist()
 
     df = pd.DataFrame(base_dict)
+    if expand:
+        df = _broadcast(df, expand)
     if 'additional_pars' in params['others'].index:
         add_pars = params['others'].loc['additional_pars', 'val']
         if [k for k in add_pars if model_par in k]:
@@ -141,39 +159,43 @@ def _create_parameter_df(params: Dict[str, pd.DataFrame], model_par: str, df: pd
     return df
 
 
-def _create_dict_year_act(params: Dict[str, pd.DataFrame], model_par: str, base_dict: Dict, first_model_year: int,
-                          duration_period_sum: pd.DataFrame, years_no_hist_cap: List[int]) -> Dict:
-    tec_life = params['year_vtg'][params['year_vtg'].par_name == 'technical_lifetime']
+def _create_vintage_block(params: Dict[str, pd.DataFrame], model_par: str, columns: List[str], first_model_year: int,
+                          active_years: YearVector, duration_period_sum: pd.DataFrame, years_no_hist_cap: YearVector,
+                          expand: Dict[str, list]) -> VintageBlock:
+    constants = {}
+    for i in columns:
+        if i in expand or i in YEAR_COLUMNS or i in ['value', 'unit']:
+            continue
+        elif i in params['others'].index:
+            constants[i] = params['others'].loc[i].val
+        elif i in params['in_out'].columns:
+            constants[i] = params['in_out'].loc[model_par][i]
+        else:
+            constants[i] = None
 
-    life_val_unit = tec_life[tec_life.par == 'value']
-    life_val_unit = life_val_unit.assign(unit=tec_life[tec_life.par == 'unit']['val'].values)
+    tec_life = params['year_vtg'][params['year_vtg'].par_name == 'technical_lifetime']
+    life_time = tec_life[tec_life.par == 'value'].set_index('year_vtg')['val']
 
-    _year_vtg = []
-    _year_act = []
-    _value = []
-    _unit = []
-    _par_data = params['year_vtg'][params['year_vtg'].par_name == model_par].copy()
-    _par_data_val = _par_data[_par_data['par'] == 'value'].set_index('year_vtg').to_dict(orient='index')
-    _par_data_unit = _par_data[_par_data['par'] == 'unit'].set_index('year_vtg').to_dict(orient='index')
+    _par_data = params['year_vtg'][params['year_vtg'].par_name == model_par]
+    _par_data_val = _par_data[_par_data['par'] == 'value'].set_index('year_vtg')['val']
+    _par_data_unit = _par_data[_par_data['par'] == 'unit'].set_index('year_vtg')['val']
 
-    tech_years = [i for i in life_val_unit['year_vtg'].values if i not in years_no_hist_cap]
+    tech_years = [i for i in life_time.index if i not in years_no_hist_cap]
     last_tech_year = tech_years[-1]
+    act_years = [get_act_years(duration_period_sum, y, life_time[y], last_tech_year, years_no_hist_cap)
+                 for y in tech_years]
 
-    for y in tech_years:
-        year_life_time = list(life_val_unit[life_val_unit.year_vtg == y]['val'])[0]
-        year_vec = get_act_year_vector(duration_period_sum, y, year_life_time, first_model_year, last_tech_year,
-                                       years_no_hist_cap)
-
-        _year_vtg.extend(year_vec.vintage_years)
-        _year_act.extend(year_vec.act_years)
-        _value.extend(len(year_vec.vintage_years) * [_par_data_val[y]['val']])
-        _unit.extend(len(year_vec.vintage_years) * [_par_data_unit[y]['val']])
+    delta = {}
+    if 'additional_pars' in params['others'].index:
+        add_pars = params['others'].loc['additional_pars', 'val']
+        for y_typ in ['vtg', 'act']:
+            p = 1 + add_pars.get(f'd_{model_par}_{y_typ}', 0)
+            if p != 1:
+                # if efficiency is increasing the input goes down and vice versa
+                delta[y_typ] = 1 / p if model_par == 'input' else p
 
-    base_dict['year_vtg'] = _year_vtg
-    base_dict['year_act'] = _year_act
-    base_dict['value'] = _value
-    base_dict['unit'] = _unit
-    return base_dict
+    return VintageBlock.create(constants, tech_years, act_years, [_par_data_val[y] for y in tech_years],
+                               [_par_data_unit[y] for y in tech_years], first_model_year, expand, delta)
 
 
 def _get_active_model_par(data: Data, _param: Dict[str, pd.DataFrame]) -> List[str]:
@@ -202,61 +224,40 @@ def add_reliability_flexibility_parameter(data: Data, model_par: ModelPar,
                                           raw_data: RawData) -> Dict[str, pd.DataFrame]:
     rel_flex = raw_data['base_input']['rel_and_flex']
     model = {}
-    _rating_bin = []
-    _reliability_factor = []
-    _flexibility_factor = []
     rating_bin_unit = data['units']['rating_bin']['unit']
     reliability_factor_unit = data['units']['reliability_factor']['unit']
     flexibility_factor_unit = data['units']['flexibility_factor']['unit']
 
-    output: pd.DataFrame = model_par['output'].copy()
-
-    for i in rel_flex.index:
-        node = rel_flex.at[i, 'node']
-        technology = rel_flex.at[i, 'technology']
-        mode = data['technology'][technology]['mode']
-        commodity = rel_flex.at[i, 'commodity']
-        level = rel_flex.at[i, 'level']
-        time = rel_flex.at[i, 'time']
-        rating = rel_flex.at[i, 'rating']
-
-        logger.debug(f'Create reliability flexibility parameters for {technology} in {node}')
-
-        rating_bin_value = rel_flex.at[i, 'rating_bin']
-        reliability_factor_value = rel_flex.at[i, 'reliability_factor']
-        flexibility_factor_value = rel_flex.at[i, 'flexibility_factor']
-
-        _output_technology = output[output['technology'] == technology]
-        _model_years = list(_output_technology['year_act'].unique())
-        _active_years = list(_output_technology['year_act'])
-        _vintage_years = list(_output_technology['year_vtg'])
+    logger.debug(f'Create reliability flexibility parameters for {rel_flex["technology"].unique().tolist()}')
 
-        base_par = pd.DataFrame(
-            {'node': node, 'technology': technology, 'year_act': _model_years, 'commodity': commodity, 'level': level,
-             'time': time, 'rating': rating})
+    # (technology, year_act, year_vtg) index of all technologies with reliability and flexibility data
+    output: pd.DataFrame = expand_par(model_par['output'], ['technology', 'year_act', 'year_vtg'])
+    output = output.loc[output['technology'].isin(rel_flex['technology'])]
+    output = output.drop_duplicates()
 
-        _rating_bin.append(make_df(base_par, value=rating_bin_value, unit=rating_bin_unit))
+    base_cols = ['node', 'technology', 'commodity', 'level', 'time', 'rating']
+    rel_flex = rel_flex[base_cols + ['rating_bin', 'reliability_factor', 'flexibility_factor']]
 
-        _reliability_factor.append(make_df(base_par, value=reliability_factor_value, unit=reliability_factor_unit))
+    base_par = rel_flex.merge(output[['technology', 'year_act']].drop_duplicates(), on='technology', sort=False)
+    base_par['year_act'] = base_par['year_act'].astype(int)
+    base_par = base_par[['node', 'technology', 'year_act', 'commodity', 'level', 'time', 'rating', 'rating_bin',
+                         'reliability_factor']]
 
-        base_flex = pd.DataFrame(
-            {'node_loc': node, 'technology': technology, 'year_act': _active_years, 'year_vtg': _vintage_years,
-             'commodity': commodity, 'level': level, 'mode': mode, 'time': time, 'rating': rating})
+    rating_bin = base_par.rename(columns={'rating_bin': 'value'}).drop(columns='reliability_factor')
+    model['rating_bin'] = rating_bin.assign(unit=rating_bin_unit).reset_index(drop=True)
 
-        _flexibility_factor.append(make_df(base_flex, value=flexibility_factor_value, unit=flexibility_factor_unit))
+    reliability_factor = base_par.rename(columns={'reliability_factor': 'value'}).drop(columns='rating_bin')
+    model['reliability_factor'] = reliability_factor.assign(unit=reliability_factor_unit).reset_index(drop=True)
 
-    rating_bin = pd.concat(_rating_bin, sort=False, ignore_index=True)
-    rating_bin['year_act'] = rating_bin['year_act'].astype(int)
-    model['rating_bin'] = rating_bin
-
-    reliability_factor = pd.concat(_reliability_factor, sort=False, ignore_index=True)
-    reliability_factor['year_act'] = reliability_factor['year_act'].astype(int)
-    model['reliability_factor'] = reliability_factor
-
-    flexibility_factor = pd.concat(_flexibility_factor, sort=False, ignore_index=True)
-    flexibility_factor['year_act'] = flexibility_factor['year_act'].astype(int)
-    flexibility_factor['year_vtg'] = flexibility_factor['year_vtg'].astype(int)
-    model['flexibility_factor'] = flexibility_factor
+    base_flex = rel_flex.merge(output, on='technology', sort=False)
+    mode = {t: data['technology'][t]['mode'] for t in base_flex['technology'].unique()}
+    base_flex = base_flex.assign(mode=base_flex['technology'].map(mode))
+    base_flex = base_flex.rename(columns={'node': 'node_loc', 'flexibility_factor': 'value'})
+    base_flex['year_act'] = base_flex['year_act'].astype(int)
+    base_flex['year_vtg'] = base_flex['year_vtg'].astype(int)
+    flexibility_factor = base_flex[['node_loc', 'technology', 'year_act', 'year_vtg', 'commodity', 'level', 'mode',
+                                    'time', 'rating', 'value']]
+    model['flexibility_factor'] = flexibility_factor.assign(unit=flexibility_factor_unit).reset_index(drop=True)
     return model
 
 
@@ -264,26 +265,21 @@ def create_renewable_potential(raw_data: RawData, data: Data, active_years: Year
     renewable_potential = raw_data['base_input']['renewable_potential']
     model = {}
 
-    re_year = renewable_potential.iloc[
-        np.repeat(np.arange(len(renewable_potential)), len(active_years))]
-    re_year = re_year.assign(
-        year=active_years * renewable_potential.shape[0])
+    re_year = _cross_join(renewable_potential, pd.DataFrame({'year': active_years}))
 
-    re_potential = re_year.copy()
-    re_potential['unit'] = data['units']['renewable_potential']['unit']
-    re_potential['value'] = re_potential['potential']
+    re_potential = re_year.rename(columns={'potential': 'value'})
+    re_potential = re_potential.assign(unit=data['units']['renewable_potential']['unit'])
     model['renewable_potential'] = re_potential[['commodity', 'level', 'grade', 'value', 'node', 'year', 'unit']]
 
-    re_cap_factor = re_year.copy()
-    re_cap_factor['unit'] = data['units']['renewable_capacity_factor']['unit']
-    re_cap_factor['value'] = re_cap_factor['capacity_factor']
+    re_cap_factor = re_year.rename(columns={'capacity_factor': 'value'})
+    re_cap_factor = re_cap_factor.assign(unit=data['units']['renewable_capacity_factor']['unit'])
     model['renewable_capacity_factor'] = re_cap_factor[['commodity', 'level', 'grade', 'value', 'node', 'year', 'unit']]
     return model
 
 
 def change_emission_factor(raw_data: RawData, model_par: ModelPar) -> Dict[str, pd.DataFrame]:
     emissions = raw_data['base_input']['emissions']
-    emission_factor: pd.DataFrame = model_par['emission_factor']
+    emission_factor: pd.DataFrame = expand_par(model_par['emission_factor'])
     model = {}
 
     def apply_change(row):
@@ -304,6 +300,12 @@ def change_emission_factor(raw_data: RawData, model_par: ModelPar) -> Dict[str,
 
 
 # help functions
+def _cross_join(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+    _key = '_cross_join_key'
+    df = left.assign(**{_key: 0}).merge(right.assign(**{_key: 0}), on=_key, sort=False)
+    return df.drop(columns=_key)
+
+
 def _check_emissions_is_list(params: Dict[str, pd.DataFrame]) -> bool:
     if 'emission' in params['others'].index:
         if isinstance(params['others'].loc['emission'].val, list):
@@ -331,34 +333,40 @@ def _get_location_techs(data: Data, loc: str, par: str) -> Tuple[Dict[str, dict]
 
 
 def _override_techs(technology: Dict[str, dict], loc_techs: Dict[str, dict], techs: List[str]) -> Dict[str, dict]:
+    # location settings are stored on top of the shared technology, it is not changed for other locations
     override = {t: {k: v for k, v in loc_techs[t]['override'].items()} for t in techs}
     for t in techs:
-        technology[t].update(override[t])
+        technology[t] = technology[t].new_child(override[t])
+
+    return technology
+
+
+def get_slack_techs(data: Data, par: str) -> Dict[str, Dict[str, dict]]:
+    # slack technologies for all (node, commodity) pairs of the tabular demand input
+    _df = data[par].frame.index.to_frame(index=False)  # type: ignore
+    _df = _df.iloc[:, [0, -1]].drop_duplicates()
+    _df.columns = ['node', 'commodity']
+    _df = _df.sort_values(['node', 'commodity'])
 
+    technology: Dict[str, Dict[str, dict]] = {}
+    for loc, c in _df.itertuples(index=False):
+        technology.setdefault(loc, {})['slack_' + c] = data['technology']['slack_' + c].new_child(
+            {'node_loc': loc, 'node_dest': loc, 'node_origin': loc})
     return technology
 
 
 def _get_slack_techs(data, loc: str, par: str) -> Tuple[Dict[str, dict], bool]:
-    commodity = [data[par][loc]['year'][i].keys() for i in data[par][loc]['year'].keys()]
-    commodity = [i for l in commodity for i in l]
-    commodity = sorted(list(set(commodity)))
-    technology = {}
-    for c in commodity:
-        technology['slack_' + c] = data['technology']['slack_' + c]
-        technology['slack_' + c]['node_loc'] = loc
-        technology['slack_' + c]['node_dest'] = loc
-        technology['slack_' + c]['node_origin'] = loc
+    technology = get_slack_techs(data, par).get(loc, {})
     technology_exist = True
 
     return technology, technology_exist
 
 
 def _get_df_tech(technology: Dict[str, dict], t: str) -> Dict[str, dict]:
-    _df = pd.DataFrame.from_dict(technology)
     _param = {}
 
     # create pandas Series for a given technology from a dict
-    df = _df[t].dropna()
+    df = pd.Series(materialize(technology[t])).dropna()
     if 'year_vtg' in df.keys():
         _param['year_vtg'] = __get_df_year(df, year_type='year_vtg')
         df = df.drop('year_vtg')
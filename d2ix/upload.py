@@ -0,0 +1,89 @@
+import logging
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Union
+
+import message_ix
+import pandas as pd
+
+from d2ix.util.vintage import VintageFrame
+
+logger = logging.getLogger(__name__)
+
+MEMORY_BUDGET = 256 * 2 ** 20
+MIN_CHUNK_ROWS = 1000
+# the chunk is copied by the clean up and again on the conversion to the platform
+_COPY_FACTOR = 3
+_SAMPLE_ROWS = 1000
+
+
+class UploadProgress(NamedTuple):
+    parameter: str
+    rows: int
+    total_rows: int
+    parameters: int
+    total_parameters: int
+
+
+Parameter = Union[pd.DataFrame, VintageFrame]
+
+
+def chunk_size(par: Parameter, memory_budget: int = MEMORY_BUDGET) -> int:
+    """Rows per chunk, estimated from the memory of a sample of rows"""
+    if isinstance(par, VintageFrame):
+        sample = next(par.iter_frames(), par.dense).head(_SAMPLE_ROWS)
+    else:
+        sample = par.head(_SAMPLE_ROWS)
+    if sample.empty:
+        return MIN_CHUNK_ROWS
+    row_bytes = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+    return max(MIN_CHUNK_ROWS, int(memory_budget // (_COPY_FACTOR * row_bytes)))
+
+
+def iter_chunks(par: Parameter, rows: int) -> Iterator[pd.DataFrame]:
+    """Row batches of at most `rows` rows, compact parameters are expanded
+    block by block
+    """
+    frames = par.iter_frames() if isinstance(par, VintageFrame) else iter([par])
+    buffer = []
+    buffer_rows = 0
+    for df in frames:
+        for start in range(0, len(df), rows):
+            part = df.iloc[start:start + rows]
+            if buffer_rows + len(part) > rows:
+                yield pd.concat(buffer, sort=False, ignore_index=True)
+                buffer, buffer_rows = [], 0
+            buffer.append(part)
+            buffer_rows += len(part)
+    if buffer:
+        yield pd.concat(buffer, sort=False, ignore_index=True)
+
+
+def clean_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """Remove rows with NaN and cast the year and value columns"""
+    df = df.dropna()
+    dtypes = {c: int for c in df.columns if str(c).startswith('year') and df[c].dtype == object}
+    if 'value' in df.columns and df['value'].dtype == object:
+        dtypes['value'] = float
+    return df.astype(dtypes).reset_index(drop=True) if dtypes else df.reset_index(drop=True)
+
+
+def upload_parameters(scenario: message_ix.Scenario, model_par: Dict[str, Parameter],
+                      memory_budget: int = MEMORY_BUDGET,
+                      progress: Optional[Callable[[UploadProgress], None]] = None) -> None:
+    """Add the parameters to the scenario in row batches, the peak memory of
+    a batch is limited to about `memory_budget` bytes
+    """
+    total_parameters = len(model_par)
+    for i, (k, v) in enumerate(model_par.items()):
+        total_rows = len(v)
+        rows = chunk_size(v, memory_budget)
+        done = 0
+        for chunk in iter_chunks(v, rows):
+            done += len(chunk)
+            chunk = clean_chunk(chunk)
+            if not chunk.empty:
+                scenario.add_par(k, chunk)
+            if progress is not None:
+                progress(UploadProgress(k, done, total_rows, i, total_parameters))
+        logger.debug(f'Added parameter \'{k}\': {total_rows} rows in chunks of {rows}')
+        if progress is not None:
+            progress(UploadProgress(k, total_rows, total_rows, i + 1, total_parameters))
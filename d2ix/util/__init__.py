@@ -1,2 +1,8 @@
-from d2ix.util.tools import YAMLd2ix, model_data_yml, setup_logging, split_columns, df_to_nested_dict
+from d2ix.util.tools import YAMLd2ix, model_data_yml, setup_logging, split_columns, df_to_nested_dict, \
+    FrameDict
+from d2ix.util.vintage import VintageBlock, VintageFrame, expand_par, memory_usage
 from d2ix.util.data_sanity_tests import check_input_data
+from d2ix.util.profiling import BuildProfile
+from d2ix.util.template import TechTemplate, materialize
+from d2ix.util.checkpoint import BuildCheckpoint
+from d2ix.util.workbook import SheetSpec, read_workbook
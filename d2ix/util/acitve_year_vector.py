@@ -1,6 +1,8 @@
 import itertools
-from typing import List, NamedTuple
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 
+import numpy as np
 import pandas as pd
 
 
@@ -9,15 +11,42 @@ class YearVector(NamedTuple):
     act_years: List[int]
 
 
-def get_act_year_vector(duration_period_sum: pd.DataFrame, vtg_year: int, life_time: int, first_model_year: int,
-                        last_tech_year: int,
-                        years_no_hist_cap: List[int]) -> YearVector:
-    dps = duration_period_sum.T
-    act_years = list(dps[dps[vtg_year] < life_time][vtg_year].index)
+@lru_cache(maxsize=16)
+def _duration_period(year_vector: Tuple[int, ...]) -> Tuple[Dict[int, int], pd.DataFrame]:
+    years = np.array(year_vector)
+    duration = np.diff(years)
+    duration = np.concatenate([duration[:1], duration])
+
+    # duration_period_sum[y1, y2]: sum of the duration periods from y1 (incl.) to y2 (excl.)
+    period_start = np.concatenate([[0], np.cumsum(duration)[:-1]])
+    dps = np.triu(period_start[np.newaxis, :] - period_start[:, np.newaxis], k=1)
+
+    duration_period = dict(zip(year_vector, duration.tolist()))
+    duration_period_sum = pd.DataFrame(dps, index=list(year_vector), columns=list(year_vector))
+    return duration_period, duration_period_sum
+
+
+def calc_duration_period(year_vector: List[int]) -> Tuple[Dict[int, int], pd.DataFrame]:
+    # copies of the cached results, a change by one model does not affect the next build
+    duration_period, duration_period_sum = _duration_period(tuple(year_vector))
+    return dict(duration_period), duration_period_sum.copy()
+
+
+def get_act_years(duration_period_sum: pd.DataFrame, vtg_year: int, life_time: int, last_tech_year: int,
+                  years_no_hist_cap: List[int]) -> List[int]:
+    dps = duration_period_sum
+    _dps_vtg = dps.values[dps.index.get_loc(vtg_year)]
+    act_years = dps.columns[_dps_vtg < life_time].tolist()
     act_years = [i for i in act_years if i <= last_tech_year]
     # remove undefined historical years
     act_years = sorted(list(set(act_years) - set(years_no_hist_cap)))
-    act_years = [y for y in act_years if y >= vtg_year]
+    return [y for y in act_years if y >= vtg_year]
+
+
+def get_act_year_vector(duration_period_sum: pd.DataFrame, vtg_year: int, life_time: int, first_model_year: int,
+                        last_tech_year: int,
+                        years_no_hist_cap: List[int]) -> YearVector:
+    act_years = get_act_years(duration_period_sum, vtg_year, life_time, last_tech_year, years_no_hist_cap)
     year_pairs = [(y_v, y_a) for y_v, y_a in itertools.product(act_years, act_years) if
                   (y_v <= y_a) and (y_a >= first_model_year)]
 
@@ -26,21 +55,23 @@ def get_act_year_vector(duration_period_sum: pd.DataFrame, vtg_year: int, life_t
     return years_vector
 
 
-def get_years_no_hist_cap(loc: str, tech: str, historical_years: List[int], tech_hist: pd.DataFrame) -> List[int]:
-    if not tech_hist.empty:
-        _hist_cap_loc_tech = tech_hist[
-            (tech_hist['node_loc'] == loc)
-            & (tech_hist['technology'] == tech)
-            & (tech_hist['value'] > 0)]
-        if not _hist_cap_loc_tech.empty:
-            tech_hist_years = _hist_cap_loc_tech['year_vtg'].tolist()
-        else:
-            tech_hist_years = []
-    else:
-        tech_hist_years = []
+HistCapIndex = Dict[Tuple[str, str], Set[int]]
+
+
+def create_hist_cap_index(tech_hist: Optional[pd.DataFrame]) -> HistCapIndex:
+    """Vintage years with historical new capacity per (node_loc, technology)"""
+    index: HistCapIndex = {}
+    if tech_hist is None or tech_hist.empty:
+        return index
+    _hist = tech_hist[tech_hist['value'] > 0]
+    for loc, tech, year in zip(_hist['node_loc'], _hist['technology'], _hist['year_vtg']):
+        index.setdefault((loc, tech), set()).add(year)
+    return index
+
 
+def get_years_no_hist_cap(loc: str, tech: str, historical_years: List[int], hist_cap: HistCapIndex) -> List[int]:
     if historical_years:
-        years_no_hist_cap = list(set(historical_years) - set(tech_hist_years))
+        years_no_hist_cap = list(set(historical_years) - hist_cap.get((loc, tech), set()))
     else:
         years_no_hist_cap = []
 
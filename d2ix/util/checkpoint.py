@@ -0,0 +1,91 @@
+import hashlib
+import logging
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+_PACKAGE_DIR = Path(__file__).parents[1]
+
+
+def file_hash(path: Optional[Union[str, Path]]) -> Optional[str]:
+    if path is None or not Path(path).exists():
+        return None
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def source_hash() -> str:
+    """Hash of the d2ix sources, checkpoints of other code versions are not used"""
+    h = hashlib.sha256()
+    for p in sorted(_PACKAGE_DIR.rglob('*.py')) + sorted(_PACKAGE_DIR.rglob('*.yml')):
+        h.update(str(p.relative_to(_PACKAGE_DIR)).encode())
+        h.update(p.read_bytes())
+    return h.hexdigest()
+
+
+def input_hash(*inputs: Any) -> str:
+    return hashlib.sha256(repr(inputs).encode()).hexdigest()
+
+
+class BuildCheckpoint(object):
+    """Results of the build stages pickled to `directory`, one file per
+    stage. A stage is resumed from its file if the hash of its inputs (input
+    files, settings, hash of the previous stage and the d2ix sources) is
+    unchanged.
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key(self, *inputs: Any) -> str:
+        return input_hash(source_hash(), *inputs)
+
+    def _path(self, stage: str) -> Path:
+        return self.directory.joinpath(f'{stage}.pkl')
+
+    def load(self, stage: str, key: str) -> Tuple[bool, Any]:
+        p = self._path(stage)
+        if not p.exists():
+            return False, None
+        try:
+            with open(p, 'rb') as f:
+                if pickle.load(f) != key:
+                    logger.debug(f'Checkpoint of stage \'{stage}\' is outdated')
+                    return False, None
+                return True, pickle.load(f)
+        except (EOFError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+            logger.warning(f'Checkpoint of stage \'{stage}\' can not be loaded: {e!r}')
+            return False, None
+
+    def save(self, stage: str, key: str, obj: Any) -> None:
+        p = self._path(stage)
+        tmp = p.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(str(tmp), str(p))
+
+    def run(self, stage: str, key: str, func: Callable, *args, **kwargs) -> Any:
+        """Result of `func` from the checkpoint, or run and save it"""
+        found, obj = self.load(stage, key)
+        if found:
+            logger.info(f'Resume stage \'{stage}\' from checkpoint')
+            return obj
+        obj = func(*args, **kwargs)
+        self.save(stage, key, obj)
+        return obj
+
+
+def run_stage(checkpoint: Optional[BuildCheckpoint], stage: str, key: str, func: Callable, *args, **kwargs) -> Any:
+    if checkpoint is None:
+        return func(*args, **kwargs)
+    return checkpoint.run(stage, key, func, *args, **kwargs)
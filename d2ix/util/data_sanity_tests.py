@@ -5,6 +5,7 @@ import numpy as np
 import pandas as pd
 
 from d2ix import ModelPar, RawData
+from d2ix.util.vintage import expand_par
 
 logger = logging.getLogger(__name__)
 
@@ -24,8 +25,9 @@ def check_input_data(raw_data: RawData, model_par: ModelPar) -> None:
     # assigned
     if 'peak_load_factor' in raw_data.get('manual_input', {}).keys():
         rel_and_flex = raw_data['base_input']['rel_and_flex'].copy()
-        input_data: pd.DataFrame = model_par['input']
-        output_data: pd.DataFrame = model_par['output']
+        columns = ['node_loc', 'technology', 'commodity', 'level']
+        input_data: pd.DataFrame = expand_par(model_par['input'], columns)
+        output_data: pd.DataFrame = expand_par(model_par['output'], columns)
 
         peak_load_factor = raw_data['manual_input']['peak_load_factor']
         plf = peak_load_factor[['node', 'commodity', 'level']].drop_duplicates()
@@ -0,0 +1,120 @@
+import cProfile
+import csv
+import io
+import json
+import logging
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class StageProfile(NamedTuple):
+    stage: str
+    wall_time: float
+    cpu_time: float
+    peak_memory: Optional[int]
+    rows: Dict[str, int]
+    cprofile: Optional[str]
+
+
+class BuildProfile(object):
+    """Timers, peak memory and parameter row counts for the build stages of a
+    model. Memory tracing (tracemalloc) and cProfile capture are optional as
+    both slow down the build. The row counts of the produced parameters are
+    taken from the callable `model_par` at the end of a stage. The parse
+    times of the workbook sheets are kept in `sheets`.
+    """
+
+    def __init__(self, memory: bool = False, cprofile: bool = False, cprofile_lines: int = 30) -> None:
+        self.memory = memory
+        self.cprofile = cprofile
+        self.cprofile_lines = cprofile_lines
+        self.stages: List[StageProfile] = []
+        self.sheets: list = []
+        self._peaks: List[int] = []
+        self.created = datetime.now().isoformat(timespec='seconds')
+
+    @contextmanager
+    def stage(self, name: str, model_par: Optional[Callable[[], dict]] = None):
+        _tracing = self.memory and not tracemalloc.is_tracing()
+        if _tracing:
+            tracemalloc.start()
+        _peak = self.memory and (_tracing or hasattr(tracemalloc, 'reset_peak'))
+        if _peak and not _tracing:
+            # tracing by the caller or an enclosing stage: the peak of this stage starts now, the peak so far is
+            # kept for the enclosing stage
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._peaks.append(0)
+        profiler = cProfile.Profile() if self.cprofile else None
+
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield self
+        finally:
+            if profiler:
+                profiler.disable()
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            # without `tracemalloc.reset_peak` (python < 3.9) the peak of a stage is only known if it started tracing
+            inner_peak = self._peaks.pop()
+            peak = max(tracemalloc.get_traced_memory()[1], inner_peak) if _peak else None
+            if _tracing:
+                tracemalloc.stop()
+            if peak is not None and self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+
+            self.stages.append(StageProfile(stage=name, wall_time=wall, cpu_time=cpu, peak_memory=peak,
+                                            rows=count_rows(model_par()) if model_par is not None else {},
+                                            cprofile=self._cprofile_stats(profiler)))
+            logger.debug(f'Stage \'{name}\': {wall:.3f}s wall, {cpu:.3f}s cpu')
+
+    def _cprofile_stats(self, profiler: Optional[cProfile.Profile]) -> Optional[str]:
+        if profiler is None:
+            return None
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(self.cprofile_lines)
+        return stream.getvalue()
+
+    def summary(self) -> pd.DataFrame:
+        return pd.DataFrame([{'stage': s.stage, 'wall_time': s.wall_time, 'cpu_time': s.cpu_time,
+                              'peak_memory': s.peak_memory, 'rows': sum(s.rows.values())} for s in self.stages],
+                            columns=['stage', 'wall_time', 'cpu_time', 'peak_memory', 'rows'])
+
+    def to_dict(self) -> dict:
+        return {'created': self.created, 'stages': [s._asdict() for s in self.stages],
+                'sheets': [s._asdict() for s in self.sheets]}
+
+    def to_json(self, path: Union[str, Path]) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def append_csv(self, path: Union[str, Path], label: str = '') -> None:
+        """Append one line per stage to a csv history file, e.g. to track the
+        build performance over input data releases
+        """
+        p = Path(path)
+        write_header = not p.exists()
+        with open(p, 'a', newline='') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(['created', 'label', 'stage', 'wall_time', 'cpu_time', 'peak_memory', 'rows'])
+            for s in self.stages:
+                writer.writerow([self.created, label, s.stage, f'{s.wall_time:.6f}', f'{s.cpu_time:.6f}',
+                                 s.peak_memory if s.peak_memory is not None else '', sum(s.rows.values())])
+
+
+def count_rows(model_par: dict) -> Dict[str, int]:
+    return {k: len(v) for k, v in model_par.items() if v is not None}
@@ -0,0 +1,31 @@
+from collections import ChainMap
+from typing import Any
+
+
+class TechTemplate(ChainMap):
+    """Copy-on-write technology definition. Lookups fall through to the
+    shared (base technology) mappings, all changes are stored in the first
+    mapping only. Nested mappings are wrapped on access, so that e.g.
+    `tech['output']['level'] = 'final'` leaves the shared defaults untouched.
+    """
+
+    def __getitem__(self, key: Any) -> Any:
+        value = super().__getitem__(key)
+        if key not in self.maps[0] and isinstance(value, (dict, ChainMap)):
+            value = TechTemplate({}, value)
+            self.maps[0][key] = value
+        return value
+
+    def raw(self, key: Any) -> Any:
+        return super().__getitem__(key)
+
+
+def materialize(value: Any) -> Any:
+    """Resolve a technology template into independent plain dicts"""
+    if isinstance(value, TechTemplate):
+        return {k: materialize(value.raw(k)) for k in value}
+    if isinstance(value, (dict, ChainMap)):
+        return {k: materialize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [materialize(v) for v in value]
+    return value
@@ -1,11 +1,15 @@
 import collections
+import collections.abc
 import logging
 import logging.config
 from pathlib import Path
+from typing import Any, Dict, Iterator
 
 import pandas as pd
 from ruamel.yaml import YAML, StringIO
 
+from d2ix.util.vintage import expand_par
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,6 +52,8 @@ def model_data_yml(config, model_par):
                 dict_to_yml(sorted([str(i) for i in v]), path_dest)
                 logger.debug(f'Created yaml output file: \'{k}\'')
         elif not v.empty:
+            # one parameter at a time in full rows
+            v = expand_par(v).dropna().reset_index(drop=True)
             v.columns = [str(i) for i in v.columns]
             v = v.to_dict(orient='index')
 
@@ -93,6 +99,43 @@ def df_to_nested_dict(df: pd.DataFrame) -> dict:
     return d
 
 
+class FrameDict(collections.abc.Mapping):
+    """Read-only nested dict view of a DataFrame, equivalent to
+    `df_to_nested_dict(frame)`. Every index level is a key level and the
+    columns (without NaN values) are the keys of the innermost dicts. The
+    nested dicts are only materialized on access, the DataFrame stays
+    available as `frame` for vectorized access.
+    """
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        self.frame = frame
+        self._positions = frame.groupby(level=0, sort=False).indices
+        self._cache: Dict[Any, Any] = {}
+
+    def __getitem__(self, key: Any) -> Any:
+        if key in self._cache:
+            return self._cache[key]
+        sub = self.frame.iloc[self._positions[key]]
+        if isinstance(self.frame.index, pd.MultiIndex):
+            sub.index = sub.index.droplevel(0)
+            value: Any = FrameDict(sub)
+        else:
+            value = {}
+            for row in sub.itertuples(index=False):
+                value.update({k: v for k, v in zip(sub.columns, row) if not pd.isna(v)})
+        self._cache[key] = value
+        return value
+
+    def __iter__(self) -> Iterator:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({list(self._positions)})'
+
+
 def xls_to_yml(path, sheet_name, index=None, yml_name=None):
     p = Path(path)
     if index:
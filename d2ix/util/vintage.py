@@ -0,0 +1,174 @@
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+YEAR_COLUMNS = ['year_vtg', 'year_act']
+
+
+class VintageBlock(NamedTuple):
+    """Rows of one technology parameter over (year_vtg, year_act), stored per
+    vintage. The rows of vintage i are all pairs of `act_years[i]` with
+    year_vtg <= year_act and year_act >= first_model_year.
+    """
+    constants: Dict[str, Any]
+    year_vtg: np.ndarray
+    act_years: List[np.ndarray]
+    value: np.ndarray
+    unit: np.ndarray
+    first_model_year: int
+    expand: Dict[str, list]
+    delta: Dict[str, float]
+    rows: int
+
+    @classmethod
+    def create(cls, constants: Dict[str, Any], year_vtg: List[int], act_years: List[List[int]], value: list,
+               unit: list, first_model_year: int, expand: Optional[Dict[str, list]] = None,
+               delta: Optional[Dict[str, float]] = None) -> 'VintageBlock':
+        expand = expand or {}
+        act = [np.array(y, dtype=int) for y in act_years]
+        value = np.array(value)
+        if expand and value.ndim == 1:
+            value = np.tile(value, (len(next(iter(expand.values()))), 1)).T
+        n_vtg_rows = sum(int(((y >= first_model_year) * np.arange(1, len(y) + 1)).sum()) for y in act)
+        rows = n_vtg_rows * (len(next(iter(expand.values()))) if expand else 1)
+        return cls(constants, np.array(year_vtg, dtype=int), act, value, np.array(unit, dtype=object),
+                   first_model_year, expand, delta or {}, rows)
+
+    def _pairs(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        vtg, act, idx = [], [], []
+        for i, years in enumerate(self.act_years):
+            v, a = np.meshgrid(years, years, indexing='ij')
+            mask = (v <= a) & (a >= self.first_model_year)
+            vtg.append(v[mask])
+            act.append(a[mask])
+            idx.append(np.full(mask.sum(), i))
+        if not idx:
+            return np.array([], dtype=int), np.array([], dtype=int), np.array([], dtype=int)
+        return np.concatenate(vtg), np.concatenate(act), np.concatenate(idx)
+
+    def to_frame(self, columns: List[str]) -> pd.DataFrame:
+        vtg, act, idx = self._pairs()
+        n = len(next(iter(self.expand.values()))) if self.expand else 1
+        rows = len(idx)
+        if self.expand:
+            value = self.value[idx].T.reshape(-1)
+            vtg, act, idx = np.tile(vtg, n), np.tile(act, n), np.tile(idx, n)
+        else:
+            value = self.value[idx]
+        value = self._apply_delta(value, vtg, act)
+
+        data: Dict[str, Any] = {'year_vtg': vtg, 'year_act': act, 'value': value, 'unit': self.unit[idx]}
+        data.update({k: np.repeat(np.array(v, dtype=object), rows) for k, v in self.expand.items()})
+        return pd.DataFrame({c: data[c] if c in data else self.constants.get(c) for c in columns},
+                            index=pd.RangeIndex(rows * n), columns=columns)
+
+    def _apply_delta(self, value: np.ndarray, vtg: np.ndarray, act: np.ndarray) -> np.ndarray:
+        # annual change of the value over the vintage and/or activity years, relative to the first row
+        if not self.delta or len(vtg) == 0:
+            return value
+        ref_year = max(vtg[0], self.first_model_year)
+        value = value.astype(float)
+        for y_typ in ['vtg', 'act']:
+            if y_typ not in self.delta:
+                continue
+            years = vtg if y_typ == 'vtg' else act
+            n = years - ref_year if y_typ == 'vtg' else act - vtg
+            mask = ref_year < years
+            val = value * self.delta[y_typ] ** n
+            val = np.where((value >= 0) & (val < 0), 0, val)
+            value = np.where(mask, val, value)
+        return value
+
+    def unique(self, column: str) -> list:
+        if column in YEAR_COLUMNS:
+            vtg, act, _ = self._pairs()
+            return np.unique(vtg if column == 'year_vtg' else act).tolist()
+        if column == 'unit':
+            return pd.unique(self.unit).tolist()
+        if column in self.expand:
+            return list(self.expand[column])
+        value = self.constants.get(column)
+        return [] if value is None else [value]
+
+    def memory_usage(self) -> int:
+        return sum(a.nbytes for a in self.act_years) + self.year_vtg.nbytes + self.value.nbytes + self.unit.nbytes
+
+
+class VintageFrame(object):
+    """Parameter over (year_vtg, year_act) with technology rows kept as
+    compact vintage blocks, which are expanded to full rows on demand (e.g. in
+    `model2db`). Rows which were given as DataFrame are kept in `dense`.
+    It is not a DataFrame, use `expand_par` (or `Model.get_parameter`) for
+    the full rows.
+    """
+
+    def __init__(self, dense: pd.DataFrame, blocks: Optional[List[VintageBlock]] = None) -> None:
+        self.dense = dense
+        self.columns = list(dense.columns)
+        self.blocks = list(blocks or [])
+
+    def append(self, block: VintageBlock) -> 'VintageFrame':
+        return VintageFrame(self.dense, self.blocks + [block])
+
+    def __len__(self) -> int:
+        return len(self.dense) + sum(b.rows for b in self.blocks)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __getattr__(self, name: str) -> Any:
+        # DataFrame methods used on `model.model_par[...]`, e.g. `.loc` or `.to_excel`
+        if not name.startswith('_') and hasattr(pd.DataFrame, name):
+            raise AttributeError(f'\'{self.__class__.__name__}\' has no attribute \'{name}\', the parameter is kept '
+                                 f'per vintage: use `expand_par(par)` or `model.get_parameter(name)` for a DataFrame')
+        raise AttributeError(name)
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    def iter_frames(self, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        columns = columns or self.columns
+        if not self.dense.empty:
+            yield self.dense[columns]
+        for block in self.blocks:
+            yield block.to_frame(columns)
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        frames = list(self.iter_frames(columns))
+        if not frames:
+            return self.dense[columns or self.columns]
+        return pd.concat(frames, sort=False, ignore_index=True)
+
+    def unique(self, column: str) -> list:
+        values = self.dense[column].dropna().tolist()
+        for block in self.blocks:
+            values.extend(block.unique(column))
+        return list(pd.unique(pd.Series(values, dtype=object)))
+
+    def memory_usage(self) -> int:
+        return int(self.dense.memory_usage(deep=True).sum()) + sum(b.memory_usage() for b in self.blocks)
+
+
+def expand_par(par: Union[pd.DataFrame, VintageFrame, list, None],
+               columns: Optional[List[str]] = None) -> Union[pd.DataFrame, list, None]:
+    """Full rows of a model parameter, also for compact parameters"""
+    if isinstance(par, VintageFrame):
+        return par.to_frame(columns)
+    if columns is not None and isinstance(par, pd.DataFrame):
+        return par[columns]
+    return par
+
+
+def memory_usage(model_par: dict, expanded: bool = False) -> int:
+    """Memory of the model parameters in bytes, `expanded=True` counts the
+    compact parameters with their full rows
+    """
+    total = 0
+    for v in model_par.values():
+        if isinstance(v, VintageFrame) and not expanded:
+            total += v.memory_usage()
+        elif isinstance(v, (pd.DataFrame, VintageFrame)):
+            total += int(expand_par(v).memory_usage(deep=True).sum())
+    return total
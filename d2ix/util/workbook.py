@@ -0,0 +1,88 @@
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# with `max_workers` > 1 workbooks are parsed in a process pool above this file size, below the start of the pool
+# takes longer
+PARALLEL_MIN_BYTES = 2 ** 20
+
+
+class SheetSpec(NamedTuple):
+    """Sheet to parse, `usecols` are the columns to read (missing columns
+    are skipped) and `dtype` the column types applied while parsing
+    """
+    name: str
+    usecols: Optional[List[str]] = None
+    dtype: Optional[Dict[str, Any]] = None
+
+
+class SheetTiming(NamedTuple):
+    workbook: str
+    sheet: str
+    rows: int
+    seconds: float
+
+
+SheetArg = Union[str, SheetSpec]
+
+
+def _parse_sheet(xls: pd.ExcelFile, spec: SheetSpec) -> Tuple[pd.DataFrame, float]:
+    start = time.perf_counter()
+    usecols = None
+    if spec.usecols is not None:
+        columns = set(spec.usecols)
+        usecols = columns.__contains__
+    df = xls.parse(spec.name, usecols=usecols, dtype=spec.dtype)
+    return df, time.perf_counter() - start
+
+
+def _parse_sheet_file(path: str, spec: SheetSpec) -> Tuple[pd.DataFrame, float]:
+    # pool workers open the workbook themselves
+    xls = pd.ExcelFile(path)
+    try:
+        return _parse_sheet(xls, spec)
+    finally:
+        xls.close()
+
+
+def read_workbook(path: Union[str, Path], sheets: Optional[Iterable[SheetArg]] = None,
+                  max_workers: int = 1,
+                  timings: Optional[List[SheetTiming]] = None) -> Dict[str, pd.DataFrame]:
+    """Parse the given sheets of a workbook (default: all sheets) in the
+    order of the workbook, sheets which do not exist are skipped. The sheets
+    are parsed in this process, with `max_workers` > 1 large workbooks are
+    parsed sheet by sheet in a pool of spawned processes (not forked, the
+    caller may run the JVM of the platform). The parse time of every sheet
+    is appended to `timings`.
+    """
+    path = str(path)
+    xls = pd.ExcelFile(path)
+    try:
+        sheet_names = xls.sheet_names
+        specs = [SheetSpec(s) for s in sheet_names] if sheets is None else \
+            [s if isinstance(s, SheetSpec) else SheetSpec(s) for s in sheets]
+        specs = sorted([s for s in specs if s.name in sheet_names], key=lambda s: sheet_names.index(s.name))
+
+        workers = min(len(specs), max_workers)
+        if workers > 1 and Path(path).stat().st_size >= PARALLEL_MIN_BYTES:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+                results = list(executor.map(_parse_sheet_file, [path] * len(specs), specs))
+        else:
+            results = [_parse_sheet(xls, s) for s in specs]
+    finally:
+        xls.close()
+
+    frames = {}
+    for spec, (df, seconds) in zip(specs, results):
+        frames[spec.name] = df
+        logger.debug(f'Parsed sheet \'{spec.name}\' of \'{path}\': {len(df)} rows in {seconds:.3f}s')
+        if timings is not None:
+            timings.append(SheetTiming(path, spec.name, len(df), seconds))
+    return frames
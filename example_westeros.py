@@ -10,53 +10,48 @@ RUN_CONFIG = 'config/run_config.yml'
 
 
 def run_baseline():
-    # launch the IX modeling platform using a local database
-    model = Model(model=MODEL, scen='baseline', base_xls=BASE_XLS, manual_parameter_xls=MANUAL_PAR_XLS,
-                  historical_data=True, first_historical_year=690, first_model_year=700, last_model_year=720,
-                  historical_range_year=10, model_range_year=10, run_config=RUN_CONFIG, verbose=VERBOSE,
-                  yaml_export=False)
-
-    # Example on how to access and edit parameters manually if neccessary
-    # data_par = model.get_parameter(par='demand')
-    # model.set_parameter(par=data_par, name='demand')
-    scenario = model.model2db()
-    scenario.solve(model='MESSAGE')
-    model.close_db()
+    # launch the IX modeling platform using a local database, the platform is released at the end of the block
+    with Model(model=MODEL, scen='baseline', base_xls=BASE_XLS, manual_parameter_xls=MANUAL_PAR_XLS,
+               historical_data=True, first_historical_year=690, first_model_year=700, last_model_year=720,
+               historical_range_year=10, model_range_year=10, run_config=RUN_CONFIG, verbose=VERBOSE,
+               yaml_export=False) as model:
+        # Example on how to access and edit parameters manually if neccessary
+        # data_par = model.get_parameter(par='demand')
+        # model.set_parameter(par=data_par, name='demand')
+        scenario = model.model2db()
+        scenario.solve(model='MESSAGE')
 
 
 def run_emission_tax():
-    model = Model(model=MODEL, scen='emission_tax', base_xls=BASE_XLS, manual_parameter_xls=MANUAL_PAR_XLS,
-                  historical_data=True, first_historical_year=690, first_model_year=700, last_model_year=720,
-                  historical_range_year=10, model_range_year=10, run_config=RUN_CONFIG, verbose=VERBOSE,
-                  yaml_export=False)
-
-    # Add a emission tax
-    tax_emission = model.get_parameter(par='tax_emission')
-    tax_emission['value'] = [0.264, 0.429, 0.699]
-    model.set_parameter(par=tax_emission, name='tax_emission')
-    scenario = model.model2db()
-    scenario.solve(model='MESSAGE')
-    model.close_db()
+    with Model(model=MODEL, scen='emission_tax', base_xls=BASE_XLS, manual_parameter_xls=MANUAL_PAR_XLS,
+               historical_data=True, first_historical_year=690, first_model_year=700, last_model_year=720,
+               historical_range_year=10, model_range_year=10, run_config=RUN_CONFIG, verbose=VERBOSE,
+               yaml_export=False) as model:
+        # Add a emission tax
+        tax_emission = model.get_parameter(par='tax_emission')
+        tax_emission['value'] = [0.264, 0.429, 0.699]
+        model.set_parameter(par=tax_emission, name='tax_emission')
+        scenario = model.model2db()
+        scenario.solve(model='MESSAGE')
 
 
 def run_postprocessing(version, scen):
     # Crate an instance of the d2ix post process class:
     # Post process for a specific scenario: model, scen, version
-    pp = PostProcess(RUN_CONFIG, MODEL, scen, version)
-
-    # Load results for
-    results = pp.get_results()
+    with PostProcess(RUN_CONFIG, MODEL, scen, version) as pp:
+        # Load results for
+        results = pp.get_results()
 
-    # Prepare data for plotting
-    df = pp.create_plotdata(results)
+        # Prepare data for plotting
+        df = pp.create_plotdata(results)
 
-    # Create plots
-    tecs = ['coal_ppl', 'wind_ppl']
+        # Create plots
+        tecs = ['coal_ppl', 'wind_ppl']
 
-    pp.barplot(df=df, filters={'technology': tecs, 'variable': ['ACT'], 'year': [700, 710, 720]}, title=f'ACT-{scen}',
-               set_title=False)
-    pp.barplot(df=df, filters={'technology': tecs, 'variable': ['CAP'], 'year': [700, 710, 720]}, title=f'CAP-{scen}',
-               set_title=False)
+        pp.barplot(df=df, filters={'technology': tecs, 'variable': ['ACT'], 'year': [700, 710, 720]},
+                   title=f'ACT-{scen}', set_title=False)
+        pp.barplot(df=df, filters={'technology': tecs, 'variable': ['CAP'], 'year': [700, 710, 720]},
+                   title=f'CAP-{scen}', set_title=False)
 
 
 if __name__ == '__main__':
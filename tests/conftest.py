@@ -58,9 +58,10 @@ class RunScenario(object):
         self._define_platform()
 
     def _define_platform(self) -> None:
-        _config = MessageInterface(self.run_config)
-        db_config = _config.config['db']
-        self.mp = ixmp.Platform(dbprops=db_config.get('dbprops'), dbtype=db_config.get('dbtype'))
+        # the platform is shared with the d2ix interfaces using the same database
+        self._interface = MessageInterface(self.run_config)
+        db_config = self._interface.config['db']
+        self.mp = self._interface._mp
         self.mp.set_log_level(self.log_level)
         if not db_config.get('dbtype'):
             self.db_server = True
@@ -69,7 +70,7 @@ class RunScenario(object):
     def make_scenario(self, clone_model: str, clone_scenario: str, new_scenario_name: str) -> message_ix.Scenario:
         logger.info(f'Clone scenario: \'{clone_scenario}\' from model: \'{clone_model}\' to \'{new_scenario_name}\'.')
         if not self.db_server:
-            self.mp.open_db()
+            self._interface.open_db()
         base_ds = message_ix.Scenario(self.mp, clone_model, clone_scenario)
         scenario = base_ds.clone(scenario=new_scenario_name, keep_solution=False)
         scenario.check_out()
@@ -78,13 +79,13 @@ class RunScenario(object):
         scenario.set_as_default()
         scenario.solve()
         if not self.db_server:
-            self.mp.close_db()
+            self._interface.close_db()
 
     @contextmanager
     def read_scenario(self, model: str, scenario_name: str):
         if not self.db_server:
-            self.mp.open_db()
+            self._interface.open_db()
         scenario = message_ix.Scenario(mp=self.mp, model=model, scenario=scenario_name)
         yield scenario
         if not self.db_server:
-            self.mp.close_db()
+            self._interface.close_db()
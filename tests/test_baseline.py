@@ -1,9 +1,11 @@
+import pickle
 import tempfile
 
 import pytest
 
 from d2ix import Model
 from d2ix import ModifyModel
+from d2ix import BuildConfig, build_model
 from example import RUN_CONFIG
 from tests.conftest import TestConfig
 
@@ -39,6 +41,40 @@ def test_model(baseline_model_config: TestConfig) -> None:
     model.close_db()
 
 
+def test_model_from_build(baseline_model_config: TestConfig) -> None:
+    model = Model(model=baseline_model_config.model, scen=baseline_model_config.scenario, annotation='build test',
+                  base_xls=baseline_model_config.base_xls,
+                  manual_parameter_xls=baseline_model_config.manual_parameter_xls,
+                  historical_data=baseline_model_config.historical_data,
+                  first_historical_year=baseline_model_config.first_historical_year,
+                  first_model_year=baseline_model_config.first_model_year,
+                  last_model_year=baseline_model_config.last_model_year,
+                  historical_range_year=baseline_model_config.historical_range_year,
+                  model_range_year=baseline_model_config.model_range_year, run_config=baseline_model_config.run_config,
+                  verbose=baseline_model_config.verbose, yaml_export=baseline_model_config.yaml_export)
+    config = BuildConfig(base_xls=baseline_model_config.base_xls,
+                         historical_range_year=baseline_model_config.historical_range_year,
+                         first_historical_year=baseline_model_config.first_historical_year,
+                         model_range_year=baseline_model_config.model_range_year,
+                         first_model_year=baseline_model_config.first_model_year,
+                         last_model_year=baseline_model_config.last_model_year,
+                         manual_parameter_xls=baseline_model_config.manual_parameter_xls,
+                         historical_data=baseline_model_config.historical_data)
+
+    result = pickle.loads(pickle.dumps(build_model(config, model.schema)))
+    assert sorted(result.model_par) == sorted(model.model_par)
+    assert len(result.model_par['output']) == len(model.model_par['output'])
+
+    model_from_build = Model.from_build(result, model=baseline_model_config.model,
+                                        scen=baseline_model_config.scenario, annotation='build test',
+                                        run_config=baseline_model_config.run_config,
+                                        yaml_export=baseline_model_config.yaml_export)
+    assert model_from_build.model_par is result.model_par
+    assert model_from_build.data is not model.data
+    model_from_build.close_db()
+    model.close_db()
+
+
 def test_model_without_historical(baseline_model_config: TestConfig) -> None:
     model = Model(model=baseline_model_config.model, scen=baseline_model_config.scenario, annotation='first model test',
                   base_xls=baseline_model_config.base_xls,
@@ -0,0 +1,22 @@
+import tempfile
+
+from d2ix.util.checkpoint import BuildCheckpoint
+
+
+def test_checkpoint_resume() -> None:
+    calls = []
+
+    def _stage(x: int) -> dict:
+        calls.append(x)
+        return {'value': x}
+
+    with tempfile.TemporaryDirectory() as directory:
+        checkpoint = BuildCheckpoint(directory)
+        key = checkpoint.key('input.xlsx', 1)
+        assert checkpoint.run('stage', key, _stage, 1) == {'value': 1}
+        assert BuildCheckpoint(directory).run('stage', key, _stage, 1) == {'value': 1}
+        assert calls == [1]
+
+        # changed inputs invalidate the checkpoint
+        assert checkpoint.run('stage', checkpoint.key('input.xlsx', 2), _stage, 2) == {'value': 2}
+        assert calls == [1, 2]
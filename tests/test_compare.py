@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from d2ix.postprocess.compare import ScenarioKey, compare_scenarios, rank_scenarios, scenario_plotdata
+
+ACT = {'base': {'ppl': 10.0, 'wind': 5.0},
+       'high': {'ppl': 15.0, 'coal': 2.0},
+       'low': {'ppl': 5.0, 'wind': 10.0}}
+
+
+class _Results(object):
+    def __init__(self, act: dict) -> None:
+        self.act = act
+
+    def var(self, name):
+        return pd.DataFrame({'node_loc': 'A', 'technology': list(self.act), 'year_act': 2020, 'year_vtg': 2020,
+                             'mode': 'standard', 'time': 'year', 'lvl': list(self.act.values())})
+
+    def par(self, name):
+        return pd.DataFrame(columns=['node_loc', 'technology', 'year_act', 'year_vtg', 'value'])
+
+
+def test_compare_scenarios() -> None:
+    scenarios = [ScenarioKey('M', 'high'), ScenarioKey('M', 'base'), ScenarioKey('M', 'low')]
+    df = compare_scenarios(lambda key: _Results(ACT[key.scenario]), scenarios, baseline=ScenarioKey('M', 'base'),
+                           variables=['ACT'], max_workers=2)
+    high = df.loc[df['scenario_key'] == 'M|high'].set_index('technology')
+
+    # deltas against the baseline
+    assert high.loc['ppl', 'delta'] == 5.0 and high.loc['ppl', 'delta_rel'] == 0.5
+    # rows only in the baseline are added with a zero level, rows only in the scenario have no relative delta
+    assert high.loc['wind', ['lvl', 'lvl_baseline', 'delta']].tolist() == [0.0, 5.0, -5.0]
+    assert high.loc['coal', 'delta'] == 2.0 and np.isnan(high.loc['coal', 'delta_rel'])
+    assert (df.loc[df['scenario_key'] == 'M|base', 'delta'] == 0).all()
+
+    plotdata = scenario_plotdata(df, 'M|high', 'delta')
+    assert sorted(plotdata['lvl'].tolist()) == [-5.0, 2.0, 5.0]
+
+    # base and low have the same total activity and share the second rank
+    ranking = rank_scenarios(df, 'ACT', year=2020)
+    assert ranking['scenario_key'].tolist() == ['M|high', 'M|base', 'M|low']
+    assert ranking['rank'].tolist() == [1, 2, 2]
+    ranking = rank_scenarios(df, 'ACT', technology=['wind'], ascending=True)
+    assert ranking[['scenario_key', 'rank']].values.tolist() == [['M|high', 1], ['M|base', 2], ['M|low', 3]]
@@ -0,0 +1,48 @@
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from d2ix.diff import ParquetSource, diff_parameter, diff_scenarios, write_snapshot
+
+INDEX = ['node_loc', 'technology', 'year_vtg']
+
+
+def _inv_cost(values, years=(2020, 2030, 2040)) -> pd.DataFrame:
+    return pd.DataFrame({'node_loc': 'A', 'technology': 'ppl', 'year_vtg': list(years), 'value': values,
+                         'unit': 'EUR/kW'})
+
+
+def test_diff_parameter() -> None:
+    old = _inv_cost([1000.0, 900.0, 800.0])
+    new = _inv_cost([1000.0, 950.0, 700.0], years=(2020, 2030, 2050)).astype({'year_vtg': float})
+    diff = diff_parameter('inv_cost', old, new, INDEX)
+    assert diff.added['year_vtg'].tolist() == [2050]
+    assert diff.removed['year_vtg'].tolist() == [2040]
+    assert diff.changed['year_vtg'].tolist() == [2030]
+    np.testing.assert_allclose(diff.changed['delta'], [50.0])
+    assert diff_parameter('inv_cost', old, old, INDEX).empty
+
+
+class _Source(object):
+    def __init__(self, pars: dict) -> None:
+        self.pars = pars
+
+    def par_list(self):
+        return list(self.pars)
+
+    def idx_names(self, name):
+        return INDEX
+
+    def par(self, name):
+        return self.pars[name]
+
+
+def test_diff_parquet_snapshot() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        write_snapshot(_Source({'inv_cost': _inv_cost([1000.0, 900.0, 800.0]),
+                                'fix_cost': _inv_cost([10.0, 10.0, 10.0])}), directory)
+        new = _Source({'inv_cost': _inv_cost([1000.0, 900.0, 800.0]), 'fix_cost': _inv_cost([10.0, 12.0, 10.0])})
+        diffs = diff_scenarios(ParquetSource(directory), new)
+        assert list(diffs) == ['fix_cost']
+        assert diffs['fix_cost'].changed['value_new'].tolist() == [12.0]
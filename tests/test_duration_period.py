@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from d2ix.preprocess import get_year_vector
+from d2ix.util.acitve_year_vector import calc_duration_period, create_hist_cap_index, get_act_year_vector, \
+    get_years_no_hist_cap
+
+YEAR_VECTOR = [2010, 2015, 2020, 2030, 2040]
+
+
+def test_duration_period() -> None:
+    duration_period, duration_period_sum = calc_duration_period(YEAR_VECTOR)
+    assert duration_period == {2010: 5, 2015: 5, 2020: 5, 2030: 10, 2040: 10}
+
+    expected = np.array([[0, 5, 10, 15, 25],
+                         [0, 0, 5, 10, 20],
+                         [0, 0, 0, 5, 15],
+                         [0, 0, 0, 0, 10],
+                         [0, 0, 0, 0, 0]])
+    np.testing.assert_array_equal(duration_period_sum.values, expected)
+    assert duration_period_sum.index.tolist() == YEAR_VECTOR
+    assert duration_period_sum.columns.tolist() == YEAR_VECTOR
+
+    # the cached result is not changed through a returned frame
+    duration_period_sum.loc[2010, 2015] = 99
+    np.testing.assert_array_equal(calc_duration_period(YEAR_VECTOR)[1].values, expected)
+
+
+def test_year_vectors() -> None:
+    _, duration_period_sum = calc_duration_period(YEAR_VECTOR)
+    assert get_year_vector(YEAR_VECTOR, 2020, 10, duration_period_sum, 2010, 2040) == [2015, 2020, 2030, 2040]
+
+    year_vec = get_act_year_vector(duration_period_sum, 2020, 20, 2020, 2040, [])
+    assert year_vec.vintage_years == [2020, 2020, 2020, 2030, 2030, 2040]
+    assert year_vec.act_years == [2020, 2030, 2040, 2030, 2040, 2040]
+
+
+def test_years_no_hist_cap() -> None:
+    tech_hist = pd.DataFrame({'node_loc': ['A', 'A', 'A', 'B'], 'technology': ['ppl', 'ppl', 'ppl', 'ppl'],
+                              'year_vtg': [2010, 2015, 2016, 2010], 'value': [1.0, 2.0, 0.0, 1.0]})
+    hist_cap = create_hist_cap_index(tech_hist)
+    assert hist_cap == {('A', 'ppl'): {2010, 2015}, ('B', 'ppl'): {2010}}
+    assert sorted(get_years_no_hist_cap('A', 'ppl', [2010, 2015, 2016], hist_cap)) == [2016]
+    assert sorted(get_years_no_hist_cap('A', 'wind', [2010, 2015], hist_cap)) == [2010, 2015]
+    assert get_years_no_hist_cap('A', 'ppl', [], hist_cap) == []
@@ -0,0 +1,70 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from d2ix.fetch import fetch_items
+from d2ix.schema import ScenarioSchema
+
+SCHEMA = ScenarioSchema(par_list=['demand', 'inv_cost'], set_list=['node', 'cat_year'],
+                        idx_names={'demand': ['node', 'year'], 'inv_cost': ['node_loc', 'year_vtg'], 'node': [],
+                                   'cat_year': ['type_year', 'year']})
+
+
+class _Item(object):
+    def __init__(self, size: int) -> None:
+        self.size = size
+
+    def getSize(self) -> int:
+        return self.size
+
+
+class _Scenario(object):
+    def __init__(self) -> None:
+        self.fetched = []
+        self._lock = threading.Lock()
+
+    def _item(self, ix_type, name):
+        return _Item(0 if name in ['inv_cost', 'cat_year'] else 2)
+
+    def par(self, name):
+        with self._lock:
+            self.fetched.append(name)
+        return pd.DataFrame({'node': ['A', 'B'], 'year': [2020, 2030], 'value': [1.0, 2.0], 'unit': ['GWa'] * 2})
+
+    def set(self, name):
+        with self._lock:
+            self.fetched.append(name)
+        return pd.Series(['A', 'B'])
+
+
+def test_fetch_items() -> None:
+    scenario = _Scenario()
+    items = fetch_items(scenario, SCHEMA, max_workers=2)
+    assert list(items) == ['demand', 'inv_cost', 'node', 'cat_year']
+    assert sorted(scenario.fetched) == ['demand', 'node']
+    assert items['inv_cost'].columns.tolist() == ['node_loc', 'year_vtg', 'value', 'unit']
+    assert items['cat_year'].columns.tolist() == ['type_year', 'year']
+    assert items['node'].tolist() == ['A', 'B']
+
+    items = fetch_items(_Scenario(), SCHEMA, pars=['demand'], sets=[])
+    assert list(items) == ['demand']
+    with pytest.raises(ValueError):
+        fetch_items(_Scenario(), SCHEMA, pars=['bound_emission'])
+
+
+class _JavaScenario(_Scenario):
+    def _item(self, ix_type, name):
+        raise RuntimeError('java.lang.NoSuchMethodException')
+
+
+class _PlainScenario(_Scenario):
+    _item = None
+
+
+def test_fetch_items_without_size() -> None:
+    # all items are fetched if the platform does not report the sizes
+    for scenario in [_JavaScenario(), _PlainScenario()]:
+        items = fetch_items(scenario, SCHEMA)
+        assert list(items) == ['demand', 'inv_cost', 'node', 'cat_year']
+        assert sorted(scenario.fetched) == ['cat_year', 'demand', 'inv_cost', 'node']
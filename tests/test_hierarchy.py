@@ -0,0 +1,40 @@
+import pandas as pd
+
+from d2ix.postprocess.hierarchy import aggregate_regions, create_hierarchy
+
+MAP_SPATIAL_HIERARCHY = [['World', 'World', 'World'], ['country', 'Indonesia', 'World'],
+                         ['province', 'Java', 'Indonesia'], ['province', 'Bali', 'Indonesia']]
+
+
+def test_create_hierarchy() -> None:
+    hierarchy = create_hierarchy(MAP_SPATIAL_HIERARCHY)
+    assert hierarchy.ancestors('Java') == ['Indonesia', 'World']
+    assert hierarchy.ancestors('World') == []
+    assert hierarchy.levels['Bali'] == 'province'
+
+
+def test_aggregate_regions() -> None:
+    hierarchy = create_hierarchy(MAP_SPATIAL_HIERARCHY)
+    df = pd.DataFrame({'node': ['Java', 'Bali', 'Java', 'Indonesia', 'Mars'], 'year': [2020, 2020, 2030, 2020, 2020],
+                       'lvl': [1.0, 2.0, 4.0, 8.0, 16.0]})
+    regions = aggregate_regions(df, hierarchy).set_index(['region', 'year'])
+    assert regions.loc[('World', 2020), 'lvl'] == 11.0
+    assert regions.loc[('Indonesia', 2030), 'lvl'] == 4.0
+    assert regions.loc[('Java', 2020), 'lvl_spatial'] == 'province'
+    assert regions.loc[('Mars', 2020), 'lvl'] == 16.0
+
+    countries = aggregate_regions(df, hierarchy, levels=['country'])
+    assert countries['region'].unique().tolist() == ['Indonesia']
+    assert countries['lvl'].sum() == 15.0
+
+
+def test_aggregate_regions_without_hierarchy() -> None:
+    hierarchy = create_hierarchy(None)
+    df = pd.DataFrame({'node': ['Java', 'Bali', 'Java'], 'unit': ['GWa', 'GWa', None], 'lvl': [1.0, 2.0, 4.0]})
+    regions = aggregate_regions(df, hierarchy)
+    world = regions.loc[regions['region'] == 'World']
+    assert world['lvl_spatial'].unique().tolist() == ['World']
+    # rows with NaN keys are kept
+    assert world['lvl'].sum() == 7.0
+    assert regions.loc[regions['region'] == 'Java', 'lvl'].sum() == 5.0
+    assert aggregate_regions(df, hierarchy, levels=['World'])['region'].unique().tolist() == ['World']
@@ -0,0 +1,63 @@
+import tempfile
+
+import pandas as pd
+
+from benchmarks.local_scenario import LocalScenario
+from benchmarks.synthetic import SyntheticConfig, make_input, write_input
+from d2ix.build import BuildConfig, build_stages, create_year_vectors
+from d2ix.incremental import TechnologyCache
+from d2ix.schema import ScenarioSchema
+from d2ix.util import BuildProfile, expand_par
+
+
+def test_technology_cache() -> None:
+    tech = {'output': {'commodity': 'electr'}, 'year_vtg': {2020: {'inv_cost': {'value': 1000, 'unit': 'EUR'}}}}
+    pieces = {'inv_cost': pd.DataFrame({'value': [1000]})}
+
+    cache = TechnologyCache()
+    cache.begin(2020, [2020, 2030])
+    key = cache.key(tech, [])
+    assert cache.get(('A', 'technology', 'ppl'), key) is None
+    cache.put(('A', 'technology', 'ppl'), key, pieces)
+    cache.end()
+
+    # unchanged technologies are taken from the cache, changed ones are created again
+    cache.begin(2020, [2020, 2030])
+    assert cache.get(('A', 'technology', 'ppl'), cache.key(tech, [])) is pieces
+    tech['year_vtg'][2020]['inv_cost']['value'] = 1200
+    assert cache.get(('A', 'technology', 'ppl'), cache.key(tech, [])) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # removed technologies are dropped, changed settings clear the cache
+    cache.get(('A', 'technology', 'wind'), key)
+    cache.end()
+    assert len(cache) == 1
+    cache.begin(2025, [2025, 2030])
+    assert len(cache) == 0
+
+
+def test_incremental_rebuild() -> None:
+    config = SyntheticConfig(nodes=2, technologies=6, historical_years=5)
+    schema = ScenarioSchema.from_scenario(LocalScenario())
+    with tempfile.TemporaryDirectory() as directory:
+        sheets = make_input(config)
+        paths = write_input(sheets, directory)
+        build_config = BuildConfig(paths['base_input'], 1, config.first_historical_year, config.model_range_year,
+                                   config.first_model_year, config.last_model_year, paths['manual_input'])
+        years = create_year_vectors(build_config)
+        previous = build_stages(build_config, years, schema, BuildProfile(), tech_cache=TechnologyCache())
+        assert build_stages(build_config, years, schema, BuildProfile()).tech_cache is None
+
+        # one changed technology is created again, all others are taken from the cache
+        sheets['base_input']['spec_techs'].loc[0, 'inv_cost'] += 100
+        write_input(sheets, directory)
+        rebuild = build_stages(build_config, years, schema, BuildProfile(), tech_cache=previous.tech_cache)
+        cold = build_stages(build_config, years, schema, BuildProfile())
+
+    assert rebuild.tech_cache.misses == config.nodes and rebuild.tech_cache.hits > 0
+    assert list(rebuild.model_par) == list(cold.model_par)
+    for k, v in cold.model_par.items():
+        if isinstance(v, list):
+            assert rebuild.model_par[k] == v
+        else:
+            pd.testing.assert_frame_equal(expand_par(rebuild.model_par[k]), expand_par(v))
@@ -0,0 +1,108 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from d2ix.build import BuildConfig
+from d2ix.pipeline import PipelineRunner, ScenarioJob, UploadedScenario, solve_scenario, timings_frame
+
+SOLVE_TIME = 0.2
+
+
+def _build(config: BuildConfig) -> dict:
+    if config.last_model_year < config.first_model_year:
+        raise ValueError('Wrong year settings')
+    return {'years': list(range(config.first_model_year, config.last_model_year + 1, config.model_range_year))}
+
+
+def _upload(job: ScenarioJob, built: dict) -> dict:
+    return dict(built, scenario=job.scenario)
+
+
+def _solve(job: ScenarioJob, scenario: dict) -> dict:
+    time.sleep(SOLVE_TIME)
+    return dict(scenario, obj=float(len(scenario['years'])))
+
+
+def _extract(job: ScenarioJob, solved: dict) -> pd.DataFrame:
+    return pd.DataFrame({'year': solved['years'], 'lvl': solved['obj']})
+
+
+def test_pipeline_stub() -> None:
+    config = BuildConfig('modell_data.xlsx', 1, 2010, 5, 2020, 2030)
+    jobs = [ScenarioJob(f'job_{i}', config._replace(last_model_year=2030 + 5 * i), 'model', f'scen_{i}')
+            for i in range(4)]
+    jobs.append(ScenarioJob('broken', config._replace(last_model_year=2000), 'model', 'broken'))
+
+    runner = PipelineRunner(builder=_build, uploader=_upload, solver=_solve, extractor=_extract, max_solve=4,
+                            build_executor=ThreadPoolExecutor(max_workers=2))
+    start = time.perf_counter()
+    results = runner.run_sync(jobs)
+    elapsed = time.perf_counter() - start
+
+    assert [r.status for r in results] == ['ok'] * 4 + ['failed']
+    assert results[-1].failed_stage == 'build'
+    assert results[2].results['lvl'].iloc[0] == 5.0
+    # the solves overlap
+    assert elapsed < 4 * SOLVE_TIME
+
+    df = timings_frame(results)
+    assert {'build', 'upload', 'solve', 'extract', 'solve_wait', 'total'}.issubset(df.columns)
+
+
+class _Model(object):
+    closed = 0
+    config = {'db': {'dbprops': 'db/test_pipeline', 'dbtype': 'HSQLDB'}}
+
+    def close(self) -> None:
+        _Model.closed += 1
+
+
+def _upload_model(job: ScenarioJob, built: dict) -> UploadedScenario:
+    return UploadedScenario(_Model(), dict(built, scenario=job.scenario))
+
+
+def _solve_uploaded(job: ScenarioJob, uploaded: UploadedScenario) -> dict:
+    if job.name == 'infeasible':
+        raise RuntimeError('infeasible')
+    return dict(uploaded.scenario, obj=1.0)
+
+
+def test_pipeline_close_models() -> None:
+    config = BuildConfig('modell_data.xlsx', 1, 2010, 5, 2020, 2030)
+    jobs = [ScenarioJob('ok', config, 'model', 'ok'), ScenarioJob('infeasible', config, 'model', 'infeasible')]
+    runner = PipelineRunner(builder=_build, uploader=_upload_model, solver=_solve_uploaded, extractor=_extract,
+                            build_executor=ThreadPoolExecutor(max_workers=2))
+    _Model.closed = 0
+    results = runner.run_sync(jobs)
+    assert [r.status for r in results] == ['ok', 'failed']
+    assert results[1].failed_stage == 'solve'
+    # the model of every uploaded job is released, also after a failed stage
+    assert _Model.closed == 2
+
+
+class _Scenario(object):
+    lock = threading.Lock()
+    writers = 0
+    max_writers = 0
+
+    def solve(self, model: str) -> None:
+        with _Scenario.lock:
+            _Scenario.writers += 1
+            _Scenario.max_writers = max(_Scenario.max_writers, _Scenario.writers)
+        time.sleep(SOLVE_TIME / 2)
+        with _Scenario.lock:
+            _Scenario.writers -= 1
+
+
+def test_pipeline_single_writer() -> None:
+    config = BuildConfig('modell_data.xlsx', 1, 2010, 5, 2020, 2030)
+    jobs = [ScenarioJob(f'job_{i}', config, 'model', f'scen_{i}') for i in range(3)]
+    runner = PipelineRunner(builder=_build, uploader=lambda job, built: UploadedScenario(_Model(), _Scenario()),
+                            solver=solve_scenario, extractor=lambda job, solved: pd.DataFrame(), max_solve=3,
+                            build_executor=ThreadPoolExecutor(max_workers=3))
+    results = runner.run_sync(jobs)
+    assert [r.status for r in results] == ['ok'] * 3
+    # the solutions of jobs on the same database are not written at the same time
+    assert _Scenario.max_writers == 1
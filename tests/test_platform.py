@@ -0,0 +1,59 @@
+import pytest
+
+from d2ix import platform
+from d2ix.core import MessageInterface
+
+DB_CONFIG = {'dbprops': 'db/test', 'dbtype': 'HSQLDB'}
+
+
+class _Platform(object):
+    created = 0
+
+    def __init__(self, dbprops, dbtype) -> None:
+        _Platform.created += 1
+        self.dbtype = dbtype
+        self.is_open = True
+
+    def set_log_level(self, level) -> None:
+        pass
+
+    def open_db(self) -> None:
+        self.is_open = True
+
+    def close_db(self) -> None:
+        self.is_open = False
+
+
+def test_shared_platform(monkeypatch) -> None:
+    monkeypatch.setattr(platform.ix, 'Platform', _Platform)
+
+    mp = platform.acquire_platform(DB_CONFIG)
+    with platform.shared_platform(DB_CONFIG) as mp_1:
+        with platform.shared_platform(dict(DB_CONFIG)) as mp_2:
+            assert mp is mp_1 is mp_2
+        assert mp.is_open
+    assert _Platform.created == 1
+    assert not mp.is_open
+
+    platform.open_db(DB_CONFIG)
+    assert mp.is_open
+    platform.release_platform(DB_CONFIG)
+    assert not mp.is_open
+    assert platform.platform_key(DB_CONFIG) not in platform._platforms
+
+    # a released platform is closed, it can not be opened again
+    platform.close_db(DB_CONFIG)
+    with pytest.raises(ValueError):
+        platform.open_db(DB_CONFIG)
+
+
+def test_released_interface(monkeypatch) -> None:
+    monkeypatch.setattr(platform.ix, 'Platform', _Platform)
+    monkeypatch.setattr(platform, '_platforms', {})
+
+    with MessageInterface() as interface:
+        interface.open_db()
+    assert platform.platform_key(interface.config['db']) not in platform._platforms
+    interface.close_db()
+    with pytest.raises(ValueError):
+        interface.Scenario('model', 'scen')
@@ -0,0 +1,48 @@
+import tracemalloc
+
+import pandas as pd
+import pytest
+
+from d2ix.util import BuildProfile
+
+MB = 2 ** 20
+
+
+def _allocate(size: int) -> None:
+    data = bytearray(size)
+    del data
+
+
+def test_build_profile() -> None:
+    profile = BuildProfile(memory=True)
+    with profile.stage('load', lambda: {'demand': pd.DataFrame({'value': [1.0, 2.0]}), 'node': ['A']}):
+        _allocate(8 * MB)
+    with profile.stage('create'):
+        _allocate(MB)
+
+    summary = profile.summary()
+    assert summary['stage'].tolist() == ['load', 'create']
+    assert summary['rows'].tolist() == [3, 0]
+    assert summary.loc[0, 'peak_memory'] >= 8 * MB > summary.loc[1, 'peak_memory'] >= MB
+
+    d = profile.to_dict()
+    assert [s['stage'] for s in d['stages']] == ['load', 'create']
+    assert d['stages'][0]['rows'] == {'demand': 2, 'node': 1}
+    assert d['sheets'] == []
+
+
+@pytest.mark.skipif(not hasattr(tracemalloc, 'reset_peak'), reason='tracemalloc.reset_peak requires python 3.9')
+def test_build_profile_traced() -> None:
+    # tracing started by the caller and nested stages report the peak of each stage
+    profile = BuildProfile(memory=True)
+    tracemalloc.start()
+    try:
+        with profile.stage('build'):
+            with profile.stage('load'):
+                _allocate(8 * MB)
+            with profile.stage('create'):
+                _allocate(MB)
+    finally:
+        tracemalloc.stop()
+    peaks = {s.stage: s.peak_memory for s in profile.stages}
+    assert peaks['build'] >= peaks['load'] >= 8 * MB > peaks['create'] >= MB
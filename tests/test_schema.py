@@ -0,0 +1,62 @@
+import tempfile
+
+from d2ix.schema import clear_schemas, get_schema
+
+
+class _Scenario(object):
+    calls = 0
+
+    def par_list(self):
+        self.calls += 1
+        return ['demand']
+
+    def set_list(self):
+        self.calls += 1
+        return ['node', 'map_spatial_hierarchy']
+
+    def idx_names(self, name):
+        self.calls += 1
+        return {'demand': ['node', 'commodity', 'level', 'year', 'time'], 'node': [],
+                'map_spatial_hierarchy': ['lvl_spatial', 'node', 'node_parent']}[name]
+
+
+def test_schema_cache() -> None:
+    db_config = {'dbprops': 'test_schema_db', 'dbtype': 'HSQLDB'}
+    with tempfile.TemporaryDirectory() as directory:
+        clear_schemas()
+        scenario = _Scenario()
+        schema = get_schema(scenario, db_config, directory)
+        assert get_schema(scenario, db_config, directory) is schema
+        assert scenario.calls == 5
+        assert schema.par('demand').columns.tolist() == ['node', 'commodity', 'level', 'year', 'time', 'value',
+                                                         'unit']
+        assert schema.is_index_set('node') and not schema.is_index_set('map_spatial_hierarchy')
+
+        # a new process loads the schema from disk
+        clear_schemas()
+        scenario = _Scenario()
+        assert get_schema(scenario, db_config, directory) == schema
+        assert scenario.calls == 0
+        clear_schemas()
+
+
+class _MacroScenario(_Scenario):
+    def par_list(self):
+        self.calls += 1
+        return ['demand', 'grow']
+
+    def idx_names(self, name):
+        self.calls += 1
+        return ['node', 'year'] if name == 'grow' else super().idx_names(name)
+
+
+def test_schema_with_items() -> None:
+    clear_schemas()
+    schema = get_schema(_Scenario(), {'dbprops': 'test_schema_items_db', 'dbtype': 'HSQLDB'})
+    scenario = _MacroScenario()
+    items = schema.with_items(scenario)
+    assert items.par_list == ['demand', 'grow']
+    assert items.par('grow').columns.tolist() == ['node', 'year', 'value', 'unit']
+    # only the item lists and the index names of the unknown parameter are loaded
+    assert scenario.calls == 3
+    clear_schemas()
@@ -0,0 +1,39 @@
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from d2ix.build import BuildConfig
+from d2ix.snapshot import SnapshotError, load_snapshot, read_manifest, save_snapshot
+
+
+def test_snapshot() -> None:
+    model_par = {'node': ['A', 'World'],
+                 'cat_year': pd.DataFrame({'type_year': ['firstmodelyear', 2020, 2030], 'year': [2020, 2020, 2030]}),
+                 'inv_cost': pd.DataFrame({'node_loc': 'A', 'technology': 'ppl', 'year_vtg': [2020, 2030],
+                                           'value': [1000, 950.5], 'unit': 'EUR/kW'})}
+    with tempfile.TemporaryDirectory() as directory:
+        config = BuildConfig(Path('input/modell_data.xlsx'), 1, 2010, 5, 2020, 2030)
+        save_snapshot(model_par, directory, config)
+        assert read_manifest(directory)['config']['base_xls'] == 'input/modell_data.xlsx'
+        snapshot = load_snapshot(directory, verify=True)
+        assert list(snapshot) == ['node', 'cat_year', 'inv_cost']
+        assert snapshot['node'] == ['A', 'World']
+        assert snapshot['cat_year']['type_year'].tolist() == ['firstmodelyear', 2020, 2030]
+        pd.testing.assert_frame_equal(snapshot['inv_cost'], model_par['inv_cost'])
+
+        del snapshot['node']
+        assert 'node' not in snapshot
+        assert snapshot.get('node') is None
+        snapshot['node'] = ['B']
+        assert dict(snapshot.items())['node'] == ['B']
+        assert list(snapshot) == ['cat_year', 'inv_cost', 'node']
+
+        with open(Path(directory).joinpath('inv_cost.arrow'), 'ab') as f:
+            f.write(b'0')
+        with pytest.raises(SnapshotError):
+            load_snapshot(directory, verify=True)['inv_cost']
+    with tempfile.TemporaryDirectory() as directory:
+        with pytest.raises(SnapshotError):
+            load_snapshot(directory)
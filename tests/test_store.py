@@ -0,0 +1,33 @@
+import tempfile
+
+import pandas as pd
+
+from d2ix.postprocess.store import ResultStore
+
+
+class _Results(object):
+    def __init__(self, scale: float) -> None:
+        self.scale = scale
+
+    def var(self, name):
+        return pd.DataFrame({'node_loc': ['A', 'A', 'B'], 'technology': ['ppl', 'wind', 'ppl'],
+                             'year_act': [2020, 2030, 2030], 'year_vtg': [2020, 2030, 2030],
+                             'lvl': [1.0 * self.scale, 2.0 * self.scale, 3.0 * self.scale]})
+
+    def par(self, name):
+        return pd.DataFrame(columns=['node_loc', 'technology', 'year_act', 'year_vtg', 'value'])
+
+
+def test_result_store() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        store = ResultStore(directory)
+        assert store.archive(_Results(1.0), 'M', 'S', 1, ['ACT', 'CAP']) == ['ACT', 'CAP']
+        assert store.archive(_Results(2.0), 'M', 'S', 2, ['ACT']) == ['ACT']
+        assert store.archive(_Results(3.0), 'M', 'S', 1, ['ACT']) == []
+
+        df = ResultStore(directory).query(variables=['ACT'], nodes=['A'], years=[2030])
+        assert df[['version', 'technology', 'lvl']].values.tolist() == [[1, 'wind', 2.0], [2, 'wind', 4.0]]
+        assert len(store.partitions(technologies=['wind'], years=range(2030, 2051))) == 3
+        assert store.partitions(nodes=['C']).empty
+        columns = ['model', 'scenario', 'version', 'variable', 'node', 'technology', 'year', 'unit', 'lvl']
+        assert store.query(models=['N']).columns.tolist() == columns
@@ -0,0 +1,30 @@
+from d2ix.util import TechTemplate
+from d2ix.util.template import materialize
+
+
+def test_location_override() -> None:
+    base = {'technology': 'ppl', 'output': {'level': 'secondary', 'value': 1}}
+    template = TechTemplate({}, base)
+    loc_a = template.new_child({'node_loc': 'A'})
+    loc_b = template.new_child({'node_loc': 'B'})
+
+    loc_a['output']['level'] = 'final'
+    assert loc_a['output']['level'] == 'final'
+    assert loc_b['output']['level'] == 'secondary'
+    assert template['output']['level'] == 'secondary'
+    assert base == {'technology': 'ppl', 'output': {'level': 'secondary', 'value': 1}}
+
+
+def test_materialize() -> None:
+    base = {'output': {'level': 'secondary'}, 'year_vtg': {2020: {'inv_cost': 10}}}
+    tech = TechTemplate({'node_loc': 'A'}, base)
+    tech['year_vtg'][2020]['inv_cost'] = 20
+
+    plain = materialize(tech)
+    assert plain == {'node_loc': 'A', 'output': {'level': 'secondary'}, 'year_vtg': {2020: {'inv_cost': 20}}}
+    assert type(plain) is dict
+    assert type(plain['output']) is dict
+    assert type(plain['year_vtg'][2020]) is dict
+    plain['output']['level'] = 'final'
+    assert tech['output']['level'] == 'secondary'
+    assert base['year_vtg'][2020]['inv_cost'] == 10
@@ -0,0 +1,37 @@
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from d2ix.postprocess.timeseries import IAMC_COLUMNS, export_timeseries
+
+
+class _Results(object):
+    model = 'M'
+    scenario = 'S'
+
+    def var(self, name):
+        if name == 'EMISS':
+            return pd.DataFrame({'node': ['A'], 'emission': ['CO2'], 'type_tec': ['all'], 'year': [2020],
+                                 'lvl': [5.0]})
+        year = 'year_vtg' if name == 'CAP_NEW' else 'year_act'
+        return pd.DataFrame({'node_loc': ['A', 'B'], 'technology': ['ppl', 'ppl'], year: [2020, 2020],
+                             'year_vtg': [2020, 2020], 'lvl': [1.0, 3.0]})
+
+    def set(self, name):
+        return pd.DataFrame({'lvl_spatial': ['country', 'country'], 'node': ['A', 'B'], 'node_parent': ['World'] * 2})
+
+    def par(self, name):
+        year = 'type_year' if name == 'historical_emission' else 'year_vtg'
+        return pd.DataFrame(columns=['node', 'node_loc', 'technology', 'type_emission', year, 'value'])
+
+
+def test_export_timeseries() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = export_timeseries(_Results(), Path(directory).joinpath('ts.csv.gz'))
+        df = pd.read_csv(path)
+    assert df.columns.tolist() == IAMC_COLUMNS
+    assert df['variable'].unique().tolist() == ['ppl|ACT', 'ppl|CAP', 'ppl|CAP_NEW', 'CO2|EMISS']
+    act = df.loc[df['variable'] == 'ppl|ACT'].set_index('region')['value']
+    assert act.to_dict() == {'A': 1.0, 'B': 3.0, 'World': 4.0}
+    assert df['model'].unique().tolist() == ['M']
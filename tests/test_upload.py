@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from d2ix.upload import iter_chunks, upload_parameters
+
+
+class _Scenario(object):
+    def __init__(self) -> None:
+        self.chunks = []
+
+    def add_par(self, name: str, df: pd.DataFrame) -> None:
+        self.chunks.append((name, df))
+
+
+def test_upload_chunks() -> None:
+    df = pd.DataFrame({'node': 'A', 'year': np.arange(2500).astype(object), 'value': np.arange(2500) / 10,
+                       'unit': 'GWa'})
+    df.loc[10, 'value'] = np.nan
+    assert [len(c) for c in iter_chunks(df, 1000)] == [1000, 1000, 500]
+
+    scenario = _Scenario()
+    progress = []
+    upload_parameters(scenario, {'demand': df}, memory_budget=1, progress=progress.append)
+    uploaded = pd.concat([c for _, c in scenario.chunks], ignore_index=True)
+    assert len(scenario.chunks) == 3
+    assert len(uploaded) == 2499
+    assert uploaded['year'].dtype == np.int64
+    assert [p.rows for p in progress] == [1000, 2000, 2500, 2500]
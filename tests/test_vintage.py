@@ -0,0 +1,53 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from d2ix.util.acitve_year_vector import calc_duration_period, get_act_year_vector, get_act_years
+from d2ix.util.vintage import VintageBlock, VintageFrame
+
+YEAR_VECTOR = [2010, 2015, 2020, 2030, 2040]
+COLUMNS = ['node_loc', 'technology', 'year_vtg', 'year_act', 'mode', 'commodity', 'level', 'value', 'unit']
+
+
+def _block(**kwargs) -> VintageBlock:
+    _, duration_period_sum = calc_duration_period(YEAR_VECTOR)
+    act_years = [get_act_years(duration_period_sum, y, 20, 2040, []) for y in YEAR_VECTOR]
+    return VintageBlock.create({'node_loc': 'A', 'technology': 'ppl', 'mode': 'standard'}, YEAR_VECTOR, act_years,
+                               [1.0, 2.0, 3.0, 4.0, 5.0], ['GWa'] * 5, 2020, **kwargs)
+
+
+def test_vintage_block() -> None:
+    _, duration_period_sum = calc_duration_period(YEAR_VECTOR)
+    block = _block(expand={'commodity': ['electr', 'heat'], 'level': ['secondary', 'secondary']})
+    df = block.to_frame(COLUMNS)
+    assert len(df) == block.rows
+
+    year_vtg, year_act = [], []
+    for y in YEAR_VECTOR:
+        year_vec = get_act_year_vector(duration_period_sum, y, 20, 2020, 2040, [])
+        year_vtg.extend(year_vec.vintage_years)
+        year_act.extend(year_vec.act_years)
+    electr = df[df['commodity'] == 'electr']
+    assert electr['year_vtg'].tolist() == year_vtg
+    assert electr['year_act'].tolist() == year_act
+    assert df['technology'].unique().tolist() == ['ppl']
+    assert block.unique('commodity') == ['electr', 'heat']
+
+    frame = VintageFrame(pd.DataFrame(columns=COLUMNS)).append(block).append(_block(expand={}))
+    assert len(frame) == len(frame.to_frame())
+    assert sorted(frame.unique('year_vtg')) == YEAR_VECTOR
+    assert len(pickle.loads(pickle.dumps(frame))) == len(frame)
+    with pytest.raises(AttributeError, match='expand_par'):
+        frame.loc[0]
+
+
+def test_vintage_block_delta() -> None:
+    df = _block(delta={'act': 1.1}).to_frame(COLUMNS)
+    # year pairs are repeated over vintages, the last row is kept in the scenario
+    df = df.drop_duplicates(['year_vtg', 'year_act'], keep='last')
+    row = df[(df['year_vtg'] == 2030) & (df['year_act'] == 2040)]
+    np.testing.assert_allclose(row['value'], 4.0 * 1.1 ** 10)
+    row = df[(df['year_vtg'] == 2020) & (df['year_act'] == 2020)]
+    np.testing.assert_allclose(row['value'], 3.0)
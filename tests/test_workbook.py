@@ -0,0 +1,57 @@
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.local_scenario import LocalScenario
+from benchmarks.synthetic import SyntheticConfig, make_input, write_input
+from d2ix.build import BuildConfig, build_stages, create_year_vectors
+from d2ix.schema import ScenarioSchema
+from d2ix.util import BuildProfile, expand_par, workbook
+from d2ix.util.workbook import SheetSpec, read_workbook
+
+
+def test_read_workbook() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory).joinpath('input.xlsx')
+        with pd.ExcelWriter(path) as writer:
+            pd.DataFrame({'technology': ['ppl', 'wind'], 'inv_cost': [1000, 1500],
+                          'postprocess_color': ['black', None]}).to_excel(writer, 'spec_techs', index=False)
+            pd.DataFrame({'node': [1, 2], 'value': [1.0, 2.0]}).to_excel(writer, 'demand', index=False)
+
+        timings = []
+        sheets = read_workbook(path, ['demand', SheetSpec('spec_techs', ['technology', 'postprocess_color',
+                                                                         'postprocess_synonym']),
+                                      SheetSpec('missing')], max_workers=1, timings=timings)
+        assert list(sheets) == ['spec_techs', 'demand']
+        assert sheets['spec_techs'].columns.tolist() == ['technology', 'postprocess_color']
+        assert [t.sheet for t in timings] == ['spec_techs', 'demand']
+
+        demand = read_workbook(path, [SheetSpec('demand', dtype={'node': str})])['demand']
+        assert demand['node'].tolist() == ['1', '2']
+
+
+def test_parallel_build(monkeypatch) -> None:
+    config = SyntheticConfig(nodes=2, technologies=4, historical_years=5)
+    schema = ScenarioSchema.from_scenario(LocalScenario())
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_input(make_input(config), directory)
+        build_config = BuildConfig(paths['base_input'], 1, config.first_historical_year, config.model_range_year,
+                                   config.first_model_year, config.last_model_year, paths['manual_input'])
+        years = create_year_vectors(build_config)
+        serial_profile = BuildProfile()
+        serial = build_stages(build_config, years, schema, serial_profile)
+
+        # the workbooks are parsed by the spawned workers only, not in this process
+        monkeypatch.setattr(workbook, 'PARALLEL_MIN_BYTES', 0)
+        monkeypatch.setattr(workbook, '_parse_sheet', None)
+        profile = BuildProfile()
+        parallel = build_stages(build_config._replace(workbook_workers=2), years, schema, profile)
+
+    assert [t.sheet for t in profile.sheets] == [t.sheet for t in serial_profile.sheets]
+    assert list(parallel.model_par) == list(serial.model_par)
+    for k, v in serial.model_par.items():
+        if isinstance(v, list):
+            assert parallel.model_par[k] == v
+        else:
+            pd.testing.assert_frame_equal(expand_par(parallel.model_par[k]), expand_par(v))